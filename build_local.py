@@ -13,20 +13,46 @@ Description: Local development tool for the config-driven academic website templ
 Usage: python build_local.py
 """
 
+import base64
+import fnmatch
+import gzip
+import hashlib
+import importlib
 import json
+import math
+import mimetypes
 import os
+import sys
+import time
+import urllib.request
 from datetime import datetime
+from html import escape
+from html.parser import HTMLParser
+from urllib.parse import urlparse
 import re
 import yaml
 
+try:
+    from fontTools import subset as font_subset
+except ImportError:
+    font_subset = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from config_lock import config_lock
+
 
 def load_config():
     """Load configuration from config.json"""
     if not os.path.exists('config.json'):
         raise FileNotFoundError('config.json file not found!')
     
-    with open('config.json', 'r', encoding='utf-8') as f:
-        return json.load(f)
+    with config_lock('config.json'):
+        with open('config.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
 
 
 def parse_frontmatter(content):
@@ -138,17 +164,18 @@ def generate_post_id(filename):
     return filename.replace('.md', '').lower().replace(' ', '-').replace('_', '-')
 
 
-def build_blog_data():
-    """Build blog data from markdown files"""
+def build_blog_data(write=True):
+    """Build blog data from markdown files; without write, only return the posts"""
     print('📝 Building blog data...')
     
     blog_dir = 'blog'
     if not os.path.exists(blog_dir):
         print('Blog directory does not exist, creating empty blog data.')
-        blog_data_js = 'window.BLOG_DATA = [];'
-        with open('blog-data.js', 'w', encoding='utf-8') as f:
-            f.write(blog_data_js)
-        return
+        if write:
+            blog_data_js = 'window.BLOG_DATA = [];'
+            with open('blog-data.js', 'w', encoding='utf-8') as f:
+                f.write(blog_data_js)
+        return []
     
     blog_posts = []
     md_files = [f for f in os.listdir(blog_dir) if f.endswith('.md') and f != 'README.md']
@@ -216,6 +243,8 @@ def build_blog_data():
     
     # Sort by date (newest first)
     blog_posts.sort(key=lambda x: datetime.strptime(x['date'], '%Y-%m-%d').timestamp() if x['date'] else 0, reverse=True)
+    if not write:
+        return blog_posts
     
     # Generate JavaScript file
     js_content = f'''// Auto-generated blog data
@@ -248,6 +277,119 @@ console.log('Blog data loaded: ' + window.BLOG_DATA.length + ' posts');
         print(f'- [{post_type}] {post["title"]} ({post["formattedDate"]})')
     
     print('✓ blog-data.js generated successfully')
+    return blog_posts
+
+
+# Per-page blog data, written when the blog list is paginated (build.pagination.blog)
+BLOG_DATA_DIR = 'blog-data'
+
+
+def write_blog_page_data(blog_posts, per_page, eager_count):
+    """Split the blog data into one script per list page and one per post.
+    
+    A paginated blog.html loads only the summaries of the page being viewed
+    (blog-data/page-N.js) and a post's content when it is opened
+    (blog-data/post-ID.js), never the whole of blog-data.js. Files left over
+    from an earlier build are removed. Returns the number of list pages.
+    """
+    written = set()
+    
+    def write(name, variable, key, value):
+        with open(os.path.join(BLOG_DATA_DIR, name), 'w', encoding='utf-8') as f:
+            f.write(f'(window.{variable} = window.{variable} || {{}})[{json.dumps(key)}] = '
+                    f'{json.dumps(value, ensure_ascii=False, separators=(",", ":"))};\n')
+        written.add(name)
+    
+    page_count = 0
+    if per_page > 0:
+        os.makedirs(BLOG_DATA_DIR, exist_ok=True)
+        page_count = max(1, math.ceil(len(blog_posts) / per_page))
+        for number in range(1, page_count + 1):
+            posts = blog_posts[(number - 1) * per_page:number * per_page]
+            next_posts = blog_posts[number * per_page:number * per_page + eager_count]
+            write(f'page-{number}.js', 'BLOG_PAGES', number, {
+                'pageCount': page_count,
+                'posts': [{key: value for key, value in post.items() if key not in ('content', 'metadata')}
+                          for post in posts],
+                'nextImages': [post['image'] for post in next_posts if post.get('image')],
+            })
+        for post in blog_posts:
+            write(f'post-{post["id"]}.js', 'BLOG_POSTS', post['id'],
+                  {key: value for key, value in post.items() if key != 'metadata'})
+        print(f'✓ {BLOG_DATA_DIR}/: {page_count} list pages, {len(blog_posts)} posts')
+    
+    if os.path.isdir(BLOG_DATA_DIR):
+        for name in os.listdir(BLOG_DATA_DIR):
+            if name.endswith('.js') and name not in written:
+                os.remove(os.path.join(BLOG_DATA_DIR, name))
+    return page_count
+
+
+def get_build_options(config, section):
+    """Get a section of the optional build settings (config.json -> build)"""
+    build = config.get('build', {})
+    options = build.get(section, {}) if isinstance(build, dict) else {}
+    return options if isinstance(options, dict) else {}
+
+
+# Number of images per page that are above the fold by default
+# (index: the profile photo plus the first two featured publication thumbnails)
+DEFAULT_EAGER_IMAGES = {'index': 3, 'publications': 2, 'blog': 2}
+
+
+def get_eager_image_count(config, page):
+    """Get how many images at the top of a page should load eagerly"""
+    eager = get_build_options(config, 'images').get('eager', {})
+    try:
+        return int(eager.get(page, DEFAULT_EAGER_IMAGES.get(page, 0)))
+    except (TypeError, ValueError):
+        return DEFAULT_EAGER_IMAGES.get(page, 0)
+
+
+def image_loading_attrs(position, eager_count):
+    """Loading hints for the image at the given position in document order"""
+    if position < eager_count:
+        return 'loading="eager" fetchpriority="high" decoding="async"'
+    return 'loading="lazy" decoding="async"'
+
+
+def is_local_url(url):
+    """Check whether a URL points to a file in this site"""
+    parsed = urlparse(url)
+    return not (parsed.scheme or parsed.netloc or url.startswith('#') or url.startswith('data:'))
+
+
+def local_path_from_url(url, base_dir=''):
+    """Convert a local URL into a file path relative to the site root"""
+    path = urlparse(url).path
+    if path.startswith('/'):
+        return path.lstrip('/')
+    return os.path.normpath(os.path.join(base_dir, path))
+
+
+# Encoded data URIs, keyed by image path, so repeated images are read once
+_inlined_images = {}
+
+
+def inline_image_src(src, config):
+    """Inline a small local image as a base64 data URI (config.json -> build.inline_images)"""
+    options = get_build_options(config, 'inline_images')
+    if not options.get('enabled') or not src or not is_local_url(src):
+        return src
+    
+    path = local_path_from_url(src)
+    if not os.path.isfile(path) or os.path.getsize(path) > options.get('max_bytes', 4096):
+        return src
+    
+    mime_type = mimetypes.guess_type(path)[0]
+    if not mime_type or not mime_type.startswith('image/'):
+        return src
+    
+    if path not in _inlined_images:
+        with open(path, 'rb') as f:
+            encoded = base64.b64encode(f.read()).decode('ascii')
+        _inlined_images[path] = f'data:{mime_type};base64,{encoded}'
+    return _inlined_images[path]
 
 
 def highlight_author_name(authors, target_name):
@@ -293,7 +435,24 @@ def format_publication_links(links):
     return ' / '.join(link_items)
 
 
-def generate_navigation(personal, active_page):
+def generate_publication_item(pub, target_name, img_attrs, image_src, show_oral=True):
+    """Generate HTML for a single publication entry"""
+    venue_badge = format_publication_venue(pub['venue_type'], pub['venue'], show_oral and pub.get('is_oral', False))
+    authors_formatted = highlight_author_name(pub['authors'], target_name)
+    links_formatted = format_publication_links(pub['links'])
+    
+    return f'''
+                <div class="publication-item">
+                    <img src="{image_src}" alt="{pub['title']}" class="publication-image teaser" {img_attrs} onerror="this.src='images/default-paper.png'">
+                    <div class="publication-content">
+                        <p class="publication-title">{venue_badge} {pub['title']}</p>
+                        <p class="publication-authors">{authors_formatted}</p>
+                        <p class="publication-links">{links_formatted}</p>
+                    </div>
+                </div>'''
+
+
+def generate_navigation(personal, active_page, search=False):
     """Generate navigation HTML"""
     nav_links = {
         'Bio': 'index.html',
@@ -308,10 +467,119 @@ def generate_navigation(personal, active_page):
         target = 'target="_blank"' if name == 'CV(PDF)' else ''
         nav_items.append(f'<a href="{url}" class="nav-link {is_active}" {target}>{name}</a>')
     
+    if search:
+        nav_items.append('''<div class="nav-search">
+                    <input id="site-search" class="nav-search-input" type="search" placeholder="Search" aria-label="Search posts and publications" autocomplete="off">
+                    <div id="site-search-results" class="nav-search-results" hidden></div>
+                </div>
+                <script src="search.js" defer></script>''')
+    
     return '\n                '.join(nav_items)
 
 
-def generate_footer(personal, template_info=None, analytics=None):
+def fetch_json(url, timeout=5):
+    """Fetch and decode a JSON document"""
+    request = urllib.request.Request(url, headers={'User-Agent': 'academic-website-builder'})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+def resolve_location_ipapi(options):
+    """Look up the build machine's location with ipapi.co"""
+    data = fetch_json('https://ipapi.co/json/')
+    if data.get('city') and data.get('country_name'):
+        return f"{data['city']}, {data['country_name']}"
+    return None
+
+
+def resolve_location_ip_api(options):
+    """Look up the build machine's location with ip-api.com"""
+    data = fetch_json('http://ip-api.com/json/')
+    if data.get('city') and data.get('country'):
+        return f"{data['city']}, {data['country']}"
+    return None
+
+
+def resolve_location_static(options):
+    """Use the location written in config.json; works offline"""
+    return options.get('value')
+
+
+# Built-in owner location resolvers (config.json -> build.owner_location.resolver).
+# A "module:function" string can be used to plug in a custom one.
+OWNER_LOCATION_RESOLVERS = {
+    'ipapi': resolve_location_ipapi,
+    'ip-api': resolve_location_ip_api,
+    'static': resolve_location_static,
+}
+
+# Resolved once per build, shared by every page footer
+_owner_location = None
+
+
+def get_location_resolver(name):
+    """Find a location resolver by name or "module:function" path"""
+    if name in OWNER_LOCATION_RESOLVERS:
+        return OWNER_LOCATION_RESOLVERS[name]
+    if ':' in name:
+        module_name, function_name = name.split(':', 1)
+        return getattr(importlib.import_module(module_name), function_name)
+    raise ValueError(f'Unknown owner location resolver: {name}')
+
+
+def resolve_owner_location(config):
+    """Resolve the site owner's location at build time, cached on disk with a TTL.
+    
+    The resolvers are tried in order; if all of them fail (e.g. an offline
+    build), the static value from config.json is used, then 'Local Build'.
+    Setting BUILD_OFFLINE=1 skips the network resolvers entirely.
+    """
+    global _owner_location
+    if _owner_location is not None:
+        return _owner_location
+    
+    options = get_build_options(config, 'owner_location')
+    resolvers = options.get('resolver', ['ipapi', 'ip-api'])
+    if isinstance(resolvers, str):
+        resolvers = [resolvers]
+    if os.environ.get('BUILD_OFFLINE'):
+        resolvers = ['static']
+    fallback = options.get('value') or 'Local Build'
+    
+    cache_file = options.get('cache_file', os.path.join('.build-cache', 'owner-location.json'))
+    ttl_seconds = options.get('cache_ttl_hours', 24) * 3600
+    if resolvers != ['static'] and os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('resolvers') == resolvers and time.time() - cached.get('resolved_at', 0) < ttl_seconds:
+                _owner_location = cached['location']
+                print(f'📍 Owner location: {_owner_location} (cached)')
+                return _owner_location
+        except (OSError, ValueError, KeyError):
+            pass
+    
+    location = None
+    for name in resolvers:
+        try:
+            location = get_location_resolver(name)(options)
+        except Exception as e:
+            print(f'⚠️  Owner location resolver "{name}" failed: {e}')
+            continue
+        if location:
+            break
+    
+    if location and resolvers != ['static']:
+        os.makedirs(os.path.dirname(cache_file) or '.', exist_ok=True)
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump({'location': location, 'resolvers': resolvers, 'resolved_at': time.time()}, f)
+    
+    _owner_location = location or fallback
+    print(f'📍 Owner location: {_owner_location}')
+    return _owner_location
+
+
+def generate_footer(personal, template_info=None, analytics=None, owner_location='Local Build'):
     """Generate footer HTML"""
     current_year = datetime.now().year
 
@@ -330,7 +598,7 @@ def generate_footer(personal, template_info=None, analytics=None):
         if clustrmaps_mode == 'image':
             clustrmaps_html = (
                 f'<a href="https://clustrmaps.com/site/{clustrmaps_site}" title="ClustrMaps">'
-                f'<img src="//www.clustrmaps.com/map_v2.png?d={clustrmaps_d}&cl={clustrmaps_cl}&w={clustrmaps_w}"></a>'
+                f'<img src="//www.clustrmaps.com/map_v2.png?d={clustrmaps_d}&cl={clustrmaps_cl}&w={clustrmaps_w}" loading="lazy" decoding="async"></a>'
             )
         else:
             # Default: JavaScript embed (recommended)
@@ -366,7 +634,7 @@ def generate_footer(personal, template_info=None, analytics=None):
             <div class="footer-stats">
                 <div class="stats-item">
                     <i class="fas fa-map-marker-alt"></i>
-                    Last updated from: <span id="owner-location">Loading...</span>
+                    Last updated from: <span id="owner-location">{escape(owner_location)}</span>
                 </div>
                 <div class="stats-item">
                     <i class="fas fa-clock"></i>
@@ -379,52 +647,22 @@ def generate_footer(personal, template_info=None, analytics=None):
     </footer>'''
 
 
-def generate_common_scripts():
+def generate_common_scripts(service_worker=False):
     """Generate common JavaScript"""
     # Get current build time
     build_time = datetime.now().strftime('%Y-%m-%d')
     
+    register_service_worker = '''
+        // Cache the site for repeat visits
+        if ('serviceWorker' in navigator) {
+            window.addEventListener('load', function() {
+                navigator.serviceWorker.register('sw.js');
+            });
+        }
+        ''' if service_worker else ''
+    
     return f'''
     <script>
-        // Get website owner's location during build (not visitor's location)
-        async function getOwnerLocation() {{
-            try {{
-                // Try primary API first
-                let response = await fetch('https://ipapi.co/json/');
-                let data = await response.json();
-                
-                if (data.city && data.country_name) {{
-                    const location = `${{data.city}}, ${{data.country_name}}`;
-                    document.getElementById('owner-location').textContent = location;
-                    return;
-                }}
-                
-                // If primary API fails, try backup API
-                response = await fetch('https://api.ipify.org?format=json');
-                const ipData = await response.json();
-                
-                if (ipData.ip) {{
-                    // Use a different geolocation service
-                    response = await fetch(`https://ip-api.com/json/${{ipData.ip}}`);
-                    data = await response.json();
-                    
-                    if (data.city && data.country) {{
-                        const location = `${{data.city}}, ${{data.country}}`;
-                        document.getElementById('owner-location').textContent = location;
-                        return;
-                    }}
-                }}
-                
-                // If all APIs fail, show a default message
-                document.getElementById('owner-location').textContent = 'Local Build';
-                
-            }} catch (error) {{
-                console.log('Location detection failed:', error);
-                // For local builds, show a more appropriate message
-                document.getElementById('owner-location').textContent = 'Local Build';
-            }}
-        }}
-        
         // Set last updated time (when site was built)
         function setLastUpdated() {{
             const buildDate = '{build_time}';
@@ -439,9 +677,9 @@ def generate_common_scripts():
         
         // Initialize on page load
         document.addEventListener('DOMContentLoaded', function() {{
-            getOwnerLocation();
             setLastUpdated();
         }});
+        {register_service_worker}
     </script>'''
 
 
@@ -455,6 +693,7 @@ def generate_index_page(config):
     service = config['service']
     publications = config['publications']
     template_info = config.get('_template_info')
+    eager_images = get_eager_image_count(config, 'index')
     
     # Get selected publications (featured first, then recent)
     selected_pubs = []
@@ -501,20 +740,10 @@ def generate_index_page(config):
     # Generate selected publications
     target_name = personal['name'].split()[0]  # Use first name for highlighting
     pubs_html = []
-    for pub in selected_pubs:
-        venue_badge = format_publication_venue(pub['venue_type'], pub['venue'], pub.get('is_oral', False))
-        authors_formatted = highlight_author_name(pub['authors'], target_name)
-        links_formatted = format_publication_links(pub['links'])
-        
-        pubs_html.append(f'''
-            <div class="publication-item">
-                <img src="{pub['image']}" alt="{pub['title']}" class="publication-image teaser" onerror="this.src='images/default-paper.png'">
-                <div class="publication-content">
-                    <p class="publication-title">{venue_badge} {pub['title']}</p>
-                    <p class="publication-authors">{authors_formatted}</p>
-                    <p class="publication-links">{links_formatted}</p>
-                </div>
-            </div>''')
+    for i, pub in enumerate(selected_pubs):
+        # The profile photo is the first image on the page
+        img_attrs = image_loading_attrs(i + 1, eager_images)
+        pubs_html.append(generate_publication_item(pub, target_name, img_attrs, inline_image_src(pub['image'], config)))
     
     # Generate publications section (only if there are publications)
     pubs_section_html = ''
@@ -533,12 +762,12 @@ def generate_index_page(config):
             </div>
         </section>'''
     
-    # Generate experience items
+    # Generate experience items (below the publications, so the logos are always lazy)
     exp_html = []
-    for exp in experience:
+    for i, exp in enumerate(experience):
         exp_html.append(f'''
             <div class="experience-item">
-                <img src="{exp['logo']}" alt="{exp['company']}" class="experience-logo">
+                <img src="{inline_image_src(exp['logo'], config)}" alt="{exp['company']}" class="experience-logo" {image_loading_attrs(len(selected_pubs) + 1 + i, 0)}>
                 <div class="experience-content">
                     <p class="experience-position">{exp['position']}</p>
                     <p class="experience-company">{exp['company']}</p>
@@ -594,8 +823,6 @@ def generate_index_page(config):
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{personal['name']} - Academic Homepage</title>
     <link rel="stylesheet" href="styles.css">
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
     <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
     <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
     <link rel="stylesheet" href="https://cdn.jsdelivr.net/gh/jpswalsh/academicons@1/css/academicons.min.css">
@@ -606,7 +833,7 @@ def generate_index_page(config):
     <header class="header">
         <nav class="nav">
             <div class="nav-container">
-                {generate_navigation(personal, 'Bio')}
+                {generate_navigation(personal, 'Bio', get_build_options(config, 'search').get('enabled', False))}
             </div>
         </nav>
     </header>
@@ -619,7 +846,7 @@ def generate_index_page(config):
                 <div class="hero-content">
                     <!-- Left: Photo -->
                     <div class="hero-photo">
-                        <img src="{personal['profile_image']}" alt="{personal['name']}" class="profile-image">
+                        <img src="{inline_image_src(personal['profile_image'], config)}" alt="{personal['name']}" class="profile-image" {image_loading_attrs(0, eager_images)}>
                     </div>
                     
                     <!-- Right: Introduction -->
@@ -686,7 +913,7 @@ def generate_index_page(config):
         </section>
     </main>
 
-    {generate_footer(personal, template_info, config.get('analytics'))}
+    {generate_footer(personal, template_info, config.get('analytics'), resolve_owner_location(config))}
     
     <script>
         // News filter functionality
@@ -729,17 +956,14 @@ def generate_index_page(config):
         }});
     </script>
     
-    {generate_common_scripts()}
+    {generate_common_scripts(get_build_options(config, 'service_worker').get('enabled', False))}
 </body>
 </html>'''
 
 
-def generate_publications_page(config):
-    """Generate complete publications.html page"""
-    personal = config['personal']
-    research = config['research']
+def collect_publication_groups(config):
+    """Group publications the way the publications page shows them: manual years, surveys, auto-synced"""
     publications = config['publications']
-    template_info = config.get('_template_info')
     scholar_sync = config.get('_scholar_sync', {})
     
     # Separate auto-synced and manual publications
@@ -748,7 +972,6 @@ def generate_publications_page(config):
     
     # Process publications by year, separating auto-synced ones
     sorted_years = sorted([year for year in publications.keys() if year != 'survey'], reverse=True)
-    target_name = personal['name'].split()[0]
     
     for year in sorted_years:
         year_pubs = publications[year]
@@ -763,81 +986,16 @@ def generate_publications_page(config):
         if manual_year_pubs:
             manual_pubs[year] = manual_year_pubs
     
-    # Generate manual publications by year
-    year_sections = []
-    manual_years = sorted(manual_pubs.keys(), reverse=True)
-    
-    for year in manual_years:
-        year_pubs = manual_pubs[year]
-        pub_items = []
-        
-        for pub in year_pubs:
-            venue_badge = format_publication_venue(pub['venue_type'], pub['venue'], pub.get('is_oral', False))
-            authors_formatted = highlight_author_name(pub['authors'], target_name)
-            links_formatted = format_publication_links(pub['links'])
-            
-            pub_items.append(f'''
-                <div class="publication-item">
-                    <img src="{pub['image']}" alt="{pub['title']}" class="publication-image teaser" onerror="this.src='images/default-paper.png'">
-                    <div class="publication-content">
-                        <p class="publication-title">{venue_badge} {pub['title']}</p>
-                        <p class="publication-authors">{authors_formatted}</p>
-                        <p class="publication-links">{links_formatted}</p>
-                    </div>
-                </div>''')
-        
-        year_sections.append(f'''
-            <div class="year-group">
-                <h3 class="year-title">{year}</h3>
-                <div class="publications-list">
-                    {''.join(pub_items)}
-                </div>
-            </div>''')
+    groups = []
+    for year in sorted(manual_pubs.keys(), reverse=True):
+        groups.append({'title': year, 'pubs': manual_pubs[year], 'show_oral': True})
     
-    # Generate survey papers section
+    # Survey papers section
     if 'survey' in publications:
-        survey_items = []
-        for pub in publications['survey']:
-            venue_badge = format_publication_venue(pub['venue_type'], pub['venue'])
-            authors_formatted = highlight_author_name(pub['authors'], target_name)
-            links_formatted = format_publication_links(pub['links'])
-            
-            survey_items.append(f'''
-                <div class="publication-item">
-                    <img src="{pub['image']}" alt="{pub['title']}" class="publication-image teaser" onerror="this.src='images/default-paper.png'">
-                    <div class="publication-content">
-                        <p class="publication-title">{venue_badge} {pub['title']}</p>
-                        <p class="publication-authors">{authors_formatted}</p>
-                        <p class="publication-links">{links_formatted}</p>
-                    </div>
-                </div>''')
-        
-        year_sections.append(f'''
-            <div class="year-group">
-                <h3 class="year-title">Survey Papers</h3>
-                <div class="publications-list">
-                    {''.join(survey_items)}
-                </div>
-            </div>''')
+        groups.append({'title': 'Survey Papers', 'pubs': publications['survey'], 'show_oral': False})
     
-    # Generate auto-synced publications section
+    # Auto-synced publications section
     if auto_synced_pubs:
-        auto_sync_items = []
-        for pub in auto_synced_pubs:
-            venue_badge = format_publication_venue(pub['venue_type'], pub['venue'], pub.get('is_oral', False))
-            authors_formatted = highlight_author_name(pub['authors'], target_name)
-            links_formatted = format_publication_links(pub['links'])
-            
-            auto_sync_items.append(f'''
-                <div class="publication-item">
-                    <img src="{pub['image']}" alt="{pub['title']}" class="publication-image teaser" onerror="this.src='images/default-paper.png'">
-                    <div class="publication-content">
-                        <p class="publication-title">{venue_badge} {pub['title']}</p>
-                        <p class="publication-authors">{authors_formatted}</p>
-                        <p class="publication-links">{links_formatted}</p>
-                    </div>
-                </div>''')
-        
         # Generate Scholar sync info
         scholar_sync_info = ''
         if scholar_sync.get('last_sync_date'):
@@ -846,11 +1004,112 @@ def generate_publications_page(config):
             formatted_date = sync_date.strftime('%b %d, %Y')
             scholar_sync_info = f' (Last synced: {formatted_date})'
         
+        groups.append({
+            'title': f'Other Publications <span class="auto-sync-note">Auto-updated based on Google Scholar{scholar_sync_info}</span>',
+            'pubs': auto_synced_pubs,
+            'show_oral': True,
+        })
+    
+    return groups
+
+
+def publications_page_filename(page_number):
+    """File name of a publications page: publications.html, publications-2.html, ..."""
+    return 'publications.html' if page_number == 1 else f'publications-{page_number}.html'
+
+
+def paginate_publication_groups(groups, config):
+    """Split publication groups into pages according to build.pagination.publications.
+    
+    mode "year" puts each group on its own page; mode "count" fills pages with
+    per_page publications, repeating a group's heading when it continues on the
+    next page. Any other mode keeps everything on one page.
+    """
+    options = get_build_options(config, 'pagination').get('publications', {})
+    mode = options.get('mode', 'none')
+    
+    if mode == 'year':
+        return [[group] for group in groups] or [[]]
+    
+    if mode != 'count':
+        return [groups]
+    
+    per_page = max(1, options.get('per_page', 25))
+    pages = [[]]
+    room = per_page
+    for group in groups:
+        pubs = group['pubs']
+        while pubs:
+            if room == 0:
+                pages.append([])
+                room = per_page
+            pages[-1].append(dict(group, pubs=pubs[:room]))
+            pubs = pubs[room:]
+            room -= len(pages[-1][-1]['pubs'])
+    return pages
+
+
+def generate_pagination_nav(page_number, page_count, page_filename):
+    """Prev/next links and page numbers for a paginated list"""
+    if page_count <= 1:
+        return ''
+    
+    links = []
+    if page_number > 1:
+        links.append(f'<a href="{page_filename(page_number - 1)}" class="pagination-link" rel="prev"><i class="fas fa-arrow-left"></i> Previous</a>')
+    for number in range(1, page_count + 1):
+        if number == page_number:
+            links.append(f'<span class="pagination-link current" aria-current="page">{number}</span>')
+        else:
+            links.append(f'<a href="{page_filename(number)}" class="pagination-link">{number}</a>')
+    if page_number < page_count:
+        links.append(f'<a href="{page_filename(page_number + 1)}" class="pagination-link" rel="next">Next <i class="fas fa-arrow-right"></i></a>')
+    
+    return f'''
+                <nav class="pagination" aria-label="Publication pages">
+                    {''.join(links)}
+                </nav>'''
+
+
+def generate_pagination_hints(page_number, page_count, page_filename):
+    """rel=prev/next links for the page head, plus a prefetch of the next page"""
+    hints = []
+    if page_number > 1:
+        hints.append(f'<link rel="prev" href="{page_filename(page_number - 1)}">')
+    if page_number < page_count:
+        hints.append(f'<link rel="next" href="{page_filename(page_number + 1)}">')
+        hints.append(f'<link rel="prefetch" href="{page_filename(page_number + 1)}">')
+    return ''.join(f'\n    {hint}' for hint in hints)
+
+
+def generate_publications_page(config, groups=None, page_number=1, page_count=1):
+    """Generate complete publications.html page (or one page of it when paginated)"""
+    personal = config['personal']
+    research = config['research']
+    template_info = config.get('_template_info')
+    target_name = personal['name'].split()[0]
+    
+    if groups is None:
+        groups = collect_publication_groups(config)
+    
+    # Images are numbered in document order, so each page gets its own eager images
+    eager_images = get_eager_image_count(config, 'publications')
+    image_position = 0
+    year_sections = []
+    
+    for group in groups:
+        pub_items = []
+        
+        for pub in group['pubs']:
+            pub_items.append(generate_publication_item(pub, target_name, image_loading_attrs(image_position, eager_images),
+                                                   inline_image_src(pub['image'], config), show_oral=group['show_oral']))
+            image_position += 1
+        
         year_sections.append(f'''
             <div class="year-group">
-                <h3 class="year-title">Other Publications <span class="auto-sync-note">Auto-updated based on Google Scholar{scholar_sync_info}</span></h3>
+                <h3 class="year-title">{group['title']}</h3>
                 <div class="publications-list">
-                    {''.join(auto_sync_items)}
+                    {''.join(pub_items)}
                 </div>
             </div>''')
     
@@ -859,6 +1118,8 @@ def generate_publications_page(config):
     if research.get('stats'):
         stats_html = ' <span class="stat-divider">•</span> '.join([f'<span class="stat-item">{stat}</span>' for stat in research['stats']])
     
+    page_title = 'Publications' if page_number == 1 else f'Publications (Page {page_number})'
+    
     return f'''<!DOCTYPE html>
 <!-- 
   Generated by Config-Driven Academic Website Template
@@ -870,10 +1131,8 @@ def generate_publications_page(config):
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Publications - {personal['name']}</title>
-    <link rel="stylesheet" href="styles.css">
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
+    <title>{page_title} - {personal['name']}</title>
+    <link rel="stylesheet" href="styles.css">{generate_pagination_hints(page_number, page_count, publications_page_filename)}
     <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
     <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
     <link rel="stylesheet" href="https://cdn.jsdelivr.net/gh/jpswalsh/academicons@1/css/academicons.min.css">
@@ -883,7 +1142,7 @@ def generate_publications_page(config):
     <header class="header">
         <nav class="nav">
             <div class="nav-container">
-                {generate_navigation(personal, 'Publications')}
+                {generate_navigation(personal, 'Publications', get_build_options(config, 'search').get('enabled', False))}
             </div>
         </nav>
     </header>
@@ -909,78 +1168,612 @@ def generate_publications_page(config):
         <section class="section">
             <div class="container">
                 {''.join(year_sections)}
+                {generate_pagination_nav(page_number, page_count, publications_page_filename)}
             </div>
         </section>
     </main>
 
-    {generate_footer(personal, template_info, config.get('analytics'))}
+    {generate_footer(personal, template_info, config.get('analytics'), resolve_owner_location(config))}
     
-    {generate_common_scripts()}
+    {generate_common_scripts(get_build_options(config, 'service_worker').get('enabled', False))}
 </body>
 </html>'''
 
 
-def generate_blog_page(config):
-    """Generate complete blog.html page"""
-    personal = config['personal']
-    template_info = config.get('_template_info')
+def generate_publications_pages(config):
+    """Generate publications.html and, when paginated, publications-2.html, ..."""
+    pages = paginate_publication_groups(collect_publication_groups(config), config)
+    return {
+        publications_page_filename(number): generate_publications_page(config, groups, number, len(pages))
+        for number, groups in enumerate(pages, 1)
+    }
+
+
+def publication_page_index(config):
+    """Map each publication (by identity) to the publications page it is listed on"""
+    page_of = {}
+    pages = paginate_publication_groups(collect_publication_groups(config), config)
+    for number, groups in enumerate(pages, 1):
+        for group in groups:
+            for pub in group['pubs']:
+                page_of[id(pub)] = publications_page_filename(number)
+    return page_of
+
+
+def page_key(filename):
+    """Page name used for per-page options: 'publications-2.html' -> 'publications'"""
+    return re.sub(r'-\d+$', '', os.path.splitext(filename)[0])
+
+
+def remove_stale_pages(pages):
+    """Delete publications-N.html files left over from a build with more pages"""
+    for filename in os.listdir('.'):
+        if re.fullmatch(r'publications-\d+\.html', filename) and filename not in pages:
+            os.remove(filename)
+            print(f'🗑️  Removed stale {filename}')
+
+
+BLOG_APP_SCRIPT = '''// Blog functionality
+const blogConfig = window.BLOG_CONFIG || {};
+const eagerImageCount = blogConfig.eagerImageCount || 0;
+// Set when the list is paginated: each page and post is a script in this directory
+const blogDataDir = blogConfig.dataDir || '';
+const loadedScripts = {};
+let currentView = 'list';
+let currentPost = null;
+
+function loadScript(src) {
+    if (!loadedScripts[src]) {
+        loadedScripts[src] = new Promise((resolve, reject) => {
+            const script = document.createElement('script');
+            script.src = src;
+            script.onload = resolve;
+            script.onerror = () => {
+                delete loadedScripts[src];
+                script.remove();
+                reject(new Error('Failed to load ' + src));
+            };
+            document.head.appendChild(script);
+        });
+    }
+    return loadedScripts[src];
+}
+
+function fetchBlogPost(postId) {
+    if (!blogDataDir) {
+        return Promise.resolve(window.getBlogPost(postId));
+    }
+    return loadScript(`${blogDataDir}/post-${encodeURIComponent(postId)}.js`)
+        .then(() => (window.BLOG_POSTS || {})[postId], () => undefined);
+}
+
+function fetchListPage(requestedPage) {
+    // Resolves to { posts, currentPage, pageCount, nextImages }
+    if (!blogDataDir) {
+        return Promise.resolve({ posts: window.getAllBlogPosts(), currentPage: 1, pageCount: 1, nextImages: [] });
+    }
+    const load = page => loadScript(`${blogDataDir}/page-${page}.js`)
+        .then(() => Object.assign({ currentPage: page }, window.BLOG_PAGES[page]));
+    const page = Math.max(requestedPage, 1);
+    // A page past the end shows the last one
+    return load(page).catch(() => load(1).then(first =>
+        page > first.pageCount ? load(first.pageCount) : first));
+}
+
+function showBlogList() {
+    document.getElementById('blog-list-view').style.display = 'block';
+    document.getElementById('blog-post-view').style.display = 'none';
+    currentView = 'list';
     
-    return f'''<!DOCTYPE html>
-<!-- 
-  Generated by Config-Driven Academic Website Template
-  Author: Sixun Dong (ironieser)
-  Repository: https://github.com/Ironieser/ironieser.github.io
-  License: MIT
--->
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Blog - {personal['name']}</title>
-    <link rel="stylesheet" href="styles.css">
-    <link rel="stylesheet" href="blog.css">
-    <link rel="stylesheet" href="blog-comments.css">
-    <link rel="preconnect" href="https://fonts.googleapis.com">
-    <link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>
-    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
-    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/gh/jpswalsh/academicons@1/css/academicons.min.css">
-    <link rel="stylesheet" href="https://unpkg.com/@waline/client@v3/dist/waline.css">
-    <script src="blog-data.js"></script>
-</head>
-<body>
-    <!-- Navigation -->
-    <header class="header">
-        <nav class="nav">
-            <div class="nav-container">
-                {generate_navigation(personal, 'Blog')}
+    // Update URL without page reload
+    const url = new URL(window.location);
+    url.searchParams.delete('post');
+    window.history.replaceState({}, '', url);
+}
+
+function showBlogPost(postId) {
+    return fetchBlogPost(postId).then(post => renderBlogPost(postId, post));
+}
+
+function renderBlogPost(postId, post) {
+    if (!post) {
+        console.error('Post not found:', postId);
+        return;
+    }
+    
+    currentPost = post;
+    
+    // Hide list view, show post view
+    document.getElementById('blog-list-view').style.display = 'none';
+    document.getElementById('blog-post-view').style.display = 'block';
+    currentView = 'post';
+    
+    // Update URL
+    const url = new URL(window.location);
+    url.searchParams.set('post', postId);
+    window.history.replaceState({}, '', url);
+    
+    // Load post content
+    loadPostContent(post);
+    
+    // Initialize comments after content is loaded
+    setTimeout(() => {
+        initWalineComments(post.title);
+    }, 500);
+}
+
+function loadPostContent(post) {
+    const container = document.getElementById('blog-post-content');
+    
+    const tagsHtml = post.tags.map(tag => 
+        `<span class="blog-tag">${tag}</span>`
+    ).join('');
+    
+    let externalLinkSection = '';
+    if (post.isExternal) {
+        externalLinkSection = `
+            <div class="external-link-section">
+                <div class="external-link-notice">
+                    <i class="fas fa-external-link-alt"></i>
+                    <span>This article was originally published on ${post.platform}</span>
+                </div>
+                <a href="${post.externalUrl}" target="_blank" class="external-link-button">
+                    <i class="fab fa-${post.platform.toLowerCase()}"></i>
+                    Read Full Article on ${post.platform}
+                </a>
             </div>
-        </nav>
-    </header>
+        `;
+    }
+    
+    container.innerHTML = `
+        <header class="blog-post-header">
+            <h1 class="blog-post-title">${post.title}</h1>
+            <div class="blog-post-meta">
+                <span class="blog-post-date">
+                    <i class="fas fa-calendar"></i> ${post.formattedDate}
+                </span>
+                ${post.isExternal ? `<span class="blog-post-platform"><i class="fas fa-external-link-alt"></i> ${post.platform}</span>` : ''}
+            </div>
+            <div class="blog-post-tags">
+                ${tagsHtml}
+            </div>
+            ${externalLinkSection}
+        </header>
+        
+        <div class="blog-post-body">
+            ${post.content}
+        </div>
+        
+        <!-- Comments Section -->
+        <section class="blog-comments-section">
+            <div class="comments-header">
+                <h3 class="comments-title">
+                    <i class="fas fa-comments"></i>
+                    Comments & Discussions
+                </h3>
+                <p class="comments-subtitle">
+                    Join the discussion! Comments are powered by 
+                    <a href="https://waline.js.org" target="_blank" rel="noopener">Waline</a>.
+                    You can comment anonymously or sign in with email.
+                </p>
+                <div class="comments-info">
+                    <h4>How to comment:</h4>
+                    <ul>
+                        <li>💬 Comment anonymously or sign in with email</li>
+                        <li>📝 Support Markdown formatting</li>
+                        <li>👍 Like and reply to comments</li>
+                        <li>🔔 Get email notifications for replies (optional)</li>
+                    </ul>
+                </div>
+            </div>
+            <div id="waline" class="waline-container">
+                <!-- Waline comments will be loaded here -->
+            </div>
+        </section>
+    `;
+}
 
-    <!-- Main Content -->
-    <main class="main">
-        <!-- Blog List View -->
-        <div id="blog-list-view" class="blog-view">
-            <!-- Page Header -->
-            <section class="page-header">
-                <div class="container">
-                    <div class="page-header-content">
-                        <h1 class="page-title-left">Blog</h1>
-                        <div class="blog-intro">
-                            <p>Welcome to my blog! Here I share insights about my research, thoughts on the latest developments in computer vision and AI, tutorials, and reflections on my academic journey.</p>
+function loadBlogPosts() {
+    const container = document.getElementById('blog-posts-container');
+    const loading = document.getElementById('blog-loading');
+    const noPostsMsg = document.getElementById('no-posts-message');
+    
+    const requestedPage = parseInt(new URLSearchParams(window.location.search).get('page'), 10) || 1;
+    
+    // Only the current page of posts is loaded and rendered
+    return fetchListPage(requestedPage).then(({ posts, currentPage, pageCount, nextImages }) => {
+        loading.style.display = 'none';
+        
+        if (posts.length === 0) {
+            noPostsMsg.style.display = 'block';
+            return;
+        }
+        
+        const postsHtml = posts.map((post, index) => {
+            const imgAttrs = index < eagerImageCount
+                ? 'loading="eager" fetchpriority="high" decoding="async"'
+                : 'loading="lazy" decoding="async"';
+            const tagsHtml = post.tags.slice(0, 3).map(tag => 
+                `<span class="blog-tag">${tag}</span>`
+            ).join('');
+            
+            if (post.isExternal) {
+                // External blog post (e.g., Zhihu)
+                return `
+                    <div class="blog-item external-post" data-post-id="${post.id}">
+                        <img src="${post.image}" alt="${post.title}" class="blog-image" ${imgAttrs} onerror="this.src='images/default-paper.png'">
+                        <div class="blog-content">
+                            <div class="blog-type-badge external">External</div>
+                            <h3 class="blog-title">
+                                <a href="#" class="blog-link external-link" data-post-id="${post.id}">${post.title}</a>
+                            </h3>
+                            <p class="blog-description">${post.description}</p>
+                            <div class="blog-meta">
+                                <span class="blog-date">${post.formattedDate}</span>
+                                <div class="blog-links">
+                                    <i class="fab fa-zhihu"></i> 
+                                    <a href="${post.externalUrl}" target="_blank">Read on ${post.platform}</a>
+                                </div>
+                                <span class="blog-tags">
+                                    ${tagsHtml}
+                                </span>
+                            </div>
                         </div>
                     </div>
-                </div>
-            </section>
-
-            <!-- Blog Posts List -->
-            <section class="section">
-                <div class="container">
-                    <div id="blog-posts-container" class="blog-list">
-                        <!-- Blog posts will be loaded here by JavaScript -->
+                `;
+            } else {
+                // Internal blog post
+                return `
+                    <div class="blog-item internal-post" data-post-id="${post.id}">
+                        <img src="${post.image}" alt="${post.title}" class="blog-image" ${imgAttrs} onerror="this.src='images/default-paper.png'">
+                        <div class="blog-content">
+                            <div class="blog-type-badge internal">Blog</div>
+                            <h3 class="blog-title">
+                                <a href="#" class="blog-link internal-link" data-post-id="${post.id}">${post.title}</a>
+                            </h3>
+                            <p class="blog-description">${post.description}</p>
+                            <div class="blog-meta">
+                                <span class="blog-date">${post.formattedDate}</span>
+                                <span class="blog-tags">
+                                    ${tagsHtml}
+                                </span>
+                            </div>
+                        </div>
                     </div>
-                    
+                `;
+            }
+        }).join('');
+        
+        container.innerHTML = postsHtml;
+        renderBlogPagination(currentPage, pageCount);
+        prefetchPostImages(nextImages);
+        
+        // Add click handlers
+        document.querySelectorAll('.internal-link').forEach(link => {
+            link.addEventListener('click', function(e) {
+                e.preventDefault();
+                const postId = this.getAttribute('data-post-id');
+                showBlogPost(postId);
+            });
+        });
+
+        document.querySelectorAll('.external-link').forEach(link => {
+            link.addEventListener('click', function(e) {
+                e.preventDefault();
+                const postId = this.getAttribute('data-post-id');
+                showBlogPost(postId);
+            });
+        });
+        
+        document.querySelectorAll('.blog-item.internal-post').forEach(item => {
+            item.addEventListener('click', function() {
+                const postId = this.getAttribute('data-post-id');
+                showBlogPost(postId);
+            });
+        });
+
+        document.querySelectorAll('.blog-item.external-post').forEach(item => {
+            item.addEventListener('click', function() {
+                const postId = this.getAttribute('data-post-id');
+                showBlogPost(postId);
+            });
+        });
+        
+    }).catch(error => {
+        loading.style.display = 'none';
+        console.error('Error loading blog posts:', error);
+        container.innerHTML = `
+            <div class="error-message">
+                <i class="fas fa-exclamation-triangle"></i>
+                <h3>Error Loading Posts</h3>
+                <p>There was an error loading the blog posts. Please try again later.</p>
+            </div>
+        `;
+    });
+}
+
+function renderBlogPagination(currentPage, pageCount) {
+    const nav = document.getElementById('blog-pagination');
+    if (pageCount <= 1) {
+        nav.style.display = 'none';
+        return;
+    }
+    
+    const links = [];
+    if (currentPage > 1) {
+        links.push(`<a href="?page=${currentPage - 1}" class="pagination-link" rel="prev"><i class="fas fa-arrow-left"></i> Previous</a>`);
+    }
+    for (let page = 1; page <= pageCount; page++) {
+        links.push(page === currentPage
+            ? `<span class="pagination-link current" aria-current="page">${page}</span>`
+            : `<a href="?page=${page}" class="pagination-link">${page}</a>`);
+    }
+    if (currentPage < pageCount) {
+        links.push(`<a href="?page=${currentPage + 1}" class="pagination-link" rel="next">Next <i class="fas fa-arrow-right"></i></a>`);
+    }
+    
+    nav.innerHTML = links.join('');
+    nav.style.display = 'flex';
+}
+
+function prefetchPostImages(images) {
+    // Warm the cache for the images at the top of the next page
+    images.forEach(image => {
+        if (document.querySelector(`link[rel="prefetch"][href="${image}"]`)) {
+            return;
+        }
+        const link = document.createElement('link');
+        link.rel = 'prefetch';
+        link.as = 'image';
+        link.href = image;
+        document.head.appendChild(link);
+    });
+}
+
+function initializeBlog() {
+    // Check for post parameter in URL
+    const urlParams = new URLSearchParams(window.location.search);
+    const postId = urlParams.get('post');
+    
+    if (postId) {
+        // Show specific post
+        showBlogPost(postId);
+    } else {
+        // Show blog list
+        showBlogList();
+        loadBlogPosts();
+    }
+    
+    // Back button handler
+    document.getElementById('back-to-list').addEventListener('click', function() {
+        showBlogList();
+        loadBlogPosts();
+    });
+    
+    // Handle browser back/forward
+    window.addEventListener('popstate', function() {
+        const urlParams = new URLSearchParams(window.location.search);
+        const postId = urlParams.get('post');
+        
+        if (postId) {
+            showBlogPost(postId);
+        } else {
+            showBlogList();
+            loadBlogPosts();
+        }
+    });
+}
+
+// Initialize Waline comments
+function initWalineComments(postTitle) {
+    // Check if comments are enabled in config
+    const commentsConfig = blogConfig.comments || { waline: { enabled: false } };
+    const walineConfig = commentsConfig.waline || {};
+    
+    if (!walineConfig.enabled || !walineConfig.serverURL) {
+        const walineContainer = document.getElementById('waline');
+        if (walineContainer) {
+            walineContainer.innerHTML = '<p class="comments-disabled">Comments are disabled for this post.</p>';
+        }
+        // Also hide the comments header
+        const commentsSection = document.querySelector('.blog-comments-section');
+        if (commentsSection) {
+            commentsSection.style.display = 'none';
+        }
+        return;
+    }
+    
+    // Clear any existing Waline instance
+    const walineContainer = document.getElementById('waline');
+    if (walineContainer) {
+        walineContainer.innerHTML = '';
+    }
+    
+    // Import and initialize Waline
+    import('https://unpkg.com/@waline/client@v3/dist/waline.js')
+        .then(({ init }) => {
+            init({
+                el: '#waline',
+                serverURL: walineConfig.serverURL,
+                path: window.location.pathname + window.location.search,
+                lang: 'en-US',
+                locale: {
+                    placeholder: 'Hi, looking forward to your comments! Feel free to leave any suggestions!',
+                    sofa: 'No comments yet.',
+                    submit: 'Submit',
+                    reply: 'Reply',
+                    cancelReply: 'Cancel Reply',
+                    comment: 'Comments',
+                    refresh: 'Refresh',
+                    more: 'Load More...',
+                    preview: 'Preview',
+                    emoji: 'Emoji',
+                    uploadImage: 'Upload Image',
+                    seconds: 'seconds ago',
+                    minutes: 'minutes ago',
+                    hours: 'hours ago',
+                    days: 'days ago',
+                    now: 'just now',
+                    uploading: 'Uploading',
+                    login: 'Login',
+                    logout: 'Logout',
+                    admin: 'Admin',
+                    sticky: 'Sticky',
+                    word: 'Words',
+                    wordHint: 'Please input $0 to $1 words\\n Current word number: $2',
+                    anonymous: 'Anonymous',
+                    level0: 'Dwarves',
+                    level1: 'Hobbits', 
+                    level2: 'Ents',
+                    level3: 'Wizards',
+                    level4: 'Elves',
+                    level5: 'Maiar',
+                    gif: 'GIF',
+                    gifSearchPlaceholder: 'Search GIF',
+                    profile: 'Profile',
+                    approved: 'Approved',
+                    waiting: 'Waiting',
+                    spam: 'Spam',
+                    unsticky: 'Unsticky',
+                    oldest: 'Oldest',
+                    latest: 'Latest',
+                    hottest: 'Hottest',
+                    reactionTitle: 'What do you think?'
+                },
+                emoji: [
+                    '//unpkg.com/@waline/client@v3/dist/emoji/weibo',
+                    '//unpkg.com/@waline/client@v3/dist/emoji/alus',
+                    '//unpkg.com/@waline/client@v3/dist/emoji/bilibili',
+                ],
+                dark: false,
+                meta: ['nick', 'mail', 'link'],
+                requiredMeta: [],
+                login: 'enable',
+                wordLimit: [0, 1000],
+                pageSize: 10,
+                region: 'us',
+            });
+        })
+        .catch(error => {
+            console.error('Failed to load Waline:', error);
+            const walineContainer = document.getElementById('waline');
+            if (walineContainer) {
+                walineContainer.innerHTML = `
+                    <div class="waline-error">
+                        <i class="fas fa-exclamation-triangle"></i>
+                        <p>Failed to load comment system. Please try refreshing the page.</p>
+                    </div>
+                `;
+            }
+        });
+}
+
+// Initialize when page loads
+document.addEventListener('DOMContentLoaded', function() {
+    // Wait a bit for blog-data.js to load (a paginated blog loads its pages on demand)
+    setTimeout(function() {
+        if (blogDataDir || typeof window.BLOG_DATA !== 'undefined') {
+            initializeBlog();
+        } else {
+            console.error('Blog data not loaded');
+            document.getElementById('blog-loading').style.display = 'none';
+            document.getElementById('no-posts-message').style.display = 'block';
+        }
+    }, 100);
+});
+'''
+
+
+def write_blog_app_script(write=True):
+    """Write the blog application script as blog-app.<hash>.js and return its file name.
+    
+    The name changes whenever the code does, so the file can be cached for
+    good. Older versions are removed. Without write, only the name is returned.
+    """
+    script = minify_js(BLOG_APP_SCRIPT)
+    script_name = f'blog-app.{hashlib.sha256(script.encode("utf-8")).hexdigest()[:12]}.js'
+    if not write:
+        return script_name
+    
+    for filename in os.listdir('.'):
+        if re.fullmatch(r'blog-app\.[0-9a-f]+\.js', filename) and filename != script_name:
+            os.remove(filename)
+    
+    with open(script_name, 'w', encoding='utf-8') as f:
+        f.write(script)
+    print(f'✓ {script_name} written ({format_bytes(len(script.encode("utf-8")))})')
+    return script_name
+
+
+def generate_blog_page(config, script_name):
+    """Generate complete blog.html page"""
+    personal = config['personal']
+    template_info = config.get('_template_info')
+    paginated = get_build_options(config, 'pagination').get('blog', {}).get('per_page', 0) > 0
+    blog_config = {
+        'eagerImageCount': get_eager_image_count(config, 'blog'),
+        'dataDir': BLOG_DATA_DIR if paginated else '',
+        'comments': config.get('comments', {'waline': {'enabled': False}}),
+    }
+    # Paginated: the list and posts are loaded from BLOG_DATA_DIR instead of blog-data.js
+    blog_data_script = '' if paginated else '\n    <script src="blog-data.js"></script>'
+    
+    return f'''<!DOCTYPE html>
+<!-- 
+  Generated by Config-Driven Academic Website Template
+  Author: Sixun Dong (ironieser)
+  Repository: https://github.com/Ironieser/ironieser.github.io
+  License: MIT
+-->
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>Blog - {personal['name']}</title>
+    <link rel="stylesheet" href="styles.css">
+    <link rel="stylesheet" href="blog.css">
+    <link rel="stylesheet" href="blog-comments.css">
+    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
+    <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.4.0/css/all.min.css">
+    <link rel="stylesheet" href="https://cdn.jsdelivr.net/gh/jpswalsh/academicons@1/css/academicons.min.css">
+    <link rel="stylesheet" href="https://unpkg.com/@waline/client@v3/dist/waline.css">{blog_data_script}
+</head>
+<body>
+    <!-- Navigation -->
+    <header class="header">
+        <nav class="nav">
+            <div class="nav-container">
+                {generate_navigation(personal, 'Blog', get_build_options(config, 'search').get('enabled', False))}
+            </div>
+        </nav>
+    </header>
+
+    <!-- Main Content -->
+    <main class="main">
+        <!-- Blog List View -->
+        <div id="blog-list-view" class="blog-view">
+            <!-- Page Header -->
+            <section class="page-header">
+                <div class="container">
+                    <div class="page-header-content">
+                        <h1 class="page-title-left">Blog</h1>
+                        <div class="blog-intro">
+                            <p>Welcome to my blog! Here I share insights about my research, thoughts on the latest developments in computer vision and AI, tutorials, and reflections on my academic journey.</p>
+                        </div>
+                    </div>
+                </div>
+            </section>
+
+            <!-- Blog Posts List -->
+            <section class="section">
+                <div class="container">
+                    <div id="blog-posts-container" class="blog-list">
+                        <!-- Blog posts will be loaded here by JavaScript -->
+                    </div>
+                    
+                    <!-- Page links, filled in when the list is paginated -->
+                    <nav id="blog-pagination" class="pagination" aria-label="Blog pages" style="display: none;"></nav>
+                    
                     <!-- Loading indicator -->
                     <div id="blog-loading" class="blog-loading">
                         <i class="fas fa-spinner fa-spin"></i>
@@ -1019,392 +1812,1352 @@ def generate_blog_page(config):
         </div>
     </main>
 
-    {generate_footer(personal, template_info, config.get('analytics'))}
+    {generate_footer(personal, template_info, config.get('analytics'), resolve_owner_location(config))}
     
     <script>
-        // Blog functionality
-        let currentView = 'list';
-        let currentPost = null;
+        // Blog settings for the deferred blog application script
+        window.BLOG_CONFIG = {json.dumps(blog_config)};
+    </script>
+    <script src="{script_name}" defer></script>
+    
+    {generate_common_scripts(get_build_options(config, 'service_worker').get('enabled', False))}
+</body>
+</html>'''
+
+def strip_css_comments(css):
+    """Remove /* ... */ comments from a stylesheet"""
+    return re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+
+
+def parse_css(css):
+    """Split a stylesheet into (prelude, body) blocks.
+    
+    Grouping at-rules such as @media and @supports get a list of child blocks
+    as their body; every other block keeps its declarations as a string.
+    """
+    css = strip_css_comments(css)
+    blocks = []
+    pos = 0
+    length = len(css)
+    
+    while pos < length:
+        brace = css.find('{', pos)
+        semicolon = css.find(';', pos)
+        if brace == -1:
+            break
         
-        function showBlogList() {{
-            document.getElementById('blog-list-view').style.display = 'block';
-            document.getElementById('blog-post-view').style.display = 'none';
-            currentView = 'list';
-            
-            // Update URL without page reload
-            const url = new URL(window.location);
-            url.searchParams.delete('post');
-            window.history.replaceState({{}}, '', url);
-        }}
+        # Statement at-rules without a block, e.g. @import or @charset
+        if semicolon != -1 and semicolon < brace and css[pos:semicolon].strip().startswith('@'):
+            blocks.append((css[pos:semicolon].strip(), None))
+            pos = semicolon + 1
+            continue
         
-        function showBlogPost(postId) {{
-            const post = window.getBlogPost(postId);
-            if (!post) {{
-                console.error('Post not found:', postId);
-                return;
-            }}
-            
-            currentPost = post;
-            
-            // Hide list view, show post view
-            document.getElementById('blog-list-view').style.display = 'none';
-            document.getElementById('blog-post-view').style.display = 'block';
-            currentView = 'post';
-            
-            // Update URL
-            const url = new URL(window.location);
-            url.searchParams.set('post', postId);
-            window.history.replaceState({{}}, '', url);
-            
-            // Load post content
-            loadPostContent(post);
-            
-            // Initialize comments after content is loaded
-            setTimeout(() => {{
-                initWalineComments(post.title);
-            }}, 500);
-        }}
+        prelude = css[pos:brace].strip()
+        depth = 1
+        end = brace + 1
+        quote = None
+        while end < length and depth:
+            char = css[end]
+            if quote:
+                if char == '\\':
+                    end += 1
+                elif char == quote:
+                    quote = None
+            elif char in '"\'':
+                quote = char
+            elif char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+            end += 1
         
-        function loadPostContent(post) {{
-            const container = document.getElementById('blog-post-content');
+        body = css[brace + 1:end - 1]
+        if re.match(r'@(media|supports|document|layer|container)\b', prelude):
+            blocks.append((prelude, parse_css(body)))
+        else:
+            blocks.append((prelude, body.strip()))
+        pos = end
+    
+    return blocks
+
+
+def serialize_css(blocks):
+    """Turn parsed CSS blocks back into a stylesheet"""
+    parts = []
+    for prelude, body in blocks:
+        if body is None:
+            parts.append(f'{prelude};')
+        elif isinstance(body, list):
+            parts.append(f'{prelude} {{\n{serialize_css(body)}\n}}')
+        else:
+            parts.append(f'{prelude} {{\n    {body}\n}}')
+    return '\n\n'.join(parts)
+
+
+def minify_css(css):
+    """Minify a stylesheet: drop comments and whitespace, keep strings intact"""
+    css = strip_css_comments(css)
+    # Keep quoted strings away from the whitespace rules
+    strings = []
+    
+    def stash(match):
+        strings.append(match.group(0))
+        return f'\x00{len(strings) - 1}\x00'
+    
+    css = re.sub(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'', stash, css)
+    css = re.sub(r'\s+', ' ', css)
+    css = re.sub(r'\s*([{};,>])\s*', r'\1', css)
+    # Space after ':' is only removable inside declaration blocks, not in selectors
+    css = re.sub(r'\{([^{}]*)\}', lambda m: '{' + re.sub(r'\s*:\s*', ':', m.group(1)) + '}', css)
+    css = css.replace(';}', '}')
+    css = re.sub(r'\x00(\d+)\x00', lambda m: strings[int(m.group(1))], css)
+    return css.strip()
+
+
+class MarkupTokenCollector(HTMLParser):
+    """Collect the tag names, classes and ids used in a piece of markup"""
+
+    def __init__(self):
+        super().__init__()
+        self.tags = set()
+        self.classes = set()
+        self.ids = set()
+
+    def handle_starttag(self, tag, attrs):
+        self.tags.add(tag)
+        for name, value in attrs:
+            if name == 'class' and value:
+                self.classes.update(value.split())
+            elif name == 'id' and value:
+                self.ids.add(value)
+
+
+def collect_markup_tokens(html):
+    """Return the sets of tags, classes and ids used in the given HTML"""
+    collector = MarkupTokenCollector()
+    collector.feed(html)
+    return {'tags': collector.tags, 'classes': collector.classes, 'ids': collector.ids}
+
+
+def split_selectors(selector_list):
+    """Split a selector list on top-level commas"""
+    selectors = []
+    depth = 0
+    current = ''
+    for char in selector_list:
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        if char == ',' and depth == 0:
+            selectors.append(current.strip())
+            current = ''
+        else:
+            current += char
+    if current.strip():
+        selectors.append(current.strip())
+    return selectors
+
+
+# Selectors for markup that only exists once content is rendered (blog posts from
+# Markdown), kept even when the current posts do not use them
+DEFAULT_KEEP_SELECTORS = ['*.blog-post-*']
+
+
+def selector_matches(selector, tokens):
+    """Check whether every class, id and tag in a selector is used in the markup.
+    
+    Combinators, pseudo-classes and attribute selectors are ignored, so the
+    check can keep a rule that does not really apply, but never drops one that does.
+    Classes and ids matching a glob in tokens['patterns'] always count as used,
+    and whole selectors matching a glob in tokens['keep'] are always kept.
+    """
+    if any(fnmatch.fnmatchcase(selector, pattern) for pattern in tokens.get('keep', ())):
+        return True
+    simplified = re.sub(r'::?[\w-]+(\((?:[^()]|\([^()]*\))*\))?', ' ', selector)
+    simplified = re.sub(r'\[[^\]]*\]', ' ', simplified)
+    
+    patterns = tokens.get('patterns', ())
+    for class_name in re.findall(r'\.(-?[_a-zA-Z][\w-]*)', simplified):
+        if class_name not in tokens['classes'] and not any(fnmatch.fnmatchcase(class_name, p) for p in patterns):
+            return False
+    for id_name in re.findall(r'#(-?[_a-zA-Z][\w-]*)', simplified):
+        if id_name not in tokens['ids'] and not any(fnmatch.fnmatchcase(id_name, p) for p in patterns):
+            return False
+    for tag in re.findall(r'(?:^|[\s>+~])([a-zA-Z][\w-]*)', simplified):
+        if tag.lower() not in tokens['tags'] and tag.lower() not in ('html', 'body'):
+            return False
+    return True
+
+
+def filter_css_blocks(blocks, tokens):
+    """Keep only the rules whose selectors match the given markup tokens"""
+    kept = []
+    for prelude, body in blocks:
+        if isinstance(body, list):
+            children = filter_css_blocks(body, tokens)
+            if children:
+                kept.append((prelude, children))
+        elif prelude.startswith('@'):
+            # @font-face, @keyframes and friends are not tied to selectors
+            kept.append((prelude, body))
+        else:
+            selectors = [sel for sel in split_selectors(prelude) if selector_matches(sel, tokens)]
+            if selectors:
+                kept.append((', '.join(selectors), body))
+    return kept
+
+
+def extract_above_fold(html, sections):
+    """Return the markup from <body> up to the end of the first N sections of <main>"""
+    body_start = html.find('<body')
+    main_start = html.find('<main', body_start)
+    if body_start == -1 or main_start == -1:
+        return html
+    
+    section_starts = [m.start() for m in re.finditer(r'<section\b', html[main_start:])]
+    if len(section_starts) > sections:
+        return html[body_start:main_start + section_starts[sections]]
+    return html[body_start:html.find('</main>', main_start)]
+
+
+# Number of <main> sections per page treated as above the fold by default
+DEFAULT_FOLD_SECTIONS = {'index': 1, 'publications': 2, 'blog': 1}
+
+STYLESHEET_LINK = re.compile(r'<link rel="stylesheet" href="([^"]+)">')
+CSS_URL = re.compile(r'url\(\s*([\'"]?)([^\'")]+)\1\s*\)')
+
+
+def rebase_css_urls(css, base_dir):
+    """Rewrite relative url() values so they resolve from a page at the site root.
+    
+    A rule copied out of assets/fonts/fonts.css into a page must point at
+    assets/fonts/InterVariable.woff2, not at InterVariable.woff2.
+    """
+    if not base_dir:
+        return css
+    
+    def rebase(match):
+        quote, url = match.group(1), match.group(2).strip()
+        if not is_local_url(url) or url.startswith('/'):
+            return match.group(0)
+        return f'url({quote}{os.path.normpath(os.path.join(base_dir, url)).replace(os.sep, "/")}{quote})'
+    
+    return CSS_URL.sub(rebase, css)
+
+
+def inline_critical_css(filename, html, config):
+    """Inline the CSS needed above the fold and load local stylesheets without blocking"""
+    options = get_build_options(config, 'critical_css')
+    page = page_key(filename)
+    sections = options.get('above_fold_sections', {}).get(page, DEFAULT_FOLD_SECTIONS.get(page, 1))
+    
+    stylesheets = [href for href in STYLESHEET_LINK.findall(html) if is_local_url(href) and os.path.isfile(local_path_from_url(href))]
+    if not stylesheets:
+        return html
+    
+    tokens = collect_markup_tokens(extract_above_fold(html, sections))
+    critical_parts = []
+    for href in stylesheets:
+        with open(local_path_from_url(href), 'r', encoding='utf-8') as f:
+            blocks = filter_css_blocks(parse_css(f.read()), tokens)
+        critical_parts.append(rebase_css_urls(serialize_css(blocks), os.path.dirname(href)))
+    critical_css = minify_css('\n'.join(critical_parts))
+    
+    def defer_stylesheet(match):
+        href = match.group(1)
+        if href not in stylesheets:
+            return match.group(0)
+        return (f'<link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">'
+                f'<noscript><link rel="stylesheet" href="{href}"></noscript>')
+    
+    first_link = STYLESHEET_LINK.search(html, 0)
+    while first_link and first_link.group(1) not in stylesheets:
+        first_link = STYLESHEET_LINK.search(html, first_link.end())
+    html = html[:first_link.start()] + f'<style>{critical_css}</style>\n    ' + html[first_link.start():]
+    
+    print(f'✓ {filename}: inlined {format_bytes(len(critical_css))} of critical CSS')
+    return STYLESHEET_LINK.sub(defer_stylesheet, html)
+
+
+def collect_script_tokens(js):
+    """Collect classes, ids and tags that a script writes into the page.
+    
+    Picks up markup built in strings (class="...", id="...", <tag) and
+    classList/className calls. Class names assembled at runtime, such as
+    `fa-${platform}`, cannot be seen here and belong in the allowlist.
+    """
+    tokens = {'tags': set(), 'classes': set(), 'ids': set()}
+    for value in re.findall(r'class=\\?["\']([^"\']*)', js):
+        tokens['classes'].update(name for name in value.split() if '${' not in name and '}' not in name)
+    for value in re.findall(r'className\s*=\s*["\']([^"\']*)["\']', js):
+        tokens['classes'].update(value.split())
+    for args in re.findall(r'classList\.(?:add|remove|toggle|contains|replace)\(([^)]*)\)', js):
+        tokens['classes'].update(re.findall(r'["\']([\w-]+)["\']', args))
+    for value in re.findall(r'\bid=\\?["\']([^"\'$]+)["\']', js):
+        tokens['ids'].add(value.strip())
+    tokens['tags'].update(tag.lower() for tag in re.findall(r'<([a-zA-Z][\w-]*)', js))
+    return tokens
+
+
+def collect_site_tokens(pages):
+    """Collect every tag, class and id used by the generated pages and their scripts"""
+    tokens = {'tags': set(), 'classes': set(), 'ids': set()}
+    scripts = []
+    
+    for html in pages.values():
+        page_tokens = collect_markup_tokens(html)
+        for key in tokens:
+            tokens[key].update(page_tokens[key])
+        scripts.extend(re.findall(r'<script[^>]*>(.*?)</script>', html, flags=re.DOTALL))
+        for src in re.findall(r'<script[^>]*\bsrc="([^"]+)"', html):
+            path = local_path_from_url(src)
+            if is_local_url(src) and os.path.isfile(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    scripts.append(f.read())
+    
+    for js in scripts:
+        script_tokens = collect_script_tokens(js)
+        for key in tokens:
+            tokens[key].update(script_tokens[key])
+    return tokens
+
+
+def drop_unused_keyframes(blocks):
+    """Remove @keyframes that no remaining rule refers to"""
+    declarations = []
+    
+    def collect(children):
+        for prelude, body in children:
+            if isinstance(body, list):
+                collect(body)
+            elif body and not prelude.startswith('@keyframes'):
+                declarations.append(body)
+    
+    collect(blocks)
+    used_text = '\n'.join(declarations)
+    
+    def keep(prelude):
+        match = re.match(r'@(?:-\w+-)?keyframes\s+([\w-]+)', prelude)
+        return not match or re.search(r'\b' + re.escape(match.group(1)) + r'\b', used_text)
+    
+    return [(prelude, drop_unused_keyframes(body) if isinstance(body, list) else body)
+            for prelude, body in blocks if keep(prelude)]
+
+
+def optimize_stylesheets(pages, config, write=True):
+    """Prune unused rules from the local stylesheets, minify them and point pages at the results.
+    
+    Without write, stylesheets that were already optimized by an earlier build
+    are left as they are; only missing ones are written.
+    """
+    options = get_build_options(config, 'css')
+    prune = options.get('prune_unused', False)
+    minify = options.get('minify', False)
+    
+    tokens = collect_site_tokens(pages)
+    tokens['patterns'] = options.get('allowlist', [])
+    tokens['keep'] = options.get('keep_selectors', DEFAULT_KEEP_SELECTORS)
+    
+    stylesheets = []
+    for html in pages.values():
+        for href in STYLESHEET_LINK.findall(html):
+            if is_local_url(href) and os.path.isfile(local_path_from_url(href)) and href not in stylesheets:
+                stylesheets.append(href)
+    
+    renamed = {}
+    for href in stylesheets:
+        stem, ext = os.path.splitext(href)
+        optimized_href = f'{stem}.min{ext}' if minify else f'{stem}.pruned{ext}'
+        renamed[href] = optimized_href
+        if not write and os.path.isfile(local_path_from_url(optimized_href)):
+            continue
+        
+        path = local_path_from_url(href)
+        with open(path, 'r', encoding='utf-8') as f:
+            css = f.read()
+        
+        blocks = parse_css(css)
+        if prune:
+            blocks = drop_unused_keyframes(filter_css_blocks(blocks, tokens))
+        optimized = serialize_css(blocks)
+        if minify:
+            optimized = minify_css(optimized)
+        
+        with open(local_path_from_url(optimized_href), 'w', encoding='utf-8') as f:
+            f.write(optimized)
+        print(f'✓ {href}: {format_bytes(len(css.encode("utf-8")))} → {format_bytes(len(optimized.encode("utf-8")))} ({optimized_href})')
+    
+    for filename, html in pages.items():
+        pages[filename] = STYLESHEET_LINK.sub(
+            lambda match: f'<link rel="stylesheet" href="{renamed.get(match.group(1), match.group(1))}">', html)
+    return renamed
+
+
+# Icon fonts that can be self-hosted from vendored files (config.json -> build.fonts)
+ICON_FONTS = [
+    {'styles': ('fas', 'fa-solid', 'fa'), 'family': 'Font Awesome 6 Free', 'weight': 900, 'prefix': 'fa-', 'cdn': 'fontawesome',
+     'css': 'fontawesome/css/all.min.css', 'font': 'fontawesome/webfonts/fa-solid-900'},
+    {'styles': ('far', 'fa-regular'), 'family': 'Font Awesome 6 Free', 'weight': 400, 'prefix': 'fa-', 'cdn': 'fontawesome',
+     'css': 'fontawesome/css/all.min.css', 'font': 'fontawesome/webfonts/fa-regular-400'},
+    {'styles': ('fab', 'fa-brands'), 'family': 'Font Awesome 6 Brands', 'weight': 400, 'prefix': 'fa-', 'cdn': 'fontawesome',
+     'css': 'fontawesome/css/all.min.css', 'font': 'fontawesome/webfonts/fa-brands-400'},
+    {'styles': ('ai',), 'family': 'Academicons', 'weight': 400, 'prefix': 'ai-', 'cdn': 'academicons',
+     'css': 'academicons/css/academicons.min.css', 'font': 'academicons/fonts/academicons'},
+]
+
+DEFAULT_TEXT_FONTS = [{'family': 'Inter', 'file': 'inter/InterVariable.woff2', 'weight': '300 700'}]
+
+# Third-party stylesheets replaced by the self-hosted fonts.css, grouped by what replaces them
+CDN_FONT_LINKS = {
+    'text': re.compile(r'[ \t]*<link[^>]*fonts\.(?:googleapis|gstatic)\.com[^>]*>\n?'),
+    'fontawesome': re.compile(r'[ \t]*<link[^>]*font-awesome[^>]*>\n?'),
+    'academicons': re.compile(r'[ \t]*<link[^>]*academicons[^>]*>\n?'),
+    'waline': re.compile(r'[ \t]*<link[^>]*@waline/client[^>]*\.css">\n?'),
+}
+
+FONT_FORMATS = {'.woff2': 'woff2', '.woff': 'woff', '.ttf': 'truetype', '.otf': 'opentype'}
+
+ICON_BASE_CSS = (
+    '{selectors}{{-moz-osx-font-smoothing:grayscale;-webkit-font-smoothing:antialiased;'
+    'display:inline-block;font-style:normal;font-variant:normal;line-height:1;text-rendering:auto}}'
+)
+FA_SPIN_CSS = ('.fa-spin{animation:fa-spin 2s linear infinite}'
+               '@keyframes fa-spin{0%{transform:rotate(0deg)}to{transform:rotate(360deg)}}')
+
+
+def find_vendored_font(vendor_dir, stem):
+    """Find a vendored font file, trying the usual web font formats"""
+    for ext in ('.woff2', '.ttf', '.woff', '.otf'):
+        if os.path.isfile(os.path.join(vendor_dir, stem + ext)):
+            return os.path.join(vendor_dir, stem + ext)
+    return None
+
+
+def parse_icon_codepoints(css_path, prefix):
+    """Map icon names (e.g. 'fa-github') to their codepoints from a vendored icon stylesheet"""
+    with open(css_path, 'r', encoding='utf-8') as f:
+        css = f.read()
+    
+    codepoints = {}
+    for selectors, codepoint in re.findall(r'([^{}]+)\{\s*content:\s*["\']\\([0-9a-fA-F]+)["\']', css):
+        for name in re.findall(r'\.(' + re.escape(prefix) + r'[\w-]+):{1,2}before', selectors):
+            codepoints[name] = int(codepoint, 16)
+    return codepoints
+
+
+def collect_used_icons(pages, config):
+    """Collect the (style, icon) class pairs used in the pages, their scripts and config.json"""
+    texts = list(pages.values())
+    for html in pages.values():
+        for src in re.findall(r'<script[^>]*\bsrc="([^"]+)"', html):
+            path = local_path_from_url(src)
+            if is_local_url(src) and os.path.isfile(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    texts.append(f.read())
+    
+    class_lists = []
+    for text in texts:
+        class_lists.extend(re.findall(r'class=\\?["\']([^"\']*)', text))
+    class_lists.extend(link.get('icon', '') for link in config.get('personal', {}).get('links', []))
+    for year_pubs in config.get('publications', {}).values():
+        if isinstance(year_pubs, list):
+            for pub in year_pubs:
+                class_lists.extend(link.get('icon', '') for link in pub.get('links', []))
+    class_lists.extend(get_build_options(config, 'fonts').get('icon_allowlist', []))
+    
+    used = set()
+    for class_list in class_lists:
+        names = [name for name in class_list.split() if '${' not in name]
+        for icon_font in ICON_FONTS:
+            if any(style in names for style in icon_font['styles']):
+                used.update((icon_font['styles'][0], name) for name in names
+                            if name.startswith(icon_font['prefix']) and name not in icon_font['styles'])
+    return used
+
+
+def subset_font(source, destination, unicodes):
+    """Write a subset of a font containing only the given codepoints"""
+    options = font_subset.Options()
+    options.flavor = os.path.splitext(destination)[1].lstrip('.')
+    options.layout_features = ['*']
+    options.name_IDs = ['*']
+    options.notdef_outline = True
+    font = font_subset.load_font(source, options)
+    subsetter = font_subset.Subsetter(options)
+    subsetter.populate(unicodes=sorted(unicodes))
+    subsetter.subset(font)
+    font_subset.save_font(font, destination, options)
+    font.close()
+
+
+def font_face_css(family, filename, weight):
+    """@font-face rule for a self-hosted font"""
+    font_format = FONT_FORMATS[os.path.splitext(filename)[1]]
+    return (f"@font-face{{font-family:'{family}';font-style:normal;font-weight:{weight};"
+            f"font-display:swap;src:url({filename}) format('{font_format}')}}")
+
+
+def self_host_fonts(pages, config):
+    """Build subset web fonts from vendored files and replace the font and icon CDNs"""
+    options = get_build_options(config, 'fonts')
+    vendor_dir = options.get('vendor_dir', 'vendor')
+    output_dir = options.get('output_dir', 'assets/fonts')
+    
+    if font_subset is None:
+        print('⚠️  fontTools is not installed (pip install fonttools brotli); keeping the font CDNs')
+        return False
+    # WOFF2 needs brotli; fall back to zlib-compressed WOFF without it
+    font_ext = '.woff2' if brotli is not None else '.woff'
+    os.makedirs(output_dir, exist_ok=True)
+    
+    css_parts = []
+    icon_rules = []
+    replaced = set()
+    
+    # Icon fonts: keep only the glyphs the site actually uses. A CDN stylesheet is
+    # only replaced when every font it provides could be built from vendored files.
+    used_icons = collect_used_icons(pages, config)
+    for cdn in ('fontawesome', 'academicons'):
+        cdn_css, cdn_rules = [], []
+        complete = True
+        for icon_font in (f for f in ICON_FONTS if f['cdn'] == cdn):
+            style = icon_font['styles'][0]
+            names = sorted(name for used_style, name in used_icons if used_style == style)
+            if not names:
+                continue
+            css_path = os.path.join(vendor_dir, icon_font['css'])
+            font_path = find_vendored_font(vendor_dir, icon_font['font'])
+            if not os.path.isfile(css_path) or not font_path:
+                print(f'⚠️  Vendored files for {icon_font["family"]} ({style}) not found under {vendor_dir}/')
+                complete = False
+                break
             
-            const tagsHtml = post.tags.map(tag => 
-                `<span class="blog-tag">${{tag}}</span>`
-            ).join('');
+            codepoints = parse_icon_codepoints(css_path, icon_font['prefix'])
+            glyphs = {name: codepoints[name] for name in names if name in codepoints}
+            filename = os.path.basename(icon_font['font']) + font_ext
+            subset_font(font_path, os.path.join(output_dir, filename), glyphs.values())
             
-            let externalLinkSection = '';
-            if (post.isExternal) {{
-                externalLinkSection = `
-                    <div class="external-link-section">
-                        <div class="external-link-notice">
-                            <i class="fas fa-external-link-alt"></i>
-                            <span>This article was originally published on ${{post.platform}}</span>
-                        </div>
-                        <a href="${{post.externalUrl}}" target="_blank" class="external-link-button">
-                            <i class="fab fa-${{post.platform.toLowerCase()}}"></i>
-                            Read Full Article on ${{post.platform}}
-                        </a>
-                    </div>
-                `;
-            }}
-            
-            container.innerHTML = `
-                <header class="blog-post-header">
-                    <h1 class="blog-post-title">${{post.title}}</h1>
-                    <div class="blog-post-meta">
-                        <span class="blog-post-date">
-                            <i class="fas fa-calendar"></i> ${{post.formattedDate}}
-                        </span>
-                        ${{post.isExternal ? `<span class="blog-post-platform"><i class="fas fa-external-link-alt"></i> ${{post.platform}}</span>` : ''}}
-                    </div>
-                    <div class="blog-post-tags">
-                        ${{tagsHtml}}
-                    </div>
-                    ${{externalLinkSection}}
-                </header>
-                
-                <div class="blog-post-body">
-                    ${{post.content}}
-                </div>
-                
-                <!-- Comments Section -->
-                <section class="blog-comments-section">
-                    <div class="comments-header">
-                        <h3 class="comments-title">
-                            <i class="fas fa-comments"></i>
-                            Comments & Discussions
-                        </h3>
-                        <p class="comments-subtitle">
-                            Join the discussion! Comments are powered by 
-                            <a href="https://waline.js.org" target="_blank" rel="noopener">Waline</a>.
-                            You can comment anonymously or sign in with email.
-                        </p>
-                        <div class="comments-info">
-                            <h4>How to comment:</h4>
-                            <ul>
-                                <li>💬 Comment anonymously or sign in with email</li>
-                                <li>📝 Support Markdown formatting</li>
-                                <li>👍 Like and reply to comments</li>
-                                <li>🔔 Get email notifications for replies (optional)</li>
-                            </ul>
-                        </div>
-                    </div>
-                    <div id="waline" class="waline-container">
-                        <!-- Waline comments will be loaded here -->
-                    </div>
-                </section>
-            `;
-        }}
+            cdn_css.append(font_face_css(icon_font['family'], filename, icon_font['weight']))
+            selectors = ','.join('.' + s for s in icon_font['styles'])
+            cdn_rules.append(ICON_BASE_CSS.format(selectors=selectors))
+            cdn_rules.append(f"{selectors}{{font-family:'{icon_font['family']}';font-weight:{icon_font['weight']}}}")
+            cdn_rules.extend(f'.{name}:before{{content:"\\{codepoint:x}"}}' for name, codepoint in glyphs.items())
+            print(f'✓ {icon_font["family"]} ({style}): {len(glyphs)} glyphs → {filename}')
         
-        function loadBlogPosts() {{
-            const container = document.getElementById('blog-posts-container');
-            const loading = document.getElementById('blog-loading');
-            const noPostsMsg = document.getElementById('no-posts-message');
-            
-            try {{
-                const posts = window.getAllBlogPosts();
-                
-                loading.style.display = 'none';
-                
-                if (posts.length === 0) {{
-                    noPostsMsg.style.display = 'block';
-                    return;
-                }}
-                
-                const postsHtml = posts.map(post => {{
-                    const tagsHtml = post.tags.slice(0, 3).map(tag => 
-                        `<span class="blog-tag">${{tag}}</span>`
-                    ).join('');
-                    
-                    if (post.isExternal) {{
-                        // External blog post (e.g., Zhihu)
-                        return `
-                            <div class="blog-item external-post" data-post-id="${{post.id}}">
-                                <img src="${{post.image}}" alt="${{post.title}}" class="blog-image" onerror="this.src='images/default-paper.png'">
-                                <div class="blog-content">
-                                    <div class="blog-type-badge external">External</div>
-                                    <h3 class="blog-title">
-                                        <a href="#" class="blog-link external-link" data-post-id="${{post.id}}">${{post.title}}</a>
-                                    </h3>
-                                    <p class="blog-description">${{post.description}}</p>
-                                    <div class="blog-meta">
-                                        <span class="blog-date">${{post.formattedDate}}</span>
-                                        <div class="blog-links">
-                                            <i class="fab fa-zhihu"></i> 
-                                            <a href="${{post.externalUrl}}" target="_blank">Read on ${{post.platform}}</a>
-                                        </div>
-                                        <span class="blog-tags">
-                                            ${{tagsHtml}}
-                                        </span>
-                                    </div>
-                                </div>
-                            </div>
-                        `;
-                    }} else {{
-                        // Internal blog post
-                        return `
-                            <div class="blog-item internal-post" data-post-id="${{post.id}}">
-                                <img src="${{post.image}}" alt="${{post.title}}" class="blog-image" onerror="this.src='images/default-paper.png'">
-                                <div class="blog-content">
-                                    <div class="blog-type-badge internal">Blog</div>
-                                    <h3 class="blog-title">
-                                        <a href="#" class="blog-link internal-link" data-post-id="${{post.id}}">${{post.title}}</a>
-                                    </h3>
-                                    <p class="blog-description">${{post.description}}</p>
-                                    <div class="blog-meta">
-                                        <span class="blog-date">${{post.formattedDate}}</span>
-                                        <span class="blog-tags">
-                                            ${{tagsHtml}}
-                                        </span>
-                                    </div>
-                                </div>
-                            </div>
-                        `;
-                    }}
-                }}).join('');
-                
-                container.innerHTML = postsHtml;
-                
-                // Add click handlers
-                document.querySelectorAll('.internal-link').forEach(link => {{
-                    link.addEventListener('click', function(e) {{
-                        e.preventDefault();
-                        const postId = this.getAttribute('data-post-id');
-                        showBlogPost(postId);
-                    }});
-                }});
+        if complete:
+            if cdn == 'fontawesome' and any(name == 'fa-spin' for _, name in used_icons):
+                cdn_rules.append(FA_SPIN_CSS)
+            css_parts.extend(cdn_css)
+            icon_rules.extend(cdn_rules)
+            replaced.add(cdn)
+    
+    # Text fonts: keep Latin plus every character that appears in the generated content
+    text = ''.join(pages.values())
+    if os.path.isfile('blog-data.js'):
+        with open('blog-data.js', 'r', encoding='utf-8') as f:
+            text += f.read()
+    unicodes = set(range(0x20, 0x7f)) | set(range(0xa0, 0x100)) | set(range(0x2010, 0x2030)) | {0x20ac, 0x2122}
+    unicodes |= {ord(char) for char in text if ord(char) >= 0x20}
+    
+    text_fonts_ok = True
+    for text_font in options.get('text_fonts', DEFAULT_TEXT_FONTS):
+        font_path = os.path.join(vendor_dir, text_font['file'])
+        if not os.path.isfile(font_path):
+            print(f'⚠️  Vendored font {font_path} not found')
+            text_fonts_ok = False
+            continue
+        stem = os.path.splitext(os.path.basename(text_font['file']))[0]
+        filename = f'{stem}{font_ext}'
+        subset_font(font_path, os.path.join(output_dir, filename), unicodes)
+        css_parts.append(font_face_css(text_font['family'], filename, text_font.get('weight', 400)))
+        print(f'✓ {text_font["family"]}: {format_bytes(os.path.getsize(os.path.join(output_dir, filename)))} → {filename}')
+    if text_fonts_ok:
+        replaced.add('text')
+    
+    # Waline's stylesheet is copied as-is when vendored
+    waline_css = os.path.join(vendor_dir, 'waline', 'waline.css')
+    if os.path.isfile(waline_css):
+        with open(waline_css, 'r', encoding='utf-8') as f:
+            css_parts.append(f.read())
+        replaced.add('waline')
+    
+    if not replaced:
+        return False
+    
+    fonts_css = os.path.join(output_dir, 'fonts.css')
+    with open(fonts_css, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(css_parts + icon_rules) + '\n')
+    
+    fonts_link = f'    <link rel="stylesheet" href="{fonts_css.replace(os.sep, "/")}">\n'
+    for filename, html in pages.items():
+        positions = [m.start() for key in replaced for m in CDN_FONT_LINKS[key].finditer(html)]
+        if not positions:
+            continue
+        insert_at = min(positions)
+        head, tail = html[:insert_at], html[insert_at:]
+        for key in replaced:
+            tail = CDN_FONT_LINKS[key].sub('', tail)
+        pages[filename] = head + fonts_link + tail
+    print(f'✓ Self-hosted fonts written to {output_dir}/ (replaced: {", ".join(sorted(replaced))})')
+    return True
 
-                document.querySelectorAll('.external-link').forEach(link => {{
-                    link.addEventListener('click', function(e) {{
-                        e.preventDefault();
-                        const postId = this.getAttribute('data-post-id');
-                        showBlogPost(postId);
-                    }});
-                }});
-                
-                document.querySelectorAll('.blog-item.internal-post').forEach(item => {{
-                    item.addEventListener('click', function() {{
-                        const postId = this.getAttribute('data-post-id');
-                        showBlogPost(postId);
-                    }});
-                }});
 
-                document.querySelectorAll('.blog-item.external-post').forEach(item => {{
-                    item.addEventListener('click', function() {{
-                        const postId = this.getAttribute('data-post-id');
-                        showBlogPost(postId);
-                    }});
-                }});
-                
-            }} catch (error) {{
-                loading.style.display = 'none';
-                console.error('Error loading blog posts:', error);
-                container.innerHTML = `
-                    <div class="error-message">
-                        <i class="fas fa-exclamation-triangle"></i>
-                        <h3>Error Loading Posts</h3>
-                        <p>There was an error loading the blog posts. Please try again later.</p>
-                    </div>
-                `;
-            }}
-        }}
+# Tags whose content must be left untouched by the HTML minifier
+PRESERVED_HTML_TAGS = re.compile(r'(<(pre|code|textarea|script|style)\b[^>]*>.*?</\2\s*>)', re.DOTALL | re.IGNORECASE)
+
+# Whitespace around these tags never renders, so it can be dropped entirely
+BLOCK_HTML_TAGS = (
+    'html|head|body|header|footer|main|nav|section|article|aside|div|p|h[1-6]|ul|ol|li|'
+    'table|thead|tbody|tr|td|th|form|meta|link|title|script|style|noscript|br|hr|button'
+)
+
+
+def minify_js(js):
+    """Conservatively shrink a script: drop indentation, blank lines and whole-line comments.
+    
+    Line breaks are kept so automatic semicolon insertion still works, and
+    nothing inside a line is touched, so strings and regexes stay intact.
+    """
+    lines = []
+    for line in js.split('\n'):
+        stripped = line.strip()
+        if stripped and not stripped.startswith('//'):
+            lines.append(stripped)
+    return '\n'.join(lines)
+
+
+def minify_html(page_html):
+    """Minify generated HTML outside of <pre>, <code>, <textarea>, <script> and <style>"""
+    parts = PRESERVED_HTML_TAGS.split(page_html)
+    result = []
+    
+    # split() with two groups yields: text, whole match, tag name, text, ...
+    for i in range(0, len(parts), 3):
+        text = parts[i]
+        text = re.sub(r'<!--(?!\[if).*?-->', '', text, flags=re.DOTALL)
+        text = re.sub(r'\s+', ' ', text)
+        text = re.sub(r'\s*(</?(?:' + BLOCK_HTML_TAGS + r')\b[^>]*>)\s*', r'\1', text, flags=re.IGNORECASE)
+        result.append(text)
         
-        function initializeBlog() {{
-            // Check for post parameter in URL
-            const urlParams = new URLSearchParams(window.location.search);
-            const postId = urlParams.get('post');
-            
-            if (postId) {{
-                // Show specific post
-                showBlogPost(postId);
-            }} else {{
-                // Show blog list
-                showBlogList();
-                loadBlogPosts();
-            }}
-            
-            // Back button handler
-            document.getElementById('back-to-list').addEventListener('click', function() {{
-                showBlogList();
-                loadBlogPosts();
-            }});
-            
-            // Handle browser back/forward
-            window.addEventListener('popstate', function() {{
-                const urlParams = new URLSearchParams(window.location.search);
-                const postId = urlParams.get('post');
-                
-                if (postId) {{
-                    showBlogPost(postId);
-                }} else {{
-                    showBlogList();
-                    loadBlogPosts();
-                }}
-            }});
-        }}
+        if i + 1 < len(parts):
+            element, tag = parts[i + 1], parts[i + 2].lower()
+            if tag in ('script', 'style'):
+                match = re.match(r'(<[^>]*>)(.*)(</[^>]*>)$', element, re.DOTALL)
+                open_tag, body, close_tag = match.groups()
+                if tag == 'style':
+                    body = minify_css(body)
+                elif 'application/ld+json' in open_tag:
+                    body = json.dumps(json.loads(body), separators=(',', ':'), ensure_ascii=False)
+                else:
+                    body = minify_js(body)
+                element = open_tag + body + close_tag
+            result.append(element)
+    
+    return ''.join(result).strip()
+
+
+# Third-party stylesheet origins whose fonts are served from another origin
+FONT_ORIGINS = {'https://fonts.googleapis.com': 'https://fonts.gstatic.com'}
+
+# Module the blog page imports when comments are enabled
+WALINE_CLIENT_URL = 'https://unpkg.com/@waline/client@v3/dist/waline.js'
+
+# Likely next navigations from each page, prefetched when the target was generated
+DEFAULT_PREFETCH = {'index.html': ['publications.html']}
+
+
+class ResourceHintCollector(HTMLParser):
+    """Collect what a page loads and which hints it already has"""
+
+    def __init__(self):
+        super().__init__()
+        self.stylesheets = []
+        self.scripts = []
+        self.eager_images = []
+        self.existing = set()
+        self.inline_css = []
+        self._in_style = False
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'link' and attrs.get('href'):
+            rel = (attrs.get('rel') or '').lower().split()
+            if 'stylesheet' in rel or ('preload' in rel and attrs.get('as') == 'style'):
+                self.stylesheets.append(attrs['href'])
+            for hint in ('preload', 'modulepreload', 'prefetch'):
+                if hint in rel:
+                    self.existing.add((hint, attrs['href']))
+            if 'preconnect' in rel:
+                self.existing.add(('preconnect', attrs['href'], 'crossorigin' in attrs))
+        elif tag == 'script' and attrs.get('src'):
+            self.scripts.append(attrs['src'])
+        elif tag == 'img' and attrs.get('src') and (attrs.get('loading') == 'eager' or attrs.get('fetchpriority') == 'high'):
+            self.eager_images.append(attrs['src'])
+        elif tag == 'style':
+            self._in_style = True
+
+    def handle_endtag(self, tag):
+        if tag == 'style':
+            self._in_style = False
+
+    def handle_data(self, data):
+        if self._in_style:
+            self.inline_css.append(data)
+
+
+def url_origin(url):
+    """scheme://host of an absolute or protocol-relative URL"""
+    parsed = urlparse(url if not url.startswith('//') else 'https:' + url)
+    return f'{parsed.scheme}://{parsed.netloc}'
+
+
+def find_font_faces(css_path):
+    """Return (family, woff2 url relative to the site root) for each @font-face in a stylesheet"""
+    with open(css_path, 'r', encoding='utf-8') as f:
+        css = strip_css_comments(f.read())
+    base_dir = os.path.dirname(css_path)
+    faces = []
+    for body in re.findall(r'@font-face\s*\{([^}]*)\}', css):
+        family = re.search(r'font-family\s*:\s*[\'"]?([^;\'"]+)', body)
+        woff2 = re.search(r'url\(\s*[\'"]?([^\'")]+\.woff2)[\'"]?\s*\)', body)
+        if family and woff2 and is_local_url(woff2.group(1)):
+            faces.append((family.group(1).strip(), local_path_from_url(woff2.group(1), base_dir).replace(os.sep, '/')))
+    return faces
+
+
+def collect_resource_hints(filename, page_html, pages, config):
+    """Work out the preconnect, preload, modulepreload and prefetch hints for one page.
+    
+    Returns (rel, href, attributes) tuples in the order they should appear.
+    """
+    options = get_build_options(config, 'resource_hints')
+    collector = ResourceHintCollector()
+    collector.feed(page_html)
+    hints = []
+    
+    # Third-party origins the page really uses: stylesheets (and the origins
+    # their fonts come from), then modules, then scripts
+    origins = []
+    for href in collector.stylesheets:
+        if not is_local_url(href):
+            origins.append((url_origin(href), {}))
+            if url_origin(href) in FONT_ORIGINS:
+                origins.append((FONT_ORIGINS[url_origin(href)], {'crossorigin': None}))
+    
+    waline = config.get('comments', {}).get('waline', {})
+    modules = [WALINE_CLIENT_URL] if filename == 'blog.html' and waline.get('enabled') and waline.get('serverURL') else []
+    origins.extend((url_origin(url), {'crossorigin': None}) for url in modules)
+    origins.extend((url_origin(src), {}) for src in collector.scripts if not is_local_url(src))
+    
+    # CORS and no-CORS requests use separate connections, so both can be worth opening
+    seen_origins = set()
+    for origin, attrs in origins:
+        key = ('preconnect', origin, 'crossorigin' in attrs)
+        if key not in seen_origins and key not in collector.existing and len(seen_origins) < options.get('max_preconnect', 4):
+            seen_origins.add(key)
+            hints.append(('preconnect', origin, attrs))
+    
+    # Above-the-fold images, the main stylesheet and the fonts the visible part uses
+    for src in collector.eager_images:
+        if is_local_url(src) and not src.startswith('data:'):
+            hints.append(('preload', src, {'as': 'image', 'fetchpriority': 'high'}))
+    
+    local_stylesheets = [href for href in collector.stylesheets if is_local_url(href) and os.path.isfile(local_path_from_url(href))]
+    if local_stylesheets:
+        hints.append(('preload', local_stylesheets[0], {'as': 'style'}))
+    
+    # With critical CSS inlined, only fonts the inlined rules name are needed up front
+    if collector.inline_css:
+        used_css = ''.join(collector.inline_css)
+    else:
+        used_css = ''
+        for href in local_stylesheets:
+            with open(local_path_from_url(href), 'r', encoding='utf-8') as f:
+                used_css += re.sub(r'@font-face\s*\{[^}]*\}', '', strip_css_comments(f.read()))
+    for href in local_stylesheets:
+        for family, font_url in find_font_faces(local_path_from_url(href)):
+            if family in used_css:
+                hints.append(('preload', font_url, {'as': 'font', 'type': 'font/woff2', 'crossorigin': None}))
+    
+    for url in modules:
+        hints.append(('modulepreload', url, {}))
+    
+    prefetch = options.get('prefetch', DEFAULT_PREFETCH)
+    for target in prefetch.get(filename, []):
+        if target in pages and target != filename:
+            hints.append(('prefetch', target, {}))
+    
+    # Drop anything the page already declares (preconnects were checked above)
+    unique = []
+    declared = set(collector.existing)
+    for rel, href, attrs in hints:
+        if rel == 'preconnect' or (rel, href) not in declared:
+            declared.add((rel, href))
+            unique.append((rel, href, attrs))
+    return unique
+
+
+def render_hint_tag(rel, href, attrs):
+    """<link> element for a resource hint"""
+    extra = ''.join(f' {name}' if value is None else f' {name}="{value}"' for name, value in attrs.items())
+    return f'<link rel="{rel}" href="{href}"{extra}>'
+
+
+def render_hint_header(rel, href, attrs):
+    """Link header value for a resource hint (paths are made root-relative)"""
+    if is_local_url(href) and not href.startswith('/'):
+        href = '/' + href
+    extra = ''.join(f'; {name}' if value is None else f'; {name}={value}' for name, value in attrs.items())
+    return f'<{href}>; rel={rel}{extra}'
+
+
+def add_resource_hints(pages, config):
+    """Add per-page resource hints to each page's <head>, and optionally to a headers file"""
+    options = get_build_options(config, 'resource_hints')
+    headers = []
+    
+    for filename in pages:
+        hints = collect_resource_hints(filename, pages[filename], pages, config)
+        if not hints:
+            continue
         
-        // Initialize Waline comments
-        function initWalineComments(postTitle) {{
-            // Check if comments are enabled in config
-            const commentsConfig = {json.dumps(config.get('comments', { 'waline': { 'enabled': False } }))};
-            const walineConfig = commentsConfig.waline || {{}};
-            
-            if (!walineConfig.enabled || !walineConfig.serverURL) {{
-                const walineContainer = document.getElementById('waline');
-                if (walineContainer) {{
-                    walineContainer.innerHTML = '<p class="comments-disabled">Comments are disabled for this post.</p>';
-                }}
-                // Also hide the comments header
-                const commentsSection = document.querySelector('.blog-comments-section');
-                if (commentsSection) {{
-                    commentsSection.style.display = 'none';
-                }}
-                return;
-            }}
-            
-            // Clear any existing Waline instance
-            const walineContainer = document.getElementById('waline');
-            if (walineContainer) {{
-                walineContainer.innerHTML = '';
-            }}
-            
-            // Import and initialize Waline
-            import('https://unpkg.com/@waline/client@v3/dist/waline.js')
-                .then(({{ init }}) => {{
-                    init({{
-                        el: '#waline',
-                        serverURL: walineConfig.serverURL,
-                        path: window.location.pathname + window.location.search,
-                        lang: 'en-US',
-                        locale: {{
-                            placeholder: 'Hi, looking forward to your comments! Feel free to leave any suggestions!',
-                            sofa: 'No comments yet.',
-                            submit: 'Submit',
-                            reply: 'Reply',
-                            cancelReply: 'Cancel Reply',
-                            comment: 'Comments',
-                            refresh: 'Refresh',
-                            more: 'Load More...',
-                            preview: 'Preview',
-                            emoji: 'Emoji',
-                            uploadImage: 'Upload Image',
-                            seconds: 'seconds ago',
-                            minutes: 'minutes ago',
-                            hours: 'hours ago',
-                            days: 'days ago',
-                            now: 'just now',
-                            uploading: 'Uploading',
-                            login: 'Login',
-                            logout: 'Logout',
-                            admin: 'Admin',
-                            sticky: 'Sticky',
-                            word: 'Words',
-                            wordHint: 'Please input $0 to $1 words\\n Current word number: $2',
-                            anonymous: 'Anonymous',
-                            level0: 'Dwarves',
-                            level1: 'Hobbits', 
-                            level2: 'Ents',
-                            level3: 'Wizards',
-                            level4: 'Elves',
-                            level5: 'Maiar',
-                            gif: 'GIF',
-                            gifSearchPlaceholder: 'Search GIF',
-                            profile: 'Profile',
-                            approved: 'Approved',
-                            waiting: 'Waiting',
-                            spam: 'Spam',
-                            unsticky: 'Unsticky',
-                            oldest: 'Oldest',
-                            latest: 'Latest',
-                            hottest: 'Hottest',
-                            reactionTitle: 'What do you think?'
-                        }},
-                        emoji: [
-                            '//unpkg.com/@waline/client@v3/dist/emoji/weibo',
-                            '//unpkg.com/@waline/client@v3/dist/emoji/alus',
-                            '//unpkg.com/@waline/client@v3/dist/emoji/bilibili',
-                        ],
-                        dark: false,
-                        meta: ['nick', 'mail', 'link'],
-                        requiredMeta: [],
-                        login: 'enable',
-                        wordLimit: [0, 1000],
-                        pageSize: 10,
-                        region: 'us',
-                    }});
-                }})
-                .catch(error => {{
-                    console.error('Failed to load Waline:', error);
-                    const walineContainer = document.getElementById('waline');
-                    if (walineContainer) {{
-                        walineContainer.innerHTML = `
-                            <div class="waline-error">
-                                <i class="fas fa-exclamation-triangle"></i>
-                                <p>Failed to load comment system. Please try refreshing the page.</p>
-                            </div>
-                        `;
-                    }}
-                }});
-        }}
+        tags = ''.join(f'\n    {render_hint_tag(*hint)}' for hint in hints)
+        pages[filename] = pages[filename].replace('</title>', '</title>' + tags, 1)
+        counts = {}
+        for rel, _, _ in hints:
+            counts[rel] = counts.get(rel, 0) + 1
+        print(f'✓ {filename}: ' + ', '.join(f'{count} {rel}' for rel, count in counts.items()))
         
-        // Initialize when page loads
-        document.addEventListener('DOMContentLoaded', function() {{
-            // Wait a bit for blog-data.js to load
-            setTimeout(function() {{
-                if (typeof window.BLOG_DATA !== 'undefined') {{
-                    initializeBlog();
-                }} else {{
-                    console.error('Blog data not loaded');
-                    document.getElementById('blog-loading').style.display = 'none';
-                    document.getElementById('no-posts-message').style.display = 'block';
-                }}
-            }}, 100);
-        }});
-    </script>
+        # Prefetches are left out of the headers: early hints are for this page's own resources
+        links = [render_hint_header(*hint) for hint in hints if hint[0] != 'prefetch']
+        paths = ['/', '/index.html'] if filename == 'index.html' else [f'/{filename}']
+        for path in paths:
+            headers.append(path)
+            headers.extend(f'  Link: {link}' for link in links)
     
-    {generate_common_scripts()}
-</body>
-</html>'''
+    headers_file = options.get('headers_file')
+    if headers_file:
+        with open(headers_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(headers) + '\n')
+        print(f'✓ Link headers written to {headers_file}')
+
+
+SERVICE_WORKER_TEMPLATE = '''// Auto-generated service worker
+// This file is automatically updated by build_local.py
+// Do not edit manually
+
+const MANIFEST_VERSION = '__VERSION__';
+const MANIFEST_URL = 'precache-manifest.json';
+const PRECACHE = 'precache';
+const RUNTIME = 'runtime';
+const REVISIONS_KEY = '__precache-revisions__';
+const ON_DEMAND = __ON_DEMAND__;
+
+let revisions = null;
+
+function scopePath(url) {
+  const scope = new URL(self.registration.scope).pathname;
+  const path = url.pathname.startsWith(scope) ? url.pathname.slice(scope.length) : url.pathname;
+  return path === '' ? 'index.html' : path;
+}
+
+// Cache key of a page: directory URLs map to their index.html, other non-.html paths are not pages
+function pageKey(path) {
+  if (path.endsWith('/')) return path + 'index.html';
+  return path.endsWith('.html') ? path : null;
+}
+
+async function loadRevisions(cache) {
+  if (revisions) return revisions;
+  const stored = await cache.match(REVISIONS_KEY);
+  revisions = stored ? await stored.json() : {};
+  return revisions;
+}
+
+// Install: fetch only the entries whose revision changed since the last build
+self.addEventListener('install', event => {
+  event.waitUntil((async () => {
+    const manifest = await (await fetch(MANIFEST_URL, { cache: 'no-store' })).json();
+    const cache = await caches.open(PRECACHE);
+    const current = await loadRevisions(cache);
+    const next = {};
+    await Promise.all(manifest.entries.map(async entry => {
+      if (current[entry.url] !== entry.revision) {
+        const response = await fetch(entry.url, { cache: 'no-cache' });
+        if (!response.ok) throw new Error(`Precache failed: ${entry.url}`);
+        await cache.put(entry.url, response);
+      }
+      next[entry.url] = entry.revision;
+    }));
+    // Drop entries that are no longer part of the site
+    for (const url of Object.keys(current)) {
+      if (!(url in next)) await cache.delete(url);
+    }
+    await cache.put(REVISIONS_KEY, new Response(JSON.stringify(next)));
+    revisions = next;
+    await self.skipWaiting();
+  })());
+});
+
+self.addEventListener('activate', event => {
+  event.waitUntil(self.clients.claim());
+});
+
+async function cacheFirst(request, path) {
+  const cache = await caches.open(PRECACHE);
+  return (await cache.match(path)) || fetch(request);
+}
+
+async function staleWhileRevalidate(request, cacheName, key, options) {
+  const cache = await caches.open(cacheName);
+  const cached = await cache.match(key, options);
+  const network = fetch(request).then(response => {
+    if (response.ok) cache.put(key, response.clone());
+    return response;
+  });
+  if (cached) {
+    network.catch(() => {});
+    return cached;
+  }
+  return network;
+}
+
+self.addEventListener('fetch', event => {
+  const request = event.request;
+  const url = new URL(request.url);
+  if (request.method !== 'GET' || url.origin !== self.location.origin) return;
+
+  const path = scopePath(url);
+  const page = pageKey(path);
+  if (page) {
+    // Pages: answer from cache right away, refresh in the background
+    event.respondWith(staleWhileRevalidate(request, PRECACHE, page, { ignoreSearch: true }));
+  } else if (ON_DEMAND.some(prefix => path.startsWith(prefix))) {
+    // Blog content: cached the first time it is requested
+    event.respondWith(staleWhileRevalidate(request, RUNTIME, request));
+  } else {
+    event.respondWith((async () => {
+      const cache = await caches.open(PRECACHE);
+      const known = await loadRevisions(cache);
+      return path in known ? cacheFirst(request, path) : fetch(request);
+    })());
+  }
+});
+'''
+
+
+def hash_file(path, state):
+    """Content hash of a file, reusing the previous hash when size and mtime are unchanged"""
+    stat = os.stat(path)
+    previous = state.get(path)
+    if previous and previous['size'] == stat.st_size and previous['mtime_ns'] == stat.st_mtime_ns:
+        return previous['hash'], False
+    
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    file_hash = digest.hexdigest()[:16]
+    state[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': file_hash}
+    return file_hash, True
+
+
+def build_service_worker(page_paths, config):
+    """Write sw.js and a versioned precache manifest of every built page and asset"""
+    options = get_build_options(config, 'service_worker')
+    on_demand = options.get('on_demand', ['blog-data.js', BLOG_DATA_DIR + '/', 'blog/'])
+    max_entry_bytes = options.get('max_entry_bytes', 2 * 1024 * 1024)
+    state_file = options.get('state_file', os.path.join('.build-cache', 'precache-state.json'))
+    
+    state = {}
+    if os.path.exists(state_file):
+        try:
+            with open(state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+    
+    urls = []
+    for page_path in page_paths:
+        assets, _ = collect_page_assets(page_path)
+        for path in [page_path] + assets:
+            url = path.replace(os.sep, '/')
+            if url not in urls:
+                urls.append(url)
+    
+    entries = []
+    rehashed = 0
+    for url in urls:
+        if any(url.startswith(prefix) for prefix in on_demand) or os.path.getsize(url) > max_entry_bytes:
+            continue
+        revision, changed = hash_file(url, state)
+        rehashed += changed
+        entries.append({'url': url, 'revision': revision})
+    
+    # Forget files that are no longer part of the site
+    state = {path: entry for path, entry in state.items() if path in urls}
+    version = hashlib.sha256(json.dumps(entries, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+    
+    with open('precache-manifest.json', 'w', encoding='utf-8') as f:
+        json.dump({'version': version, 'entries': entries, 'on_demand': on_demand}, f, indent=2)
+    with open('sw.js', 'w', encoding='utf-8') as f:
+        f.write(SERVICE_WORKER_TEMPLATE.replace('__VERSION__', version).replace('__ON_DEMAND__', json.dumps(on_demand)))
+    os.makedirs(os.path.dirname(state_file) or '.', exist_ok=True)
+    with open(state_file, 'w', encoding='utf-8') as f:
+        json.dump(state, f)
+    
+    print(f'✓ sw.js and precache-manifest.json written: {len(entries)} entries, '
+          f'{rehashed} rehashed, version {version}')
+    return entries
+
+
+# Words too common to be worth indexing
+SEARCH_STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into', 'is', 'it',
+    'of', 'on', 'or', 'that', 'the', 'this', 'to', 'via', 'was', 'we', 'with',
+}
+
+# Relative importance of each field when scoring a document
+SEARCH_FIELD_WEIGHTS = {'title': 8, 'tags': 4, 'authors': 4, 'venue': 3, 'description': 2, 'content': 1}
+
+# Weights are quantized into 4 bits and packed with the doc-id delta
+SEARCH_WEIGHT_LEVELS = 15
+
+
+def tokenize_search_text(text):
+    """Split text into search terms: lowercase words, plus bigrams for CJK runs.
+    
+    search.js uses the same rules for queries.
+    """
+    text = text.lower()
+    terms = re.findall(r'[a-z0-9]+', text)
+    for run in re.findall(r'[\u3400-\u9fff]+', text):
+        terms.extend([run] if len(run) == 1 else [run[i:i + 2] for i in range(len(run) - 1)])
+    return [term for term in terms if re.match(r'[\u3400-\u9fff]', term) or (len(term) > 1 and term not in SEARCH_STOPWORDS)]
+
+
+def strip_html_tags(text):
+    """Reduce an HTML fragment to its text"""
+    return re.sub(r'<[^>]+>', ' ', text or '')
+
+
+def build_search_index(config, blog_posts):
+    """Write search-index.json: an inverted index over blog posts and publications.
+    
+    Each term maps to a flat list of integers, one per matching document:
+    (doc id delta << 4) | quantized weight. Documents are [title, url, kind].
+    """
+    options = get_build_options(config, 'search')
+    docs = []
+    fields = []
+    
+    for post in blog_posts:
+        docs.append([post['title'], f'blog.html?post={post["id"]}', 'blog'])
+        fields.append({
+            'title': post['title'],
+            'tags': ' '.join(post.get('tags', [])),
+            'description': post.get('description', ''),
+            'content': strip_html_tags(post.get('content', '')),
+        })
+    
+    page_of = publication_page_index(config)
+    for year, year_pubs in sorted(config.get('publications', {}).items(), reverse=True):
+        if not isinstance(year_pubs, list):
+            continue
+        for pub in year_pubs:
+            links = [link for link in pub.get('links', []) if link.get('url') and link.get('url') != '#']
+            docs.append([pub['title'], links[0]['url'] if links else page_of.get(id(pub), 'publications.html'), 'publication'])
+            fields.append({
+                'title': pub['title'],
+                'authors': ' '.join(pub.get('authors', [])),
+                'venue': f'{pub.get("venue", "")} {year}',
+            })
+    
+    # Raw weight per (term, doc), then log-scaled into 1..15
+    postings = {}
+    for doc_id, doc_fields in enumerate(fields):
+        for field, text in doc_fields.items():
+            for term in tokenize_search_text(text):
+                term_docs = postings.setdefault(term, {})
+                term_docs[doc_id] = term_docs.get(doc_id, 0) + SEARCH_FIELD_WEIGHTS[field]
+    
+    max_weight = max((w for term_docs in postings.values() for w in term_docs.values()), default=1)
+    scale = math.log1p(max_weight)
+    terms = {}
+    for term in sorted(postings):
+        encoded = []
+        previous = 0
+        for doc_id, weight in sorted(postings[term].items()):
+            level = max(1, round(math.log1p(weight) / scale * SEARCH_WEIGHT_LEVELS))
+            encoded.append((doc_id - previous) << 4 | level)
+            previous = doc_id
+        terms[term] = encoded
+    
+    index_path = options.get('index_file', 'search-index.json')
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump({'v': 1, 'docs': docs, 'terms': terms}, f, ensure_ascii=False, separators=(',', ':'))
+    print(f'✓ {index_path}: {len(docs)} documents, {len(terms)} terms, '
+          f'{format_bytes(os.path.getsize(index_path))}')
+
+
+class PageBudgetError(Exception):
+    """Raised when a generated page is over its page-weight budget"""
+
+
+# File types that are served compressed, so their transfer size is the gzip size
+COMPRESSIBLE_EXTENSIONS = {'.html', '.css', '.js', '.json', '.svg', '.txt', '.xml'}
+
+ASSET_TYPES = {
+    '.html': 'html', '.css': 'css', '.js': 'js',
+    '.png': 'image', '.jpg': 'image', '.jpeg': 'image', '.gif': 'image',
+    '.webp': 'image', '.avif': 'image', '.svg': 'image', '.ico': 'image',
+    '.woff': 'font', '.woff2': 'font', '.ttf': 'font', '.otf': 'font', '.eot': 'font',
+}
+
+
+class PageAssetCollector(HTMLParser):
+    """Collect the resources a page loads (stylesheets, scripts, images, icons)"""
+
+    def __init__(self):
+        super().__init__()
+        self.urls = []
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'link' and attrs.get('href'):
+            rel = (attrs.get('rel') or '').lower().split()
+            if any(r in rel for r in ('stylesheet', 'icon', 'preload', 'modulepreload', 'manifest')):
+                self.urls.append(attrs['href'])
+        elif tag in ('script', 'img', 'source', 'iframe') and attrs.get('src'):
+            self.urls.append(attrs['src'])
+
+
+def find_css_references(css_path):
+    """Find the local files (fonts, images, imports) a stylesheet references"""
+    with open(css_path, 'r', encoding='utf-8') as f:
+        css = f.read()
+    base_dir = os.path.dirname(css_path)
+    refs = re.findall(r'url\(\s*[\'"]?([^\'")]+)[\'"]?\s*\)', css)
+    refs += re.findall(r'@import\s+[\'"]([^\'"]+)[\'"]', css)
+    return [local_path_from_url(ref, base_dir) for ref in refs if is_local_url(ref)]
+
+
+def find_js_image_references(js_path):
+    """Find image paths mentioned in a script, e.g. post images in blog-data.js"""
+    with open(js_path, 'r', encoding='utf-8') as f:
+        js = f.read()
+    refs = re.findall(r'[\'"]([\w\-./]+\.(?:png|jpe?g|gif|webp|avif|svg))[\'"]', js, flags=re.IGNORECASE)
+    return [local_path_from_url(ref) for ref in refs]
+
+
+def transfer_size(path):
+    """Return (bytes on disk, estimated bytes over the wire) for a file"""
+    size = os.path.getsize(path)
+    if os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS:
+        with open(path, 'rb') as f:
+            return size, len(gzip.compress(f.read(), compresslevel=6))
+    return size, size
+
+
+def collect_page_assets(page_path):
+    """Collect every local file a page pulls in, following CSS and JS references"""
+    with open(page_path, 'r', encoding='utf-8') as f:
+        collector = PageAssetCollector()
+        collector.feed(f.read())
+    
+    external = sorted({url for url in collector.urls if not is_local_url(url) and not url.startswith('data:')})
+    pending = [local_path_from_url(url) for url in collector.urls if is_local_url(url)]
+    assets = []
+    seen = {page_path}
+    while pending:
+        path = pending.pop(0)
+        if path in seen:
+            continue
+        seen.add(path)
+        if not os.path.isfile(path):
+            continue
+        assets.append(path)
+        ext = os.path.splitext(path)[1].lower()
+        if ext == '.css':
+            pending.extend(find_css_references(path))
+        elif ext == '.js':
+            pending.extend(find_js_image_references(path))
+    
+    return assets, external
+
+
+def build_page_weight_report(page_paths):
+    """Compute the total transfer size of each generated page and its assets"""
+    report = {'generated': datetime.now().isoformat(timespec='seconds'), 'pages': {}}
+    
+    for page_path in page_paths:
+        assets, external = collect_page_assets(page_path)
+        entries = []
+        for path in [page_path] + assets:
+            size, transfer = transfer_size(path)
+            ext = os.path.splitext(path)[1].lower()
+            entries.append({
+                'path': path,
+                'type': ASSET_TYPES.get(ext, 'other'),
+                'bytes': size,
+                'transfer_bytes': transfer,
+            })
+        
+        # Biggest first, so the report shows what to fix first
+        entries.sort(key=lambda entry: entry['transfer_bytes'], reverse=True)
+        total = sum(entry['transfer_bytes'] for entry in entries)
+        for entry in entries:
+            entry['share'] = round(entry['transfer_bytes'] / total, 4) if total else 0
+        
+        by_type = {}
+        for entry in entries:
+            by_type[entry['type']] = by_type.get(entry['type'], 0) + entry['transfer_bytes']
+        
+        report['pages'][page_path] = {
+            'total_bytes': sum(entry['bytes'] for entry in entries),
+            'transfer_bytes': total,
+            'by_type': by_type,
+            'assets': entries,
+            'external': external,
+        }
+    
+    return report
+
+
+def format_bytes(size):
+    """Format a byte count for humans"""
+    if size >= 1024 * 1024:
+        return f'{size / (1024 * 1024):.2f} MB'
+    if size >= 1024:
+        return f'{size / 1024:.1f} KB'
+    return f'{size} B'
+
+
+def check_page_budgets(report, config):
+    """Compare page weights against config.json -> build.budget and warn or fail"""
+    budget = get_build_options(config, 'budget')
+    default_limit = budget.get('max_page_bytes')
+    page_limits = budget.get('pages', {})
+    mode = budget.get('mode', 'warn')
+    
+    over_budget = []
+    for page_path, page in report['pages'].items():
+        limit = page_limits.get(page_path, default_limit)
+        page['budget_bytes'] = limit
+        page['over_budget'] = bool(limit) and page['transfer_bytes'] > limit
+        
+        status = '⚠️ ' if page['over_budget'] else '✓'
+        limit_text = f' (budget {format_bytes(limit)})' if limit else ''
+        print(f'{status} {page_path}: {format_bytes(page["transfer_bytes"])}{limit_text}')
+        if page['over_budget']:
+            over_budget.append(page_path)
+            for entry in page['assets'][:5]:
+                print(f'    {format_bytes(entry["transfer_bytes"]):>10}  {entry["share"]:6.1%}  {entry["path"]}')
+        if page['external']:
+            print(f'    + {len(page["external"])} third-party resources (not measured)')
+    
+    report_path = budget.get('report', 'page-weight-report.json')
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f'✓ Page-weight report written to {report_path}')
+    
+    if over_budget and mode == 'fail':
+        raise PageBudgetError(f'Page-weight budget exceeded: {", ".join(over_budget)}')
+    return over_budget
+
+
+# Pages that render config['publications']; enough to rebuild after a Scholar sync
+PUBLICATION_PAGES = {'index', 'publications'}
+
+
+def build_site(config, only=None):
+    """Generate the website from an already loaded config.
+    
+    With only (a set of page keys such as PUBLICATION_PAGES), only those pages
+    and the search index (which covers the publications) are written. The
+    other pages are still generated in memory so font subsetting and the
+    headers file see the whole site, but the blog data, the blog app script,
+    the optimized stylesheets, sw.js and the page-weight report are left as
+    the last full build wrote them.
+    """
+    # Per-build caches: a second build in the same process may be another site
+    global _owner_location
+    _owner_location = None
+    _inlined_images.clear()
+    
+    if only is None or get_build_options(config, 'search').get('enabled'):
+        # Build blog data first
+        blog_posts = build_blog_data(write=only is None)
+    if only is None:
+        write_blog_page_data(blog_posts, get_build_options(config, 'pagination').get('blog', {}).get('per_page', 0),
+                             get_eager_image_count(config, 'blog'))
+    
+    if get_build_options(config, 'search').get('enabled'):
+        print('🔎 Building search index...')
+        build_search_index(config, blog_posts)
+    
+    # Generate HTML files
+    pages = {}
+    print('📝 Generating index.html...')
+    pages['index.html'] = generate_index_page(config)
+    
+    print('📄 Generating publications.html...')
+    pages.update(generate_publications_pages(config))
+    if len(pages) > 2:
+        print(f'✓ Publications split into {len(pages) - 1} pages')
+    
+    print('📝 Generating blog.html...')
+    pages['blog.html'] = generate_blog_page(config, write_blog_app_script(write=only is None))
+    
+    if get_build_options(config, 'fonts').get('self_host'):
+        print('\n🔤 Self-hosting fonts...')
+        self_host_fonts(pages, config)
+    
+    css_options = get_build_options(config, 'css')
+    if css_options.get('prune_unused') or css_options.get('minify'):
+        print('\n✂️  Optimizing stylesheets...')
+        optimize_stylesheets(pages, config, write=only is None)
+    
+    if get_build_options(config, 'critical_css').get('enabled'):
+        print('\n🎨 Inlining critical CSS...')
+        for filename in pages:
+            pages[filename] = inline_critical_css(filename, pages[filename], config)
+    
+    if get_build_options(config, 'resource_hints').get('enabled'):
+        print('\n🔗 Adding resource hints...')
+        add_resource_hints(pages, config)
+    
+    # From here on, work only on the pages that will be written
+    written = {filename: html for filename, html in pages.items() if only is None or page_key(filename) in only}
+    
+    if get_build_options(config, 'html').get('minify'):
+        print('\n🗜️  Minifying HTML...')
+        for filename in written:
+            original_size = len(written[filename].encode('utf-8'))
+            written[filename] = minify_html(written[filename])
+            minified_size = len(written[filename].encode('utf-8'))
+            saved = original_size - minified_size
+            print(f'✓ {filename}: {format_bytes(original_size)} → {format_bytes(minified_size)} '
+                  f'(saved {format_bytes(saved)}, {saved / original_size:.0%})')
+    
+    for filename, html in written.items():
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(html)
+        print(f'✓ {filename} generated successfully')
+    remove_stale_pages(pages)
+    
+    if only is not None:
+        print('\nℹ️  Partial build: run a full build to refresh sw.js and the page-weight report')
+        return
+    
+    print('\n📦 Checking page weight...')
+    report = build_page_weight_report(list(pages))
+    check_page_budgets(report, config)
+    
+    if get_build_options(config, 'service_worker').get('enabled'):
+        print('\n📴 Generating service worker...')
+        build_service_worker(list(pages), config)
 
 
 def main():
@@ -1416,30 +3169,11 @@ def main():
         config = load_config()
         print('✓ Configuration loaded successfully')
         
-        # Build blog data first
-        build_blog_data()
-        
-        # Generate HTML files
-        print('📝 Generating index.html...')
-        index_html = generate_index_page(config)
-        with open('index.html', 'w', encoding='utf-8') as f:
-            f.write(index_html)
-        print('✓ index.html generated successfully')
-        
-        print('📄 Generating publications.html...')
-        publications_html = generate_publications_page(config)
-        with open('publications.html', 'w', encoding='utf-8') as f:
-            f.write(publications_html)
-        print('✓ publications.html generated successfully')
-        
-        print('📝 Generating blog.html...')
-        blog_html = generate_blog_page(config)
-        with open('blog.html', 'w', encoding='utf-8') as f:
-            f.write(blog_html)
-        print('✓ blog.html generated successfully')
+        build_site(config)
         
         print('\n🎉 Local website generation completed!')
         print('\n💡 You can now run "python local_server.py" to preview your changes')
+        return 0
         
     except FileNotFoundError:
         print('❌ Error: config.json file not found!')
@@ -1447,9 +3181,13 @@ def main():
     except json.JSONDecodeError as e:
         print(f'❌ Error: Invalid JSON in config.json: {e}')
         print('Please check your JSON syntax.')
+    except PageBudgetError as e:
+        print(f'❌ Error: {e}')
+        print('See the page-weight report for the largest assets on each page.')
     except Exception as e:
         print(f'❌ Error: {e}')
+    return 1
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    sys.exit(main()) 
\ No newline at end of file
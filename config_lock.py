@@ -0,0 +1,26 @@
+"""
+Advisory lock on config.json, shared by build_local.py and scholar_sync_python.py
+so a build never reads a half-written config. Standard library only, so the
+sync script can use it without the build dependencies.
+"""
+
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # No advisory locks on Windows; reads and writes still work unlocked
+
+
+@contextmanager
+def config_lock(config_path='config.json', exclusive=False):
+    """Hold a shared (or exclusive) lock on <config>.lock"""
+    if fcntl is None:
+        yield
+        return
+    with open(config_path + '.lock', 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Google Scholar 本地替身服务器
+用于离线测试 scholar_sync_python.py 的翻页和并发抓取
+
+使用方法：
+  # 回放录制的页面（用 scholar_sync_python.py --record-pages DIR 录制）
+  python scholar_standin_server.py --pages DIR
+  # 或生成一个包含N篇论文的虚拟主页
+  python scholar_standin_server.py --synthetic 350
+
+然后运行：python scholar_sync_python.py --base-url http://localhost:8001 --dry-run
+"""
+
+import argparse
+import hashlib
+import http.server
+import os
+import re
+import socketserver
+import sys
+import threading
+import time
+from html import escape
+from urllib.parse import urlparse, parse_qs
+
+# 配置
+PORT = 8001
+HOST = 'localhost'
+
+ROW_TEMPLATE = '''<tr class="gsc_a_tr"><td class="gsc_a_t"><a href="/citations?view_op=view_citation&amp;citation_for_view={user}:{index}" class="gsc_a_at">{title}</a><div class="gs_gray">{authors}</div><div class="gs_gray">{venue}</div></td><td class="gsc_a_c"><a class="gsc_a_ac gs_ibl">{citations}</a></td><td class="gsc_a_y"><span class="gsc_a_h gsc_a_hc gs_ibl">{year}</span></td></tr>'''
+
+DETAIL_TEMPLATE = '''<!DOCTYPE html><html><head><title>Scholar stand-in</title></head><body>
+<div id="gsc_oci_title"><a class="gsc_oci_title_link" href="https://arxiv.org/abs/{arxiv_id}">{title}</a></div>
+<div id="gsc_oci_table">
+<div class="gs_scl"><div class="gsc_oci_field">Authors</div><div class="gsc_oci_value">{authors}</div></div>
+<div class="gs_scl"><div class="gsc_oci_field">Publication date</div><div class="gsc_oci_value">{date}</div></div>
+<div class="gs_scl"><div class="gsc_oci_field">Journal</div><div class="gsc_oci_value">arXiv preprint arXiv:{arxiv_id}</div></div>
+</div>
+</body></html>'''
+
+PAGE_TEMPLATE = '''<!DOCTYPE html><html><head><title>Scholar stand-in</title></head><body>
+<table id="gsc_a_t"><tbody id="gsc_a_b">{rows}</tbody></table>
+<button type="button" id="gsc_bpf_more"{disabled}><span>Show more</span></button>
+</body></html>'''
+
+
+def synthetic_paper(index):
+    """虚拟论文：列表中作者被截断，详情页有完整信息"""
+    year = 2015 + index % 10
+    return {
+        'title': f"Synthetic Paper {index}: Scalable Methods for Benchmark Number {index}",
+        'authors': ["Z Zhang"] + [f"Author {index % n}" for n in (17, 31, 43, 59, 61, 67)],
+        'venue': "arXiv preprint" if index % 3 == 0 else f"Conference on Testing {year}",
+        'year': year,
+        'date': f"{year}/{index % 12 + 1}/{index % 28 + 1}",
+        'arxiv_id': f"{year % 100:02d}{index % 12 + 1:02d}.{index:05d}",
+    }
+
+
+def synthetic_page(user, cstart, pagesize, total):
+    """生成虚拟主页的一页"""
+    rows = []
+    for index in range(cstart, min(cstart + pagesize, total)):
+        paper = synthetic_paper(index)
+        rows.append(ROW_TEMPLATE.format(
+            user=escape(user),
+            index=index,
+            title=paper['title'],
+            authors=', '.join(paper['authors'][:3]) + ', ...',
+            venue=paper['venue'],
+            citations=index % 40,
+            year=paper['year'],
+        ))
+    disabled = '' if cstart + pagesize < total else ' disabled'
+    return PAGE_TEMPLATE.format(rows=''.join(rows), disabled=disabled)
+
+
+class StandinRequestHandler(http.server.BaseHTTPRequestHandler):
+    """按cstart返回录制的或虚拟的主页页面"""
+
+    pages_dir = None
+    synthetic = 0
+    delay = 0.0
+    throttle_every = 0     # 每N个请求返回一次429，测试限速和退避
+    retry_after = None
+    fail_cstarts = set()   # 这些cstart的主页返回500，测试翻页中途失败
+    request_count = 0
+    count_lock = threading.Lock()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != '/citations':
+            self.send_error(404)
+            return
+
+        query = parse_qs(url.query)
+        user = query.get('user', [''])[0]
+        cstart = int(query.get('cstart', ['0'])[0])
+        pagesize = int(query.get('pagesize', ['20'])[0])
+        citation = query.get('citation_for_view', [None])[0]
+
+        if self.delay:
+            time.sleep(self.delay)  # 模拟网络延迟
+        
+        if self.throttle_every:
+            with self.count_lock:
+                StandinRequestHandler.request_count += 1
+                throttled = StandinRequestHandler.request_count % self.throttle_every == 0
+            if throttled:
+                self.send_response(429)
+                if self.retry_after is not None:
+                    self.send_header('Retry-After', str(self.retry_after))
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+
+        if not citation and cstart in self.fail_cstarts:
+            self.send_error(500)
+            return
+
+        if self.pages_dir:
+            # 文件名约定与scholar_sync_python.recorded_page_name一致
+            if citation:
+                name = 'detail-' + re.sub(r'[^\w-]', '_', citation) + '.html'
+            else:
+                name = f"profile-{cstart}.html"
+            path = os.path.join(self.pages_dir, name)
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    body = f.read()
+            elif citation:
+                self.send_error(404)
+                return
+            else:
+                # 超出录制范围：和Scholar一样返回一个空表格
+                body = PAGE_TEMPLATE.format(rows='', disabled=' disabled').encode('utf-8')
+        elif citation:
+            index = int(citation.rsplit(':', 1)[-1])
+            if index >= self.synthetic:
+                self.send_error(404)
+                return
+            paper = synthetic_paper(index)
+            body = DETAIL_TEMPLATE.format(
+                title=paper['title'],
+                authors=', '.join(paper['authors']),
+                date=paper['date'],
+                arxiv_id=paper['arxiv_id'],
+            ).encode('utf-8')
+        else:
+            body = synthetic_page(user, cstart, pagesize, self.synthetic).encode('utf-8')
+
+        # 支持条件请求，便于测试缓存验证
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header('ETag', etag)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """自定义日志格式"""
+        print(f"[{self.log_date_time_string()}] {format % args}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for Google Scholar profile pages')
+    parser.add_argument('--pages', metavar='DIR',
+                       help='Directory of recorded pages (profile-<cstart>.html)')
+    parser.add_argument('--synthetic', type=int, default=0,
+                       help='Serve a generated profile with this many publications')
+    parser.add_argument('--port', type=int, default=PORT,
+                       help='Port to listen on')
+    parser.add_argument('--delay', type=float, default=0.0,
+                       help='Seconds to wait before each response')
+    parser.add_argument('--throttle-every', type=int, default=0, metavar='N',
+                       help='Answer every Nth request with 429 Too Many Requests')
+    parser.add_argument('--retry-after', type=int,
+                       help='Retry-After seconds sent with the 429 responses')
+    parser.add_argument('--fail-page', type=int, action='append', default=[], metavar='CSTART',
+                       help='Answer the profile page starting at CSTART with 500 (repeatable)')
+    args = parser.parse_args()
+
+    if not args.pages and not args.synthetic:
+        print("❌ 错误: 请指定 --pages 或 --synthetic")
+        return 1
+
+    StandinRequestHandler.pages_dir = args.pages
+    StandinRequestHandler.synthetic = args.synthetic
+    StandinRequestHandler.delay = args.delay
+    StandinRequestHandler.throttle_every = args.throttle_every
+    StandinRequestHandler.retry_after = args.retry_after
+    StandinRequestHandler.fail_cstarts = set(args.fail_page)
+
+    with socketserver.ThreadingTCPServer((HOST, args.port), StandinRequestHandler) as httpd:
+        print(f"✅ Scholar stand-in running at http://{HOST}:{args.port}")
+        print("⏹️  按 Ctrl+C 停止服务器")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\n👋 服务器已停止")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,75 +4,1439 @@ Google Scholar Publications Sync - Python版本
 功能：从Google Scholar自动获取出版物并更新config.json
 """
 
+import hashlib
 import json
+import random
 import re
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from html.parser import HTMLParser
 import time
 import os
 import sys
-from datetime import datetime
-from urllib.parse import urljoin, urlparse
+import threading
+import zlib
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timezone
+from email.utils import parsedate_to_datetime
+from itertools import chain
+from urllib.parse import urljoin, urlparse, parse_qs
 import argparse
+import copy
+
+from config_lock import config_lock
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
 
 # 配置
 SCHOLAR_USER_ID = "j71Y2-4AAAAJ"  # 您的Scholar ID
 REQUEST_DELAY = 2  # 请求间隔（秒）
 MAX_RETRIES = 3
+MAX_RETRY_AFTER = 600  # 服务器要求的Retry-After最多等待的秒数
+SCHOLAR_BASE_URL = "https://scholar.google.com"
+PAGE_SIZE = 100  # Scholar个人主页每页最多100条
+MAX_PAGES = 50   # 防止异常页面导致无限翻页
+FETCH_WORKERS = 3  # 并发抓取的页数
+ENRICH_WORKERS = 4  # 并发抓取的详情页数
+PROFILE_WORKERS = 3  # 批量同步时并发抓取的主页数
+HOST_CONCURRENCY = 4  # 同一主机同时进行的请求数上限
+CACHE_DIR = ".scholar-cache"
+CACHE_TTL_HOURS = 12  # 缓存在此时间内直接使用，超过后向服务器验证（ETag/Last-Modified）
+HISTORY_DIR = "citation-history"  # 引用数历史（CitationHistory），可以提交到仓库
+JOURNAL_FILE = "scholar-sync-journal.jsonl"  # 每次写入config.json的变更记录（与config.json同目录）
+
+
+def recorded_page_name(url):
+    """录制页面的文件名：主页按cstart，详情页按citation_for_view（与scholar_standin_server.py一致）"""
+    query = parse_qs(urlparse(url).query)
+    if 'citation_for_view' in query:
+        return 'detail-' + re.sub(r'[^\w-]', '_', query['citation_for_view'][0]) + '.html'
+    return f"profile-{query.get('cstart', ['0'])[0]}.html"
+
+
+# 主页解析后端：lxml（需安装）> stream（标准库HTMLParser）> bs4（BeautifulSoup，兼容回退）
+PARSER_BACKENDS = ('auto', 'lxml', 'stream', 'bs4')
+# 解析后端基准测试和一致性测试使用的主页页面
+PARSER_FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests", "fixtures", "scholar")
+
+# 没有结束标签的元素，不能压入元素栈
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'track', 'wbr'}
+
+
+def _has_class(attrs, name):
+    return name in (attrs.get('class') or '').split()
+
+
+class ProfileRowExtractor(HTMLParser):
+    """只提取出版物表格中gsc_a_tr行所需字段的流式解析器，不构建文档树
+    
+    每行得到 {'title', 'href', 'grays', 'year', 'citations'}，含义与
+    _parse_publication_row中的find/find_all一致（取第一个匹配元素的全部文本）。
+    """
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.rows = []
+        self.table_found = False
+        self.more_disabled = False
+        self._table_depth = 0  # 位于出版物表格内时的table嵌套深度
+        self._row = None
+        self._stack = []       # 当前行内打开的元素：(tag, 捕获字段或None)
+    
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'button' and attrs.get('id') == 'gsc_bpf_more':
+            self.more_disabled = 'disabled' in attrs
+        
+        if tag == 'table':
+            if self._table_depth:
+                self._table_depth += 1
+            elif attrs.get('id') == 'gsc_a_t':
+                self.table_found = True
+                self._table_depth = 1
+            return
+        if not self._table_depth:
+            return
+        
+        if tag == 'tr' and _has_class(attrs, 'gsc_a_tr'):
+            self._end_row()
+            self._row = {'title': None, 'href': '', 'grays': [], 'year': None, 'citations': None}
+            return
+        if self._row is None or tag in VOID_ELEMENTS:
+            return
+        
+        field = None
+        if tag == 'a' and self._row['title'] is None and _has_class(attrs, 'gsc_a_at'):
+            field = 'title'
+            self._row['title'] = ''
+            self._row['href'] = attrs.get('href') or ''
+        elif tag == 'div' and _has_class(attrs, 'gs_gray'):
+            field = len(self._row['grays'])
+            self._row['grays'].append('')
+        elif tag == 'span' and self._row['year'] is None and _has_class(attrs, 'gsc_a_h'):
+            field = 'year'
+            self._row['year'] = ''
+        elif tag == 'a' and self._row['citations'] is None and _has_class(attrs, 'gsc_a_c'):
+            field = 'citations'
+            self._row['citations'] = ''
+        self._stack.append((tag, field))
+    
+    def handle_endtag(self, tag):
+        if not self._table_depth:
+            return
+        if tag == 'table':
+            self._table_depth -= 1
+            if not self._table_depth:
+                self._end_row()
+            return
+        if tag == 'tr' and not self._stack:
+            self._end_row()
+            return
+        # 关闭最近的同名元素（容忍未闭合的内层元素）
+        for i in range(len(self._stack) - 1, -1, -1):
+            if self._stack[i][0] == tag:
+                del self._stack[i:]
+                break
+    
+    def handle_data(self, data):
+        if self._row is None:
+            return
+        for _, field in self._stack:
+            if isinstance(field, int):
+                self._row['grays'][field] += data
+            elif field:
+                self._row[field] += data
+    
+    def _end_row(self):
+        if self._row is not None:
+            self.rows.append(self._row)
+        self._row = None
+        self._stack = []
+
+
+def extract_profile_rows_stream(text):
+    """stream后端：返回(rows, table_found, more_disabled)"""
+    extractor = ProfileRowExtractor()
+    extractor.feed(text)
+    extractor.close()
+    extractor._end_row()
+    return extractor.rows, extractor.table_found, extractor.more_disabled
+
+
+def extract_profile_rows_lxml(text):
+    """lxml后端：返回(rows, table_found, more_disabled)"""
+    document = lxml_html.document_fromstring(text)
+    tables = document.xpath('//table[@id="gsc_a_t"]')
+    if not tables:
+        return [], False, False
+    
+    def first(row, tag, name):
+        found = row.xpath(f'.//{tag}[contains(concat(" ", normalize-space(@class), " "), " {name} ")]')
+        return found[0] if found else None
+    
+    rows = []
+    for tr in tables[0].xpath('.//tr[contains(concat(" ", normalize-space(@class), " "), " gsc_a_tr ")]'):
+        title = first(tr, 'a', 'gsc_a_at')
+        year = first(tr, 'span', 'gsc_a_h')
+        citations = first(tr, 'a', 'gsc_a_c')
+        rows.append({
+            'title': title.text_content() if title is not None else None,
+            'href': (title.get('href') or '') if title is not None else '',
+            'grays': [div.text_content() for div in tr.xpath('.//div[contains(concat(" ", normalize-space(@class), " "), " gs_gray ")]')],
+            'year': year.text_content() if year is not None else None,
+            'citations': citations.text_content() if citations is not None else None,
+        })
+    more_button = document.xpath('//button[@id="gsc_bpf_more"]')
+    more_disabled = bool(more_button) and more_button[0].get('disabled') is not None
+    return rows, True, more_disabled
+
+
+PROFILE_ROW_EXTRACTORS = {
+    'lxml': extract_profile_rows_lxml,
+    'stream': extract_profile_rows_stream,
+}
+
+
+def resolve_parser_backend(name):
+    """把'auto'解析为可用的最快后端；lxml未安装时退回stream"""
+    if name == 'auto':
+        return 'lxml' if lxml_html is not None else 'stream'
+    if name == 'lxml' and lxml_html is None:
+        print("⚠️  lxml is not installed, using the stream parser")
+        return 'stream'
+    return name
+
+
+class ResponseCache:
+    """磁盘上的HTTP响应缓存，每个URL保存一个正文文件和一个元数据文件"""
+    
+    def __init__(self, cache_dir=CACHE_DIR, ttl_hours=CACHE_TTL_HOURS):
+        self.cache_dir = cache_dir
+        self.ttl = ttl_hours * 3600
+    
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json"), os.path.join(self.cache_dir, f"{key}.body")
+    
+    def load(self, url):
+        """返回缓存条目（元数据 + 'content'），没有缓存返回None"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            with open(body_path, 'rb') as f:
+                entry['content'] = f.read()
+            return entry
+        except (OSError, ValueError):
+            return None
+    
+    def is_fresh(self, entry):
+        return time.time() - entry['fetched_at'] < self.ttl
+    
+    def store(self, url, response):
+        """保存响应正文和验证信息"""
+        self._write(url, response.content, {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.time(),
+        })
+    
+    def touch(self, entry):
+        """服务器返回304后，刷新缓存时间"""
+        entry = dict(entry)
+        content = entry.pop('content')
+        entry['fetched_at'] = time.time()
+        self._write(entry['url'], content, entry)
+    
+    def _write(self, url, content, meta):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        meta_path, body_path = self._paths(url)
+        # 先写临时文件再替换，并发线程或中断时不会留下半个文件
+        for path, data, mode in ((body_path, content, 'wb'), (meta_path, json.dumps(meta), 'w')):
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, mode) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+
+class RateLimiter:
+    """线程安全的令牌桶限速器：平均每秒rate个请求，最多突发burst个"""
+    
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def _refill(self):
+        """按当前速率补充令牌（调用方持有锁）"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def acquire(self):
+        """阻塞直到拿到一个令牌"""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def parse_retry_after(value):
+    """Retry-After头（秒数或HTTP日期）换算成等待秒数，无法解析时返回None"""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """按服务器反馈调整速率的令牌桶（AIMD），带抖动的指数退避
+    
+    每个成功的请求让速率增加increase（默认为初始速率的1/20，不超过max_rate）；被限流（429/503）
+    或服务器出错时速率乘以decrease（不低于min_rate）。被限流时所有线程一起
+    暂停：服务器给了Retry-After就按它，否则按退避时间。
+    metrics()统计各类请求数和等待时间（多线程时为各线程等待时间之和）。
+    """
+    
+    def __init__(self, rate, burst=1, max_rate=None, min_rate=0.05, increase=None, decrease=0.5,
+                 backoff_base=REQUEST_DELAY, backoff_max=60):
+        super().__init__(rate, burst)
+        self.max_rate = max(rate, max_rate or rate)
+        self.min_rate = min(rate, min_rate)
+        self.increase = increase or rate / 20
+        self.decrease = decrease
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.paused_until = 0.0
+        self.stats = {'requests': 0, 'throttled': 0, 'errors': 0,
+                      'token_wait': 0.0, 'pause_wait': 0.0, 'backoff_wait': 0.0}
+    
+    def acquire(self):
+        """先等待全局暂停结束，再按当前速率拿令牌"""
+        start = time.monotonic()
+        while True:
+            with self.lock:
+                pause = self.paused_until - time.monotonic()
+            if pause <= 0:
+                break
+            time.sleep(pause)
+        resumed = time.monotonic()
+        super().acquire()
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats['pause_wait'] += resumed - start
+            self.stats['token_wait'] += time.monotonic() - resumed
+    
+    def backoff_delay(self, attempt):
+        """第attempt次重试（从0开始）的等待时间：指数增长，一半固定一半随机抖动"""
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+    
+    def _set_rate(self, rate):
+        self._refill()  # 之前积累的令牌按旧速率结算
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+    
+    def succeeded(self):
+        """加性增：请求成功"""
+        with self.lock:
+            self._set_rate(self.rate + self.increase)
+    
+    def throttled(self, attempt, retry_after=None, pause=True):
+        """乘性减并让所有线程暂停，返回暂停的秒数
+        
+        pause=False用于不再重试的请求：只记录并降速，不让其他线程等待。
+        """
+        delay = 0.0
+        if pause:
+            delay = retry_after if retry_after is not None else self.backoff_delay(attempt)
+        with self.lock:
+            self.stats['throttled'] += 1
+            self._set_rate(self.rate * self.decrease)
+            if delay:
+                self.paused_until = max(self.paused_until, time.monotonic() + delay)
+        return delay
+    
+    def failed(self, attempt, server_error=True):
+        """请求失败后退避（只有本线程等待）；服务器或网络错误时同时降速"""
+        with self.lock:
+            self.stats['errors'] += 1
+            if server_error:
+                self._set_rate(self.rate * self.decrease)
+        delay = self.backoff_delay(attempt)
+        time.sleep(delay)
+        with self.lock:
+            self.stats['backoff_wait'] += delay
+    
+    def metrics(self):
+        with self.lock:
+            return dict(self.stats, rate=self.rate)
+
+
+class MinHashLSH:
+    """基于标题字符shingle的MinHash签名 + LSH分桶，用于近似重复检测
+    
+    num_perm个哈希函数分成bands段，每段rows=num_perm/bands行；
+    两个标题只要有一段签名完全相同就成为候选对，
+    Jaccard相似度约为(1/bands)^(1/rows)时被选中的概率为50%。
+    """
+    
+    MERSENNE_PRIME = (1 << 61) - 1
+    
+    def __init__(self, num_perm=64, bands=16, shingle_size=4, seed=1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = random.Random(seed)  # 固定种子，保证每次运行结果一致
+        self.permutations = [(rng.randrange(1, self.MERSENNE_PRIME), rng.randrange(self.MERSENNE_PRIME))
+                             for _ in range(num_perm)]
+        self.buckets = {}
+        self.signatures = {}
+    
+    def shingles(self, clean_title):
+        """标题（已去标点、小写）的字符shingle集合"""
+        text = ' '.join(clean_title.split())
+        if len(text) <= self.shingle_size:
+            return {text} if text else set()
+        return {text[i:i + self.shingle_size] for i in range(len(text) - self.shingle_size + 1)}
+    
+    def signature(self, clean_title):
+        """MinHash签名；没有可用shingle时返回None"""
+        hashes = [zlib.crc32(s.encode('utf-8')) for s in self.shingles(clean_title)]
+        if not hashes:
+            return None
+        prime = self.MERSENNE_PRIME
+        return tuple(min((a * h + b) % prime for h in hashes) for a, b in self.permutations)
+    
+    def _band_keys(self, signature):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+    
+    def add(self, key, clean_title):
+        signature = self.signature(clean_title)
+        if signature is None:
+            return
+        self.signatures[key] = signature
+        for band_key in self._band_keys(signature):
+            self.buckets.setdefault(band_key, []).append(key)
+    
+    def query(self, clean_title):
+        """返回 {key: 估计的Jaccard相似度}，只包含至少共享一个LSH桶的候选"""
+        signature = self.signature(clean_title)
+        if signature is None:
+            return {}
+        return self.query_signature(signature)
+    
+    def query_signature(self, signature):
+        candidates = set()
+        for band_key in self._band_keys(signature):
+            candidates.update(self.buckets.get(band_key, ()))
+        return {
+            key: sum(x == y for x, y in zip(signature, self.signatures[key])) / self.num_perm
+            for key in candidates
+        }
+
+
+class PublicationIndex:
+    """现有论文的查重索引
+    
+    每次同步只构建一次：标题哈希表、重要词倒排索引和规范化的作者表，
+    使每篇Scholar论文的查重不再需要遍历全部已有论文。
+    匹配规则与逐篇比较完全一致，命中多篇时返回位置最靠前的那一篇。
+    
+    传入near_duplicates参数时改用MinHash/LSH近似重复模式：只对LSH候选
+    运行上述规则，另外估计相似度达到match_threshold的标题也视为重复
+    （如arXiv版与正式版标题略有不同），并记录匹配结果用于生成聚类报告。
+    """
+    
+    def __init__(self, existing_config, near_duplicates=None):
+        self.entries = []
+        self.matches = []          # 近似重复模式下的匹配记录
+        self.lsh = None
+        if near_duplicates:
+            self.lsh = MinHashLSH(near_duplicates.get('num_perm', 64), near_duplicates.get('bands', 16),
+                                  near_duplicates.get('shingle_size', 4))
+            self.candidate_threshold = near_duplicates.get('candidate_threshold', 0.5)
+            self.match_threshold = near_duplicates.get('match_threshold', 0.8)
+        self.exact_titles = {}     # 小写标题 -> 最早位置
+        self.clean_titles = {}     # 去标点标题 -> 最早位置
+        self.word_postings = {}    # 重要词(长度>3) -> 位置集合
+        self.author_postings = {}  # 规范化作者名 -> 位置集合
+        self.author_grams = {}     # 作者名三元组 -> 作者名集合
+        self._author_matches = {}  # 新作者名 -> 匹配的位置集合（同一作者在多篇论文中重复出现）
+        
+        for pubs in existing_config.get('publications', {}).values():
+            if not isinstance(pubs, list):
+                continue
+            for existing in pubs:
+                self.add(existing, source='config')
+    
+    @staticmethod
+    def clean_title(title):
+        """去除标点符号后的小写标题"""
+        return re.sub(r'[^a-z0-9\s]', '', title.lower()).strip()
+    
+    def add(self, existing, source='scholar'):
+        """加入一篇论文（近似重复模式下也用于加入本次新增的论文）"""
+        position = len(self.entries)
+        clean = self.clean_title(existing['title'])
+        significant_words = [w for w in clean.split() if len(w) > 3]
+        authors = [a.lower().strip() for a in existing.get('authors', [])]
+        self.entries.append({
+            'pub': existing,
+            'source': source,
+            'clean': clean,
+            'authors': authors,
+            'significant_words': significant_words,
+            'word_count': len(clean.split()),
+            'significant_count': len(significant_words),
+        })
+        if self.lsh:
+            self.lsh.add(position, clean)
+        
+        self.exact_titles.setdefault(existing['title'].lower(), position)
+        self.clean_titles.setdefault(clean, position)
+        for word in set(significant_words):
+            self.word_postings.setdefault(word, set()).add(position)
+        for author in authors:
+            if len(author) <= 2:
+                continue
+            if author not in self.author_postings:
+                self.author_postings[author] = set()
+                for i in range(len(author) - 2):
+                    self.author_grams.setdefault(author[i:i + 3], set()).add(author)
+            self.author_postings[author].add(position)
+    
+    def _positions_for_author(self, name):
+        """已有作者名与name互为子串的所有论文位置"""
+        if name not in self._author_matches:
+            positions = set()
+            # 已有作者名是name的子串
+            for i in range(len(name)):
+                for j in range(i + 3, len(name) + 1):
+                    positions |= self.author_postings.get(name[i:j], set())
+            # name是已有作者名的子串：只需检查包含其最稀有三元组的作者
+            grams = [self.author_grams.get(name[i:i + 3], set()) for i in range(len(name) - 2)]
+            for author in min(grams, key=len):
+                if name in author:
+                    positions |= self.author_postings[author]
+            self._author_matches[name] = positions
+        return self._author_matches[name]
+    
+    def _word_overlap_positions(self, new_pub, clean_new):
+        """规则3：重要词重合率超过85%的论文位置"""
+        if len(new_pub['title']) <= 20:
+            return []
+        new_words = [w for w in clean_new.split() if len(w) > 3]
+        
+        # 每个位置的共同词数（按新标题中的出现次数计）
+        common = {}
+        for word in set(new_words):
+            occurrences = new_words.count(word)
+            for position in self.word_postings.get(word, ()):
+                common[position] = common.get(position, 0) + occurrences
+        
+        return [
+            position for position, count in common.items()
+            if len(self.entries[position]['pub']['title']) > 20
+            and count / max(len(new_words), self.entries[position]['significant_count']) > 0.85
+        ]
+    
+    def _author_title_match(self, new_pub, clean_new, entry, common_author_count):
+        """规则4：共同作者+标题关键词匹配"""
+        existing = entry['pub']
+        clean_existing = entry['clean']
+        title_overlap = len([w for w in clean_new.split() 
+                           if len(w) > 4 and w in clean_existing])
+        
+        # 对于survey论文，需要更严格的匹配条件
+        if 'survey' in clean_new and 'survey' in clean_existing:
+            # Survey论文需要更高的相似度阈值
+            overlap_ratio = title_overlap / max(len(clean_new.split()), entry['word_count'])
+            
+            if overlap_ratio >= 0.7:
+                print(f"🔍 Found survey paper match: \"{new_pub['title']}\" vs \"{existing['title']}\" (common authors: {common_author_count}, title overlap: {title_overlap}, ratio: {overlap_ratio:.2f})")
+                return True
+            print(f"📝 Survey papers with similar authors but different topics: \"{new_pub['title'][:50]}...\" vs \"{existing['title'][:50]}...\" (overlap ratio: {overlap_ratio:.2f})")
+            return False
+        
+        # 非survey论文使用原来的条件
+        if title_overlap >= 5:
+            print(f"🔍 Found author+title match: \"{new_pub['title']}\" vs \"{existing['title']}\" (common authors: {common_author_count}, title overlap: {title_overlap})")
+            return True
+        return False
+    
+    def find(self, new_pub):
+        """返回与new_pub重复的已有论文，没有则返回None"""
+        if self.lsh:
+            return self._find_near_duplicate(new_pub)
+        
+        title_lower = new_pub['title'].lower()
+        clean_new = self.clean_title(new_pub['title'])
+        
+        # 规则1-3直接查表，取最靠前的命中位置
+        candidates = [self.exact_titles.get(title_lower), self.clean_titles.get(clean_new)]
+        candidates.extend(self._word_overlap_positions(new_pub, clean_new))
+        title_match = min((p for p in candidates if p is not None), default=len(self.entries))
+        
+        # 规则4只需检查至少有3个共同作者、且排在规则1-3命中位置之前的论文
+        common_authors = {}
+        for name in (a.lower().strip() for a in new_pub['authors']):
+            if len(name) > 2:
+                for position in self._positions_for_author(name):
+                    common_authors[position] = common_authors.get(position, 0) + 1
+        
+        for position in sorted(p for p, count in common_authors.items() if count >= 3 and p < title_match):
+            if self._author_title_match(new_pub, clean_new, self.entries[position], common_authors[position]):
+                return self.entries[position]['pub']
+        
+        if title_match == len(self.entries):
+            return None
+        
+        existing = self.entries[title_match]['pub']
+        if existing['title'].lower() == title_lower:
+            self._report_title_match('exact', new_pub, existing)
+        elif self.entries[title_match]['clean'] == clean_new:
+            self._report_title_match('similar', new_pub, existing)
+        else:
+            self._report_title_match('word-overlap', new_pub, existing)
+        return existing
+    
+    @staticmethod
+    def _report_title_match(rule, new_pub, existing):
+        if rule == 'exact':
+            print(f"🔍 Found exact title match: \"{new_pub['title']}\"")
+        elif rule == 'similar':
+            print(f"🔍 Found similar title: \"{new_pub['title']}\" vs \"{existing['title']}\"")
+        else:
+            print(f"🔍 Found word overlap match: \"{new_pub['title']}\" vs \"{existing['title']}\"")
+    
+    def _pair_rule(self, new_pub, clean_new, new_authors, entry):
+        """对单个候选依次运行规则1-4，返回命中的规则名或None"""
+        existing = entry['pub']
+        if existing['title'].lower() == new_pub['title'].lower():
+            self._report_title_match('exact', new_pub, existing)
+            return 'exact'
+        if entry['clean'] == clean_new:
+            self._report_title_match('similar', new_pub, existing)
+            return 'similar'
+        
+        if len(new_pub['title']) > 20 and len(existing['title']) > 20:
+            new_words = [w for w in clean_new.split() if len(w) > 3]
+            common_words = [w for w in new_words if w in entry['significant_words']]
+            longest = max(len(new_words), entry['significant_count'])
+            if longest and len(common_words) / longest > 0.85:
+                self._report_title_match('word-overlap', new_pub, existing)
+                return 'word-overlap'
+        
+        common_author_count = 0
+        for na in new_authors:
+            if len(na) > 2 and any(len(ea) > 2 and (na in ea or ea in na) for ea in entry['authors']):
+                common_author_count += 1
+        if common_author_count >= 3 and self._author_title_match(new_pub, clean_new, entry, common_author_count):
+            return 'author-title'
+        return None
+    
+    def _find_near_duplicate(self, new_pub):
+        """近似重复模式：LSH候选 + 精确规则 + 相似度阈值"""
+        clean_new = self.clean_title(new_pub['title'])
+        new_authors = [a.lower().strip() for a in new_pub['authors']]
+        similarities = self.lsh.query(clean_new)
+        
+        candidates = {p for p, similarity in similarities.items() if similarity >= self.candidate_threshold}
+        for position in (self.exact_titles.get(new_pub['title'].lower()), self.clean_titles.get(clean_new)):
+            if position is not None:
+                candidates.add(position)
+        
+        for position in sorted(candidates):
+            entry = self.entries[position]
+            similarity = similarities.get(position, 0.0)
+            rule = self._pair_rule(new_pub, clean_new, new_authors, entry)
+            if rule is None and similarity >= self.match_threshold:
+                rule = 'minhash'
+                print(f"🔍 Found near-duplicate title: \"{new_pub['title']}\" vs \"{entry['pub']['title']}\" (similarity: {similarity:.2f})")
+            if rule:
+                self.matches.append((new_pub['title'], position, rule, similarity))
+                return entry['pub']
+        return None
+    
+    def cluster_report(self):
+        """把匹配记录和已有论文之间的近似重复合并成聚类（并查集）"""
+        parent = {}
+        
+        def find_root(node):
+            parent.setdefault(node, node)
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+        
+        links = []
+        for i, (title, position, rule, similarity) in enumerate(self.matches):
+            links.append((('scholar', i), ('entry', position), rule, similarity))
+        
+        # 配置中已有论文之间的近似重复也一并报告，便于清理
+        for position, entry in enumerate(self.entries):
+            if entry['source'] != 'config' or position not in self.lsh.signatures:
+                continue
+            for other, similarity in self.lsh.query_signature(self.lsh.signatures[position]).items():
+                if other > position and self.entries[other]['source'] == 'config' and similarity >= self.match_threshold:
+                    links.append((('entry', position), ('entry', other), 'minhash', similarity))
+        
+        for a, b, _, _ in links:
+            parent[find_root(a)] = find_root(b)
+        
+        def describe(node):
+            if node[0] == 'scholar':
+                return {'title': self.matches[node[1]][0], 'source': 'scholar'}
+            entry = self.entries[node[1]]
+            return {'title': entry['pub']['title'], 'source': entry['source']}
+        
+        clusters = {}
+        for a, b, rule, similarity in links:
+            cluster = clusters.setdefault(find_root(a), {'members': [], 'links': []})
+            for node in (a, b):
+                if node not in cluster['members']:
+                    cluster['members'].append(node)
+            cluster['links'].append({
+                'a': cluster['members'].index(a),
+                'b': cluster['members'].index(b),
+                'rule': rule,
+                'similarity': round(similarity, 3),
+            })
+        
+        report = []
+        for cluster in sorted(clusters.values(), key=lambda c: len(c['members']), reverse=True):
+            report.append({
+                'members': [describe(node) for node in cluster['members']],
+                'links': cluster['links'],
+            })
+        return {
+            'settings': {
+                'num_perm': self.lsh.num_perm,
+                'bands': self.lsh.bands,
+                'shingle_size': self.lsh.shingle_size,
+                'candidate_threshold': self.candidate_threshold,
+                'match_threshold': self.match_threshold,
+            },
+            'clusters': report,
+        }
+
+
+VENUES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "venues.json")
+
+# venues.json缺失时使用的内置会议/期刊列表
+DEFAULT_VENUES = [
+    {'name': name, 'type': 'conference', 'aliases': []}
+    for name in ('CVPR', 'ICCV', 'ECCV', 'NeurIPS', 'ICML', 'ICLR', 'AAAI', 'IJCAI', 'WACV', '3DV')
+] + [{'name': 'arXiv', 'type': 'preprint', 'aliases': []}]
+
+
+class AliasAutomaton:
+    """多模式匹配自动机（Aho-Corasick）：扫描一遍文本即可找出所有出现的别名，
+    耗时与文本长度和命中数成正比，与别名数量无关
+    """
+    
+    def __init__(self):
+        self.transitions = [{}]  # 状态 -> {字符: 下一状态}
+        self.fail = [0]          # 失配时跳转的状态（当前前缀的最长真后缀）
+        self.outputs = [[]]      # 状态 -> 在此结束的 (别名长度, 值)
+    
+    def add(self, pattern, value):
+        state = 0
+        for char in pattern:
+            next_state = self.transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self.transitions)
+                self.transitions[state][char] = next_state
+                self.transitions.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            state = next_state
+        self.outputs[state].append((len(pattern), value))
+    
+    def build(self):
+        """按广度优先计算失配指针，并把后缀状态的输出合并进来"""
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.transitions[fallback].get(char, 0)
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+    
+    def find_all(self, text):
+        """逐个产出 (起始位置, 结束位置, 值)"""
+        state = 0
+        transitions = self.transitions
+        for end, char in enumerate(text, 1):
+            while state and char not in transitions[state]:
+                state = self.fail[state]
+            state = transitions[state].get(char, 0)
+            for length, value in self.outputs[state]:
+                yield end - length, end, value
+
+
+class VenueKnowledgeBase:
+    """会议/期刊知识库：名称、别名、类型和举办年份来自数据文件（venues.json）
+    
+    别名编进两个自动机：全大写的缩写（TIP、TOG、ACL……）区分大小写匹配，
+    以免"Tip of the iceberg"被当成TIP；其他别名不区分大小写。匹配要求词边界
+    （前面不能紧跟字母数字，后面不能紧跟字母，所以"CVPR2024"能匹配而"ICCVW"不会算作ICCV）。
+    多个别名命中时会议/期刊优先于预印本，其次取最长的，等长取最靠前的；原始字符串带年份时
+    （不算arXiv编号中的数字），年份不在该会议举办范围内的命中会被跳过。结果按原始字符串缓存。
+    """
+    
+    def __init__(self, venues):
+        self.automaton = AliasAutomaton()          # 不区分大小写，匹配小写文本
+        self.acronym_automaton = AliasAutomaton()  # 全大写缩写，匹配原始大小写文本
+        self.venue_count = len(venues)
+        self.alias_count = 0
+        for venue in venues:
+            info = {'type': venue['type'], 'fullName': venue['name']}
+            first, last = venue.get('years') or (None, None)
+            seen = set()
+            for alias in [venue['name']] + venue.get('aliases', []):
+                alias = ' '.join(alias.split())
+                acronym = alias == alias.upper()
+                if not acronym:
+                    alias = alias.lower()
+                if alias and alias not in seen:
+                    seen.add(alias)
+                    automaton = self.acronym_automaton if acronym else self.automaton
+                    automaton.add(alias, (info, first, last))
+                    self.alias_count += 1
+        self.automaton.build()
+        self.acronym_automaton.build()
+        self._memo = {}
+    
+    @classmethod
+    def load(cls, path=VENUES_FILE):
+        """读取venues.json；文件不存在时使用内置列表"""
+        if not os.path.exists(path):
+            print(f"⚠️  Venue file {path} not found, using built-in venue list")
+            return cls(DEFAULT_VENUES)
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f)['venues'])
+    
+    def classify(self, venue):
+        """返回 {'type', 'fullName'}；同一原始字符串只匹配一次"""
+        result = self._memo.get(venue)
+        if result is None:
+            result = self._classify(venue)
+            self._memo[venue] = result
+        return dict(result)  # 返回副本，调用方修改不会污染缓存
+    
+    @staticmethod
+    def _word_matches(automaton, text):
+        """自动机在text中满足词边界的命中"""
+        for start, end, value in automaton.find_all(text):
+            if start > 0 and text[start - 1].isalnum():
+                continue
+            if end < len(text) and text[end].isalpha():
+                continue
+            yield start, end, value
+    
+    def _classify(self, venue):
+        original = ' '.join(venue.split())
+        text = original.lower()
+        # arXiv编号（如arXiv:2012.01234）里的"2012"不是年份
+        years = [int(y) for y in re.findall(r'(?<!\d)(?:19|20)\d{2}(?!\d)',
+                                            re.sub(r'arxiv[:\s/]*(?:abs/)?\d{4}\.\d+', ' ', text))]
+        
+        best = None
+        matches = chain(self._word_matches(self.automaton, text),
+                        self._word_matches(self.acronym_automaton, original))
+        for start, end, (info, first, last) in matches:
+            if years and not any((first is None or year >= first) and (last is None or year <= last)
+                                 for year in years):
+                continue
+            rank = (info['type'] != 'preprint', end - start, -start)
+            if best is None or rank > best[0]:
+                best = (rank, info)
+        if best:
+            return best[1]
+        
+        # 默认处理
+        if 'arxiv' in text:
+            return {'type': 'preprint', 'fullName': 'arXiv'}
+        elif 'journal' in text:
+            return {'type': 'journal', 'fullName': venue}
+        else:
+            return {'type': 'conference', 'fullName': venue}
+
+
+_venue_knowledge_bases = {}
+
+
+def load_venue_knowledge_base(path=None):
+    """每个数据文件只加载、编译一次，多个ScholarSync实例共用"""
+    path = os.path.abspath(path or VENUES_FILE)
+    if path not in _venue_knowledge_bases:
+        _venue_knowledge_bases[path] = VenueKnowledgeBase.load(path)
+    return _venue_knowledge_bases[path]
+
+
+# 数组列使用的typecode：固定4字节无符号整数，文件中按小端存储
+UINT32 = 'I' if array('I').itemsize == 4 else 'L'
+
+
+def normalized_title(title):
+    """小写、去标点、合并空白后的标题"""
+    return ' '.join(re.sub(r'[^\w\s]', ' ', title.lower()).split())
+
+
+def citation_key(pub):
+    """论文在引用历史中的键：优先使用Scholar的citation_for_view，没有链接时用规范化标题"""
+    query = parse_qs(urlparse(pub.get('link') or '').query)
+    if 'citation_for_view' in query:
+        return query['citation_for_view'][0]
+    return 'title:' + normalized_title(pub['title'])
+
+
+class CitationHistory:
+    """只追加的引用数时间序列，存放在config.json之外
+    
+    每次同步每篇论文一条记录 (日期, 论文, 引用数, 上一条)，按列分别追加到四个
+    uint32数组文件（dates/papers/counts/prev），日期单调不减；prev是同一篇论文
+    上一条记录的序号，把每篇论文的记录串成链。papers.json保存论文表、每篇论文
+    最新的值和最后一条记录的序号、已提交的记录数，最后原子写入，作为一次
+    追加的提交点：列文件比记录数长的部分视为未完成的追加，打开时截掉。
+    
+    latest()只读papers.json；series()沿链读取一篇论文的记录；trending()在日期列上
+    二分查找窗口起点，只读取窗口内的记录，每篇论文窗口前的最后一条记录
+    （即它在窗口内第一条记录的prev）单独读取，不扫描窗口之前的历史。
+    """
+    
+    COLUMNS = ('dates', 'papers', 'counts', 'prev')
+    NO_RECORD = 0xFFFFFFFF  # prev列中表示此前没有记录
+    
+    def __init__(self, directory=HISTORY_DIR):
+        self.directory = directory
+        self.index_path = os.path.join(directory, 'papers.json')
+        self.papers = []      # 论文序号 -> {'key', 'title', 'last_date', 'last_count', 'last_record'}
+        self.positions = {}   # 键 -> 论文序号
+        self.records = 0
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            self.papers = index['papers']
+            self.records = index['records']
+            self.positions = {paper['key']: i for i, paper in enumerate(self.papers)}
+        self._truncate_columns()
+        prev_path = self._column_path('prev')
+        if self.records and (not os.path.exists(prev_path) or os.path.getsize(prev_path) < self.records * 4):
+            self._build_prev_column()
+    
+    def _column_path(self, name):
+        return os.path.join(self.directory, f"{name}.u32")
+    
+    def _truncate_columns(self):
+        """丢弃上次中断的追加留下的、尚未提交的记录"""
+        for name in self.COLUMNS:
+            path = self._column_path(name)
+            if os.path.exists(path) and os.path.getsize(path) > self.records * 4:
+                with open(path, 'r+b') as f:
+                    f.truncate(self.records * 4)
+    
+    def _build_prev_column(self):
+        """为没有prev列的旧历史补建记录链（只需扫描一次论文列）"""
+        last = {}
+        prev = []
+        for i, paper in enumerate(self._read_column('papers')):
+            prev.append(last.get(paper, self.NO_RECORD))
+            last[paper] = i
+        path = self._column_path('prev')
+        if os.path.exists(path):
+            os.remove(path)
+        self._append_column('prev', prev)
+        for position, paper in enumerate(self.papers):
+            paper['last_record'] = last.get(position)
+        self._write_index()
+    
+    def _read_column(self, name, start=0, stop=None):
+        """读取一列中 [start, stop) 范围的记录"""
+        stop = self.records if stop is None else stop
+        values = array(UINT32)
+        if stop > start:
+            with open(self._column_path(name), 'rb') as f:
+                f.seek(start * 4)
+                values.fromfile(f, stop - start)
+            if sys.byteorder == 'big':
+                values.byteswap()
+        return values
+    
+    def _read_values(self, name, indexes):
+        """按序号读取一列中零散的记录：{序号: 值}"""
+        values = {}
+        with open(self._column_path(name), 'rb') as f:
+            for i in sorted(set(indexes)):
+                f.seek(i * 4)
+                values[i] = int.from_bytes(f.read(4), 'little')
+        return values
+    
+    def _append_column(self, name, values):
+        values = array(UINT32, values)
+        if sys.byteorder == 'big':
+            values.byteswap()
+        with open(self._column_path(name), 'ab') as f:
+            values.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    def _write_index(self):
+        """原子写入papers.json（提交点）"""
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'records': self.records, 'papers': self.papers}, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+    
+    def _first_record_after(self, day_number):
+        """日期列上二分查找：第一条日期晚于day_number的记录序号"""
+        low, high = 0, self.records
+        with open(self._column_path('dates'), 'rb') as f:
+            while low < high:
+                mid = (low + high) // 2
+                f.seek(mid * 4)
+                if int.from_bytes(f.read(4), 'little') <= day_number:
+                    low = mid + 1
+                else:
+                    high = mid
+        return low
+    
+    def record(self, pubs, day=None):
+        """记录一次同步的引用数；同一天重复同步时只追加有变化的论文，返回追加的记录数"""
+        day = day or datetime.now().date()
+        day_number = day.toordinal()
+        last_day = max((paper['last_date'] for paper in self.papers), default=0)
+        if day_number < last_day:
+            print(f"⚠️  Citation history already has {date.fromordinal(last_day)}, not recording {day}")
+            return 0
+        
+        rows = []
+        recorded = set()  # 同一主页中重复出现的论文只记一次
+        for pub in pubs:
+            key = citation_key(pub)
+            position = self.positions.get(key)
+            if position is None:
+                position = len(self.papers)
+                self.positions[key] = position
+                self.papers.append({'key': key, 'title': pub['title'], 'last_date': 0, 'last_count': 0,
+                                    'last_record': None})
+            paper = self.papers[position]
+            if paper['last_date'] == day_number and paper['last_count'] == pub['citations']:
+                continue
+            if position in recorded:
+                continue
+            recorded.add(position)
+            previous = paper.get('last_record')
+            rows.append((day_number, position, pub['citations'], self.NO_RECORD if previous is None else previous))
+            paper['last_date'] = day_number
+            paper['last_count'] = pub['citations']
+            paper['last_record'] = self.records + len(rows) - 1
+        
+        if not rows:
+            return 0
+        os.makedirs(self.directory, exist_ok=True)
+        for column, name in enumerate(self.COLUMNS):
+            self._append_column(name, (row[column] for row in rows))
+        self.records += len(rows)
+        # papers.json是提交点：写入之前中断的追加会在下次打开时被截掉
+        self._write_index()
+        return len(rows)
+    
+    def latest(self):
+        """{键: (日期, 引用数)}，不读取历史记录"""
+        return {
+            paper['key']: (date.fromordinal(paper['last_date']).isoformat(), paper['last_count'])
+            for paper in self.papers if paper['last_date']
+        }
+    
+    def series(self, key):
+        """一篇论文的 [(日期, 引用数)]，同一天多条记录取最后一条"""
+        position = self.positions.get(key)
+        if position is None or self.papers[position].get('last_record') is None:
+            return []
+        hits = []
+        with open(self._column_path('prev'), 'rb') as f:
+            record = self.papers[position]['last_record']
+            while record != self.NO_RECORD:
+                hits.append(record)
+                f.seek(record * 4)
+                record = int.from_bytes(f.read(4), 'little')
+        dates = self._read_values('dates', hits)
+        counts = self._read_values('counts', hits)
+        by_day = {}
+        for i in reversed(hits):
+            by_day[dates[i]] = counts[i]
+        return [(date.fromordinal(day).isoformat(), count) for day, count in sorted(by_day.items())]
+    
+    def trending(self, days=90, limit=10):
+        """最近days天引用数增长最多的论文：[(键, 标题, 增长数)]
+        
+        增长数 = 最新值 - 窗口开始前最后一次记录的值（窗口内才出现的论文从窗口内第一条记录算起）。
+        """
+        if not self.records:
+            return []
+        cutoff = max(paper['last_date'] for paper in self.papers) - days
+        start = self._first_record_after(cutoff)
+        
+        baseline = {}
+        before = {}  # 论文 -> 窗口开始前（含cutoff当天）它的最后一条记录
+        for paper, count, previous in zip(self._read_column('papers', start), self._read_column('counts', start),
+                                          self._read_column('prev', start)):
+            if paper not in baseline:
+                baseline[paper] = count
+                if previous != self.NO_RECORD:
+                    before[paper] = previous
+        counts = self._read_values('counts', before.values()) if before else {}
+        for paper, record in before.items():
+            baseline[paper] = counts[record]
+        
+        gains = []
+        for position, first_count in baseline.items():
+            paper = self.papers[position]
+            gain = paper['last_count'] - first_count
+            if gain > 0:
+                gains.append((paper['key'], paper['title'], gain))
+        gains.sort(key=lambda item: (-item[2], item[1]))
+        return gains[:limit]
+
+
+def config_changes(old_config, new_config):
+    """比较两份配置，返回紧凑的变更列表：论文按（年份, 标题）逐篇比较，其他部分只记录节名"""
+    def publications_by_key(config):
+        pubs = {}
+        for year, items in (config.get('publications') or {}).items():
+            for pub in items:
+                pubs[(year, pub.get('title', '').lower())] = pub
+        return pubs
+    
+    old_pubs = publications_by_key(old_config)
+    new_pubs = publications_by_key(new_config)
+    changes = []
+    for key, pub in new_pubs.items():
+        old = old_pubs.get(key)
+        if old is None:
+            changes.append({'op': 'add', 'year': key[0], 'title': pub.get('title')})
+        elif old != pub:
+            fields = sorted(field for field in set(old) | set(pub) if old.get(field) != pub.get(field))
+            changes.append({'op': 'update', 'year': key[0], 'title': pub.get('title'), 'fields': fields})
+    for key, pub in old_pubs.items():
+        if key not in new_pubs:
+            changes.append({'op': 'remove', 'year': key[0], 'title': pub.get('title')})
+    for section in sorted(set(old_config) | set(new_config)):
+        if section != 'publications' and old_config.get(section) != new_config.get(section):
+            changes.append({'op': 'section', 'name': section})
+    return changes
+
 
 class ScholarSync:
-    def __init__(self, user_id=None, config_path="config.json"):
+    def __init__(self, user_id=None, config_path="config.json", near_duplicates=None,
+                 base_url=None, workers=FETCH_WORKERS, rate=None, record_dir=None,
+                 cache=None, replay=False, replay_dir=None, enrich=False,
+                 enrich_workers=ENRICH_WORKERS, host_concurrency=HOST_CONCURRENCY, parser='auto',
+                 venues_path=None, history=None, shared=None, max_rate=None, max_retries=MAX_RETRIES):
         self.user_id = user_id or SCHOLAR_USER_ID
         self.config_path = config_path
+        self.near_duplicates = near_duplicates  # MinHash/LSH近似重复检测参数，None表示使用逐条规则
+        self.base_url = (base_url or SCHOLAR_BASE_URL).rstrip('/')  # 测试时可指向本地录制页面服务器
+        self.workers = max(1, workers)
+        self.rate_limiter = (shared.rate_limiter if shared
+                             else AdaptiveRateLimiter(rate or 1 / REQUEST_DELAY, max_rate=max_rate))
+        self.max_retries = max(1, max_retries)
+        self.record_dir = record_dir  # 保存抓取到的原始页面，供scholar_standin_server.py回放
+        self.cache = cache            # ResponseCache，None表示不缓存
+        self.replay = replay          # 回放模式：只使用缓存或录制的页面，不访问网络
+        self.replay_dir = replay_dir  # 回放录制页面的目录（profile-<cstart>.html）
+        self.enrich = enrich          # 是否抓取详情页补全作者、日期和arXiv编号
+        self.history = history        # CitationHistory，None表示不记录引用数历史
+        self.parser = resolve_parser_backend(parser)  # 主页解析后端
+        self.venues = load_venue_knowledge_base(venues_path)  # 会议/期刊知识库
+        self.loaded_hash = None       # 加载时config.json的内容哈希，用于发现外部修改
+        self.config_data = None       # sync()结束后内存中的配置，供同进程构建使用
+        self.changes = []             # sync()对配置做的修改（config_changes格式）
+        self.enrich_workers = max(1, enrich_workers)
+        self.host_concurrency = max(1, host_concurrency)
+        if shared is not None:
+            # 批量同步：与shared共用Session、限速器和每主机并发限制
+            self.session = shared.session
+            self._host_slots = shared._host_slots
+            self._host_slots_lock = shared._host_slots_lock
+            return
+        self._host_slots = {}         # 主机 -> 并发信号量
+        self._host_slots_lock = threading.Lock()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        # 所有抓取线程共用一个Session，连接池大小与并发数一致
+        pool_size = max(self.workers, self.enrich_workers if enrich else 1)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
     def fetch_scholar_publications(self):
-        """从Google Scholar获取出版物列表"""
+        """从Google Scholar获取出版物列表（自动翻页，多页并发抓取）
+        
+        任何一页抓取失败都返回None，不使用不完整的列表。
+        """
         print(f"🔍 Fetching publications from Google Scholar...")
+        print(f"📖 URL: {self.profile_page_url(0)}")
         
-        url = f"https://scholar.google.com/citations?user={self.user_id}&hl=en&sortby=pubdate"
-        print(f"📖 URL: {url}")
+        # 先抓第一页：大多数主页只有一页，不必预取
+        first_page = self._fetch_profile_page(0)
+        if first_page is None:
+            return None
+        rows, has_more = first_page
+        if rows is None:
+            print("❌ Could not find publications table")
+            return None
         
-        for attempt in range(MAX_RETRIES):
-            try:
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
-                
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # 查找出版物表格
-                pub_table = soup.find('table', id='gsc_a_t')
-                if not pub_table:
-                    print("❌ Could not find publications table")
-                    return []
+        pages = {0: rows}
+        if has_more:
+            remaining, missing = self._fetch_remaining_pages()
+            if missing:
+                print(f"❌ Page {', '.join(str(page + 1) for page in missing)} could not be fetched, "
+                      f"not using an incomplete publication list")
+                return None
+            pages.update(remaining)
+        
+        # 按页码顺序合并
+        publications = [pub for page in sorted(pages) for pub in pages[page]]
+        print(f"📚 Found {len(publications)} publications")
+        return publications
+    
+    def profile_page_url(self, page):
+        """第page页（从0开始）的主页地址"""
+        return (f"{self.base_url}/citations?user={self.user_id}&hl=en&sortby=pubdate"
+                f"&cstart={page * PAGE_SIZE}&pagesize={PAGE_SIZE}")
+    
+    def _fetch_remaining_pages(self):
+        """并发抓取第2页起的所有页面，每页到达后立即解析合并
+        
+        返回 ({页码: 论文列表}, 抓取失败的页码)；最后一页之后预取失败的页不算失败。
+        """
+        pages = {}
+        failed = []
+        last_page = MAX_PAGES - 1  # 遇到不满一页或抓取失败后更新为已知的最后一页
+        final_page = None          # 服务器表明没有下一页的页码
+        next_page = 1
+        
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            running = {}
+            while running or next_page <= last_page:
+                while len(running) < self.workers and next_page <= last_page:
+                    running[pool.submit(self._fetch_profile_page, next_page)] = next_page
+                    next_page += 1
                 
-                publications = []
-                rows = pub_table.find_all('tr', class_='gsc_a_tr')
+                done = next(as_completed(running))
+                page = running.pop(done)
+                result = done.result()
+                if result is None or result[0] is None:
+                    print(f"⚠️  Page {page + 1} could not be fetched, stopping pagination")
+                    failed.append(page)
+                    last_page = min(last_page, page - 1)
+                    continue
                 
-                for row in rows:
-                    try:
-                        pub = self._parse_publication_row(row)
-                        if pub:
-                            publications.append(pub)
-                    except Exception as e:
-                        print(f"⚠️  Error parsing row: {e}")
+                rows, has_more = result
+                if page <= last_page and rows:
+                    pages[page] = rows
+                    print(f"📄 Page {page + 1}: {len(rows)} publications")
+                if not has_more:
+                    last_page = min(last_page, page)
+                    final_page = page if final_page is None else min(final_page, page)
+        
+        # 丢弃最后一页之后预取到的页面
+        missing = sorted(page for page in failed if final_page is None or page <= final_page)
+        return {page: rows for page, rows in pages.items() if page <= last_page}, missing
+    
+    def _fetch_profile_page(self, page):
+        """抓取并解析一页，返回(rows, has_more)；页面中没有表格时rows为None，请求失败返回None"""
+        content = self._get(self.profile_page_url(page))
+        if content is None:
+            return None
+        return self._parse_profile_page(content)
+    
+    def _get(self, url):
+        """所有请求的统一入口：缓存、条件请求、限速、重试和回放，返回正文或None"""
+        entry = self.cache.load(url) if self.cache else None
+        
+        if self.replay:
+            if self.replay_dir:
+                path = os.path.join(self.replay_dir, recorded_page_name(url))
+                if os.path.exists(path):
+                    with open(path, 'rb') as f:
+                        return f.read()
+            if entry:
+                return entry['content']
+            print(f"⚠️  Not available offline: {url}")
+            return None
+        
+        if entry and self.cache.is_fresh(entry):
+            print(f"💾 Using cached copy: {url}")
+            content = entry['content']
+        else:
+            content = self._download(url, entry)
+        
+        if content is not None and self.record_dir:
+            self._record_page(url, content)
+        return content
+    
+    def _download(self, url, entry):
+        """发送请求，失败时退回过期缓存"""
+        # 缓存过期：带上验证信息，内容未变时服务器返回304
+        headers = {}
+        if entry and entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry and entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        
+        for attempt in range(self.max_retries):
+            last_attempt = attempt == self.max_retries - 1
+            try:
+                self.rate_limiter.acquire()
+                with self._host_slot(url):
+                    response = self.session.get(url, timeout=30, headers=headers)
+                if response.status_code in (429, 503):
+                    # 被限流：降速，所有线程暂停到Retry-After（没有则按退避时间）之后再试
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    if last_attempt:
+                        # 不再重试：只降速，不让其他线程陪着暂停
+                        self.rate_limiter.throttled(attempt, retry_after, pause=False)
+                        print(f"⏳ Throttled ({response.status_code}, attempt {attempt + 1}/{self.max_retries}), "
+                              f"giving up: {url}")
                         continue
-                
-                print(f"📚 Found {len(publications)} publications")
-                return publications
+                    pause = self.rate_limiter.throttled(attempt, retry_after)
+                    print(f"⏳ Throttled ({response.status_code}, attempt {attempt + 1}/{self.max_retries}), "
+                          f"pausing {pause:.1f}s: {url}")
+                    continue
+                if response.status_code == 304 and entry:
+                    self.rate_limiter.succeeded()
+                    self.cache.touch(entry)
+                    print(f"💾 Not modified, using cached copy: {url}")
+                    return entry['content']
+                response.raise_for_status()
+                self.rate_limiter.succeeded()
+                if self.cache:
+                    self.cache.store(url, response)
+                return response.content
                 
             except requests.RequestException as e:
-                print(f"❌ Request failed (attempt {attempt + 1}/{MAX_RETRIES}): {e}")
-                if attempt < MAX_RETRIES - 1:
-                    time.sleep(REQUEST_DELAY * (attempt + 1))
-                    continue
-                else:
-                    return []
+                print(f"❌ Request failed (attempt {attempt + 1}/{self.max_retries}): {e}")
+                if not last_attempt:
+                    # 404之类的客户端错误与请求速率无关，只退避不降速
+                    status = e.response.status_code if e.response is not None else None
+                    self.rate_limiter.failed(attempt, server_error=status is None or status >= 500)
         
-        return []
+        # 被限流或网络故障时，过期的缓存总比整个同步失败好
+        if entry:
+            print(f"💾 Falling back to stale cached copy: {url}")
+            return entry['content']
+        return None
+    
+    def print_rate_metrics(self):
+        """打印限速统计：请求数、被限流次数和花在等待上的时间"""
+        metrics = self.rate_limiter.metrics()
+        print(f"⏱️  {metrics['requests']} requests, {metrics['throttled']} throttled, {metrics['errors']} failed; "
+              f"rate now {metrics['rate']:.2f} req/s")
+        print(f"⏱️  Time throttled (summed over threads): {metrics['token_wait']:.1f}s rate limit, "
+              f"{metrics['pause_wait']:.1f}s server pauses, {metrics['backoff_wait']:.1f}s backoff")
+    
+    def _host_slot(self, url):
+        """同一主机的并发请求数不超过host_concurrency"""
+        host = urlparse(url).netloc
+        with self._host_slots_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.host_concurrency)
+            return self._host_slots[host]
+    
+    def _record_page(self, url, content):
+        """保存原始页面，供scholar_standin_server.py或--replay DIR回放"""
+        os.makedirs(self.record_dir, exist_ok=True)
+        with open(os.path.join(self.record_dir, recorded_page_name(url)), 'wb') as f:
+            f.write(content)
+    
+    def _parse_profile_page(self, content, parser=None):
+        """解析一页主页，返回(rows, has_more)；快速后端出错时退回BeautifulSoup"""
+        parser = parser or self.parser
+        if parser != 'bs4':
+            try:
+                return self._parse_profile_page_fast(content, PROFILE_ROW_EXTRACTORS[parser])
+            except Exception as e:
+                print(f"⚠️  {parser} parser failed ({e}), falling back to BeautifulSoup")
+        return self._parse_profile_page_bs4(content)
+    
+    def _parse_profile_page_fast(self, content, extract_rows):
+        """用只提取表格行的快速后端解析"""
+        text = content.decode('utf-8', errors='replace') if isinstance(content, bytes) else content
+        rows, table_found, more_disabled = extract_rows(text)
+        if not table_found:
+            return None, False
+        
+        publications = []
+        for row in rows:
+            try:
+                pub = self._build_publication(row)
+                if pub:
+                    publications.append(pub)
+            except Exception as e:
+                print(f"⚠️  Error parsing row: {e}")
+                continue
+        
+        # "Show more"按钮被禁用或本页不满，说明没有下一页
+        has_more = len(rows) >= PAGE_SIZE and not more_disabled
+        return publications, has_more
+    
+    def _parse_profile_page_bs4(self, content):
+        """BeautifulSoup后端（原实现），作为兼容回退"""
+        soup = BeautifulSoup(content, 'html.parser')
+        
+        # 查找出版物表格
+        pub_table = soup.find('table', id='gsc_a_t')
+        if not pub_table:
+            return None, False
+        
+        publications = []
+        rows = pub_table.find_all('tr', class_='gsc_a_tr')
+        
+        for row in rows:
+            try:
+                pub = self._parse_publication_row(row)
+                if pub:
+                    publications.append(pub)
+            except Exception as e:
+                print(f"⚠️  Error parsing row: {e}")
+                continue
+        
+        # "Show more"按钮被禁用或本页不满，说明没有下一页
+        more_button = soup.find('button', id='gsc_bpf_more')
+        has_more = len(rows) >= PAGE_SIZE and not (more_button and more_button.has_attr('disabled'))
+        return publications, has_more
     
     def _parse_publication_row(self, row):
         """解析单个出版物行"""
@@ -84,7 +1448,7 @@ class ScholarSync:
         title = title_elem.get_text().strip()
         link = title_elem.get('href', '')
         if link:
-            link = urljoin("https://scholar.google.com", link)
+            link = urljoin(SCHOLAR_BASE_URL, link)
         
         # 作者
         authors_elem = row.find('div', class_='gs_gray')
@@ -124,36 +1488,170 @@ class ScholarSync:
             'link': link
         }
     
-    def parse_venue_info(self, venue):
-        """解析会议/期刊信息"""
-        venue_map = {
-            'CVPR': {'type': 'conference', 'fullName': 'CVPR'},
-            'ICCV': {'type': 'conference', 'fullName': 'ICCV'},
-            'ECCV': {'type': 'conference', 'fullName': 'ECCV'},
-            'NeurIPS': {'type': 'conference', 'fullName': 'NeurIPS'},
-            'ICML': {'type': 'conference', 'fullName': 'ICML'},
-            'ICLR': {'type': 'conference', 'fullName': 'ICLR'},
-            'AAAI': {'type': 'conference', 'fullName': 'AAAI'},
-            'IJCAI': {'type': 'conference', 'fullName': 'IJCAI'},
-            'WACV': {'type': 'conference', 'fullName': 'WACV'},
-            '3DV': {'type': 'conference', 'fullName': '3DV'},
-            'arXiv': {'type': 'preprint', 'fullName': 'arXiv'}
-        }
+    def enrich_publications(self, publications):
+        """抓取每篇论文的Scholar详情页，补全被截断的作者、发表日期和arXiv编号
         
-        venue_lower = venue.lower()
+        详情按链接缓存，并记录列表行的签名；行内容没变的论文直接使用缓存，
+        只有新增或变化的论文才会重新请求。
+        """
+        candidates = [pub for pub in publications if pub['link']]
+        print(f"🔎 Enriching {len(candidates)} publications from detail pages...")
+        details_cache = self._load_details_cache()
         
-        # 检查已知会议/期刊
-        for key, value in venue_map.items():
-            if key.lower() in venue_lower:
-                return value
+        pending = []
+        reused = 0
+        for pub in candidates:
+            signature = self._row_signature(pub)
+            cached = details_cache.get(pub['link'])
+            if cached and cached['signature'] == signature:
+                self._apply_details(pub, cached['details'])
+                reused += 1
+            else:
+                pending.append((pub, signature))
         
-        # 默认处理
-        if 'arxiv' in venue_lower:
-            return {'type': 'preprint', 'fullName': 'arXiv'}
-        elif 'journal' in venue_lower:
-            return {'type': 'journal', 'fullName': venue}
-        else:
-            return {'type': 'conference', 'fullName': venue}
+        fetched = 0
+        with ThreadPoolExecutor(max_workers=self.enrich_workers) as pool:
+            futures = {pool.submit(self._fetch_details, pub['link']): (pub, signature)
+                       for pub, signature in pending}
+            for future in as_completed(futures):
+                pub, signature = futures[future]
+                details = future.result()
+                if details is None:
+                    continue
+                details_cache[pub['link']] = {'signature': signature, 'details': details}
+                self._apply_details(pub, details)
+                fetched += 1
+        
+        self._save_details_cache(details_cache)
+        print(f"📊 Enrichment: {fetched} fetched, {reused} unchanged, {len(pending) - fetched} failed")
+        return publications
+    
+    @staticmethod
+    def _row_signature(pub):
+        """列表行内容的签名（不含引用数，引用数变化不影响详情）"""
+        row = [pub['title'], pub['authors'], pub['venue'], pub['year']]
+        return hashlib.sha1(json.dumps(row, ensure_ascii=False).encode('utf-8')).hexdigest()
+    
+    def _details_cache_path(self):
+        return os.path.join(self.cache.cache_dir, 'details.json') if self.cache else None
+    
+    def _load_details_cache(self):
+        path = self._details_cache_path()
+        if not path:
+            return {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_details_cache(self, details_cache):
+        path = self._details_cache_path()
+        if not path or self.replay:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(details_cache, f, ensure_ascii=False)
+    
+    def _fetch_details(self, link):
+        """抓取并解析一个详情页，失败返回None"""
+        # 链接总是指向scholar.google.com，测试时改为请求--base-url
+        url = self.base_url + link[len(SCHOLAR_BASE_URL):] if link.startswith(SCHOLAR_BASE_URL) else link
+        content = self._get(url)
+        if content is None:
+            return None
+        try:
+            return self._parse_detail_page(content)
+        except Exception as e:
+            print(f"⚠️  Error parsing detail page {url}: {e}")
+            return None
+    
+    def _parse_detail_page(self, content):
+        """解析详情页的字段表，返回details字典；不是详情页（如验证码页面）时返回None"""
+        soup = BeautifulSoup(content, 'html.parser')
+        fields = {}
+        for row in soup.find_all('div', class_='gs_scl'):
+            field = row.find('div', class_='gsc_oci_field')
+            value = row.find('div', class_='gsc_oci_value')
+            if field and value:
+                fields[field.get_text().strip().lower()] = value.get_text(' ', strip=True)
+        if not fields:
+            return None
+        
+        details = {}
+        authors = fields.get('authors') or fields.get('inventors')
+        if authors:
+            details['authors'] = [a.strip() for a in authors.split(',') if a.strip()]
+        if fields.get('publication date'):
+            details['date'] = fields['publication date']
+        for name in ('journal', 'conference', 'book', 'source'):
+            if fields.get(name):
+                details['source'] = fields[name]
+                break
+        
+        title_link = soup.find('a', class_='gsc_oci_title_link')
+        arxiv_text = ' '.join([details.get('source', ''), title_link.get('href', '') if title_link else ''])
+        arxiv_match = re.search(r'arxiv(?:\.org/(?:abs|pdf)/|:\s*)(\d{4}\.\d{4,5})', arxiv_text, re.IGNORECASE)
+        if arxiv_match:
+            details['arxiv_id'] = arxiv_match.group(1)
+        return details
+    
+    def _apply_details(self, pub, details):
+        """用详情页信息补全列表行"""
+        # 列表中的作者超过一定数量会被截断为"..."
+        authors = details.get('authors')
+        if authors and (len(authors) > len(pub['authors']) or any('...' in a for a in pub['authors'])):
+            pub['authors'] = authors
+        
+        year_match = re.match(r'(\d{4})', details.get('date', ''))
+        if year_match:
+            pub['year'] = int(year_match.group(1))
+            pub['publication_date'] = details['date']
+        
+        if not pub['venue'] and details.get('source'):
+            pub['venue'] = details['source']
+        
+        # 只有预印本才把arXiv编号写进venue，正式发表的venue保持不变
+        arxiv_id = details.get('arxiv_id')
+        if arxiv_id:
+            pub['arxiv_id'] = arxiv_id
+            if (not pub['venue'] or 'arxiv' in pub['venue'].lower()) and not self.extract_arxiv_info(pub['venue'])[0]:
+                pub['venue'] = f"arXiv preprint arXiv:{arxiv_id}"
+    
+    def _build_publication(self, row):
+        """把快速后端提取的字段转换为与_parse_publication_row相同的结果"""
+        if row['title'] is None:
+            return None
+        
+        link = row['href']
+        if link:
+            link = urljoin(SCHOLAR_BASE_URL, link)
+        
+        authors = []
+        if row['grays']:
+            authors = [a.strip() for a in row['grays'][0].strip().split(',')]
+        venue = row['grays'][1].strip() if len(row['grays']) > 1 else ""
+        
+        year = 2024  # 默认年份
+        if row['year'] is not None and row['year'].strip().isdigit():
+            year = int(row['year'].strip())
+        
+        citations = 0
+        if row['citations'] is not None and row['citations'].strip().isdigit():
+            citations = int(row['citations'].strip())
+        
+        return {
+            'title': row['title'].strip(),
+            'authors': authors,
+            'venue': venue,
+            'year': year,
+            'citations': citations,
+            'link': link
+        }
+    
+    def parse_venue_info(self, venue):
+        """解析会议/期刊信息"""
+        return self.venues.classify(venue)
     
     def extract_arxiv_info(self, venue):
         """从arXiv信息中提取年份和月份信息"""
@@ -209,76 +1707,14 @@ class ScholarSync:
             print(f"⚠️  No reliable year found for '{pub['title'][:50]}...', using current year {current_year}")
             return current_year, None
     
-    def check_duplicate_across_all_years(self, new_pub, existing_config):
-        """跨年份智能重复检测"""
-        # 收集所有年份的所有论文
-        all_existing_pubs = []
-        for year, pubs in existing_config.get('publications', {}).items():
-            if isinstance(pubs, list):
-                all_existing_pubs.extend(pubs)
-        
-        for existing in all_existing_pubs:
-            # 1. 完全标题匹配
-            if existing['title'].lower() == new_pub['title'].lower():
-                print(f"🔍 Found exact title match: \"{new_pub['title']}\"")
-                return existing
-            
-            # 2. 标题相似度检测（去除标点符号后比较）
-            clean_new = re.sub(r'[^a-z0-9\s]', '', new_pub['title'].lower()).strip()
-            clean_existing = re.sub(r'[^a-z0-9\s]', '', existing['title'].lower()).strip()
-            if clean_new == clean_existing:
-                print(f"🔍 Found similar title: \"{new_pub['title']}\" vs \"{existing['title']}\"")
-                return existing
-            
-            # 3. 核心词匹配（标题长度>20字符时）
-            if len(new_pub['title']) > 20 and len(existing['title']) > 20:
-                new_words = [w for w in clean_new.split() if len(w) > 3]
-                existing_words = [w for w in clean_existing.split() if len(w) > 3]
-                common_words = [w for w in new_words if w in existing_words]
-                
-                # 如果85%以上的重要词汇相同，认为是重复
-                if len(common_words) / max(len(new_words), len(existing_words)) > 0.85:
-                    print(f"🔍 Found word overlap match: \"{new_pub['title']}\" vs \"{existing['title']}\"")
-                    return existing
-            
-            # 4. 作者+关键词匹配
-            new_authors = [a.lower().strip() for a in new_pub['authors']]
-            existing_authors = [a.lower().strip() for a in existing.get('authors', [])]
-            
-            common_authors = []
-            for na in new_authors:
-                for ea in existing_authors:
-                    if len(na) > 2 and len(ea) > 2 and (na in ea or ea in na):
-                        common_authors.append(na)
-                        break
-            
-            # 如果有共同作者且标题有重叠词汇，可能是重复
-            if len(common_authors) >= 3:  # 至少3个共同作者
-                title_overlap = len([w for w in clean_new.split() 
-                                   if len(w) > 4 and w in clean_existing])
-                
-                # 对于survey论文，需要更严格的匹配条件
-                is_survey_new = 'survey' in clean_new.lower()
-                is_survey_existing = 'survey' in clean_existing.lower()
-                
-                if is_survey_new and is_survey_existing:
-                    # Survey论文需要更高的相似度阈值
-                    new_words = clean_new.split()
-                    existing_words = clean_existing.split()
-                    overlap_ratio = title_overlap / max(len(new_words), len(existing_words))
-                    
-                    if overlap_ratio >= 0.7:
-                        print(f"🔍 Found survey paper match: \"{new_pub['title']}\" vs \"{existing['title']}\" (common authors: {len(common_authors)}, title overlap: {title_overlap}, ratio: {overlap_ratio:.2f})")
-                        return existing
-                    else:
-                        print(f"📝 Survey papers with similar authors but different topics: \"{new_pub['title'][:50]}...\" vs \"{existing['title'][:50]}...\" (overlap ratio: {overlap_ratio:.2f})")
-                else:
-                    # 非survey论文使用原来的条件
-                    if title_overlap >= 5:
-                        print(f"🔍 Found author+title match: \"{new_pub['title']}\" vs \"{existing['title']}\" (common authors: {len(common_authors)}, title overlap: {title_overlap})")
-                        return existing
+    def check_duplicate_across_all_years(self, new_pub, existing_config, index=None):
+        """跨年份智能重复检测
         
-        return None
+        批量检测时请传入预先构建的PublicationIndex，避免每篇论文都重新扫描全部已有论文。
+        """
+        if index is None:
+            index = PublicationIndex(existing_config)
+        return index.find(new_pub)
     
     def is_venue_user_customized(self, venue):
         """检测venue是否是用户手动设置的格式"""
@@ -351,6 +1787,9 @@ class ScholarSync:
         added_count = 0
         updated_count = 0
         
+        # 查重索引每次同步只构建一次（新增论文不会写回existing_config）
+        duplicate_index = PublicationIndex(existing_config, self.near_duplicates)
+        
         for pub in scholar_pubs:
             venue_info = self.parse_venue_info(pub['venue'])
             smart_year, arxiv_yymm = self.smart_year_detection(pub, venue_info)
@@ -363,7 +1802,7 @@ class ScholarSync:
                 formatted_venue = venue_info['fullName']
             
             # 跨年份智能重复检测
-            existing = self.check_duplicate_across_all_years(pub, existing_config)
+            existing = self.check_duplicate_across_all_years(pub, existing_config, duplicate_index)
             
             if not existing:
                 # 新论文：添加基础信息
@@ -391,6 +1830,9 @@ class ScholarSync:
                     config_pub['featured'] = True
                 
                 publications_by_year[year].append(config_pub)
+                if duplicate_index.lsh:
+                    # 近似重复模式下，Scholar列表内部的重复（如arXiv版和正式版）也要识别
+                    duplicate_index.add(config_pub)
                 print(f"✅ Added new: {pub['title']} ({year}) - venue: {formatted_venue}")
                 added_count += 1
             else:
@@ -406,13 +1848,29 @@ class ScholarSync:
                         print(f"ℹ️  Skipped: {existing['title']} (no updates needed)")
         
         print(f"📊 Summary: {added_count} new, {updated_count} updated")
+        if duplicate_index.lsh:
+            self.save_duplicate_report(duplicate_index)
         return publications_by_year, updated_count > 0
     
+    def save_duplicate_report(self, duplicate_index):
+        """保存近似重复聚类报告"""
+        report_path = self.near_duplicates.get('report', 'scholar-duplicates.json')
+        report = duplicate_index.cluster_report()
+        try:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+            print(f"🧩 Near-duplicate report: {len(report['clusters'])} clusters -> {report_path}")
+        except Exception as e:
+            print(f"⚠️  Failed to write near-duplicate report: {e}")
+    
     def load_config(self):
-        """加载现有配置"""
+        """加载现有配置（持有共享锁，不会读到写了一半的文件）"""
         try:
-            with open(self.config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            with config_lock(self.config_path):
+                with open(self.config_path, 'rb') as f:
+                    content = f.read()
+            self.loaded_hash = hashlib.sha256(content).hexdigest()
+            return json.loads(content.decode('utf-8'))
         except FileNotFoundError:
             print(f"❌ Config file not found: {self.config_path}")
             return None
@@ -421,16 +1879,75 @@ class ScholarSync:
             return None
     
     def save_config(self, config_data):
-        """保存配置"""
+        """保存配置：内容没变就不写；否则写临时文件、fsync后原子替换，并追加一条变更记录"""
+        content = json.dumps(config_data, indent=2, ensure_ascii=False).encode('utf-8')
+        new_hash = hashlib.sha256(content).hexdigest()
+        tmp_path = f"{self.config_path}.{os.getpid()}.tmp"
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=2, ensure_ascii=False)
-            print(f"💾 Config saved to {self.config_path}")
+            # 排他锁：build_local.py此时读取会等待写入完成
+            with config_lock(self.config_path, exclusive=True):
+                try:
+                    with open(self.config_path, 'rb') as f:
+                        old_content = f.read()
+                except FileNotFoundError:
+                    old_content = b''
+                old_hash = hashlib.sha256(old_content).hexdigest()
+                if old_hash == new_hash:
+                    print(f"ℹ️  {self.config_path} unchanged, nothing written")
+                    return True
+                if self.loaded_hash and old_hash != self.loaded_hash:
+                    print(f"⚠️  {self.config_path} was modified since it was loaded; those edits will be replaced")
+                
+                try:
+                    with open(tmp_path, 'wb') as f:
+                        f.write(content)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_path, self.config_path)
+                finally:
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                self._fsync_directory()
+                self.loaded_hash = new_hash
+                print(f"💾 Config saved to {self.config_path}")
+                
+                # 变更记录只是附加信息：旧配置无法解析或写记录失败都不影响保存结果
+                try:
+                    old_config = json.loads(old_content.decode('utf-8')) if old_content else {}
+                    self._append_journal(old_hash, new_hash, config_changes(old_config, config_data))
+                except Exception as e:
+                    print(f"⚠️  Could not update {JOURNAL_FILE}: {e}")
             return True
         except Exception as e:
             print(f"❌ Error saving config: {e}")
             return False
     
+    def _fsync_directory(self):
+        """让rename本身也落盘（Windows不支持打开目录，跳过）"""
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        fd = os.open(os.path.dirname(os.path.abspath(self.config_path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    def _append_journal(self, old_hash, new_hash, changes):
+        """在JOURNAL_FILE末尾追加一行JSON：时间、前后内容哈希和变更列表"""
+        entry = {
+            'time': datetime.now().isoformat(timespec='seconds'),
+            'user_id': self.user_id,
+            'from': old_hash[:12],
+            'to': new_hash[:12],
+            'changes': changes,
+        }
+        journal_path = os.path.join(os.path.dirname(os.path.abspath(self.config_path)), JOURNAL_FILE)
+        with open(journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+        added = sum(change['op'] == 'add' for change in changes)
+        updated = sum(change['op'] == 'update' for change in changes)
+        print(f"📒 Journal: {added} added, {updated} updated -> {JOURNAL_FILE}")
+    
     def sync(self, dry_run=False):
         """执行同步"""
         print("🚀 Starting Google Scholar sync...")
@@ -442,14 +1959,36 @@ class ScholarSync:
         config_data = self.load_config()
         if not config_data:
             return False
+        original_config = copy.deepcopy(config_data)
         
         # 2. 获取Scholar数据
         print("\n🔍 Fetching from Google Scholar...")
         scholar_pubs = self.fetch_scholar_publications()
+        if scholar_pubs is None:
+            print("⚠️  Could not fetch the publication list, skipping update")
+            return False
         if not scholar_pubs:
             print("⚠️  No publications found, skipping update")
             return False
         
+        if self.enrich:
+            print("\n🔎 Enriching from publication detail pages...")
+            scholar_pubs = self.enrich_publications(scholar_pubs)
+        self.print_rate_metrics()
+        
+        # 3-4. 转换并合并到现有配置
+        changes_made = self.merge_publications(scholar_pubs, config_data)
+        
+        # 5. 保存配置；保存成功后才记录引用数历史，避免历史中出现没有写入配置的数据
+        if not self.commit_changes(config_data, original_config, changes_made, dry_run):
+            return False
+        if self.history is not None and not dry_run:
+            recorded = self.history.record(scholar_pubs)
+            print(f"📈 Citation history: {recorded} records appended to {self.history.directory}")
+        return True
+    
+    def merge_publications(self, scholar_pubs, config_data):
+        """把Scholar论文转换并合并进config_data（原地修改），返回是否有变化"""
         # 3. 转换和合并数据
         print("\n🔄 Processing publications...")
         new_pubs, has_updates = self.convert_to_config_format(scholar_pubs, config_data)
@@ -469,8 +2008,10 @@ class ScholarSync:
                 if not exists:
                     config_data['publications'][year].append(new_pub)
                     changes_made = True
-        
-        # 5. 保存配置
+        return changes_made
+    
+    def commit_changes(self, config_data, original_config, changes_made, dry_run=False):
+        """有变化时保存配置，并记下内存中的配置和变更供同进程构建使用"""
         if changes_made:
             if dry_run:
                 print("\n🔍 DRY RUN - Changes that would be made:")
@@ -484,7 +2025,224 @@ class ScholarSync:
         else:
             print("\nℹ️  No new publications to add.")
         
+        self.config_data = config_data
+        self.changes = config_changes(original_config, config_data)
+        return True
+
+
+class BatchSync:
+    """一次同步课题组多个成员的Scholar主页
+    
+    所有成员共用一个Session、限速器、每主机并发限制和响应缓存，主页并发抓取。
+    合著论文按规范化标题跨主页去重：详情页只抓一次、引用历史只记一次，
+    多个成员写入同一个config.json时也只添加一次。每个配置文件只读写一次。
+    """
+    
+    def __init__(self, members, profile_workers=PROFILE_WORKERS, **options):
+        self.profile_workers = max(1, profile_workers)
+        self.history = options.pop('history', None)
+        workers = options.pop('workers', FETCH_WORKERS)
+        # root只负责持有共享的连接池和限速器，以及对去重后的论文做一次补全
+        self.root = ScholarSync(workers=workers * self.profile_workers, **options)
+        self.syncers = []
+        for member in members:
+            member_options = dict(options)
+            # 录制/回放的页面按cstart命名，每个成员使用以Scholar ID命名的子目录
+            for name in ('record_dir', 'replay_dir'):
+                if member_options.get(name):
+                    member_options[name] = os.path.join(member_options[name], member['user_id'])
+            self.syncers.append(ScholarSync(user_id=member['user_id'], config_path=member.get('config', 'config.json'),
+                                            workers=workers, shared=self.root, **member_options))
+    
+    @classmethod
+    def from_file(cls, path, **options):
+        """从JSON文件读取成员列表：{"members": [{"user_id": ..., "config": ...}, ...]}"""
+        with open(path, 'r', encoding='utf-8') as f:
+            members = json.load(f)['members']
+        return cls(members, **options)
+    
+    def fetch_all(self):
+        """并发抓取所有成员的主页，返回 ({成员序号: 论文列表}, 失败的成员序号集合)
+        
+        与单个主页的同步一致，抓取出错或没有找到任何论文都算失败。
+        """
+        results = {}
+        failed = set()
+        with ThreadPoolExecutor(max_workers=self.profile_workers) as pool:
+            futures = {pool.submit(syncer.fetch_scholar_publications): i for i, syncer in enumerate(self.syncers)}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    print(f"❌ Fetching {self.syncers[i].user_id} failed: {e}")
+                    results[i] = None
+                if not results[i]:
+                    failed.add(i)
+                    results[i] = []
+        return results, failed
+    
+    def sync(self, dry_run=False):
+        """执行批量同步，返回是否所有成员都成功
+        
+        有成员抓取失败时，包含该成员的配置文件不会被修改（避免写入不完整的数据），
+        其他配置照常保存，但结果仍为失败。
+        """
+        print(f"🚀 Starting batch sync of {len(self.syncers)} Scholar profiles...")
+        fetched, failed = self.fetch_all()
+        for i in sorted(failed):
+            print(f"⚠️  No complete publication list for {self.syncers[i].user_id}, its config will not be updated")
+        
+        # 跨主页去重：同一篇论文只保留一份（引用数取最大）
+        unique = {}
+        member_keys = {}
+        for i, syncer in enumerate(self.syncers):
+            keys = []
+            for pub in fetched[i]:
+                key = normalized_title(pub['title'])
+                if key not in unique:
+                    unique[key] = pub
+                elif pub['citations'] > unique[key]['citations']:
+                    unique[key]['citations'] = pub['citations']
+                if key not in keys:
+                    keys.append(key)
+            member_keys[i] = keys
+            print(f"👤 {syncer.user_id}: {len(fetched[i])} publications")
+        shared_count = sum(len(keys) for keys in member_keys.values()) - len(unique)
+        print(f"📚 {len(unique)} unique publications ({shared_count} shared between profiles)")
+        if not unique:
+            print("⚠️  No publications found, skipping update")
+            return False
+        
+        if self.root.enrich:
+            print("\n🔎 Enriching from publication detail pages...")
+            self.root.enrich_publications(list(unique.values()))
+        self.root.print_rate_metrics()
+        
+        # 按配置文件分组：共用一个配置的成员合并后只写一次
+        groups = {}
+        for i, syncer in enumerate(self.syncers):
+            groups.setdefault(os.path.abspath(syncer.config_path), []).append(i)
+        
+        success = not failed
+        saved_keys = {}  # 已写入配置的论文（有序去重），只有它们记入引用数历史
+        for config_path, indices in groups.items():
+            lead = self.syncers[indices[0]]
+            print(f"\n📄 {lead.config_path} ({', '.join(self.syncers[i].user_id for i in indices)})")
+            if failed.intersection(indices):
+                print("⏭️  Skipped: a member of this config could not be fetched")
+                continue
+            config_data = lead.load_config()
+            if not config_data:
+                success = False
+                continue
+            original_config = copy.deepcopy(config_data)
+            
+            keys = []
+            for i in indices:
+                keys.extend(key for key in member_keys[i] if key not in keys)
+            changes_made = lead.merge_publications([unique[key] for key in keys], config_data)
+            if lead.commit_changes(config_data, original_config, changes_made, dry_run):
+                saved_keys.update(dict.fromkeys(keys))
+            else:
+                success = False
+        
+        if self.history is not None and not dry_run and saved_keys:
+            recorded = self.history.record([unique[key] for key in saved_keys])
+            print(f"📈 Citation history: {recorded} records appended to {self.history.directory}")
+        return success
+    
+    def leads(self):
+        """每个配置文件对应的成员（sync()后其config_data/changes是该配置的结果）"""
+        seen = set()
+        for syncer in self.syncers:
+            path = os.path.abspath(syncer.config_path)
+            if path not in seen and syncer.config_data is not None:
+                seen.add(path)
+                yield syncer
+
+
+def build_after_sync(syncer, full=False):
+    """同步后在同一进程内构建网站：直接使用内存中的配置，不再重新读取config.json
+    
+    只有论文变化时只重新生成index.html和publications页面；配置没变则不构建。
+    """
+    if not full and not syncer.changes:
+        print("\nℹ️  Config unchanged, no pages to rebuild")
+        return True
+    from build_local import PUBLICATION_PAGES, build_site  # 只在构建时才需要build_local的依赖（yaml等）
+    
+    only = None if full or any(change['op'] == 'section' for change in syncer.changes) else PUBLICATION_PAGES
+    print(f"\n🏗️  Building website ({'publication pages' if only else 'all pages'})...")
+    
+    cwd = os.getcwd()
+    try:
+        os.chdir(os.path.dirname(os.path.abspath(syncer.config_path)))  # build_local使用相对网站根目录的路径
+        build_site(syncer.config_data, only)
         return True
+    except Exception as e:
+        print(f"❌ Build failed: {e}")
+        return False
+    finally:
+        os.chdir(cwd)
+
+
+def print_trending(history, days, limit=10):
+    """打印引用数历史中最近days天增长最多的论文"""
+    trending = history.trending(days, limit)
+    if not trending:
+        print(f"ℹ️  No citation growth recorded in {history.directory} over the last {days} days")
+        return 0
+    print(f"📈 Most cited over the last {days} days:")
+    for key, title, gain in trending:
+        print(f"  +{gain:<5} {title[:70]}")
+    return 0
+
+
+def benchmark_parsers(pages_dir=PARSER_FIXTURES_DIR, rounds=5):
+    """在保存的主页页面（如--record-pages录制的profile-*.html）上比较各解析后端的速度
+    
+    默认使用仓库中的tests/fixtures/scholar。以bs4后端的结果为准，
+    同时检查其他后端解析结果是否完全一致，不一致时返回1。
+    """
+    pages = []
+    for name in sorted(os.listdir(pages_dir)):
+        if name.startswith('profile-') and name.endswith('.html'):
+            with open(os.path.join(pages_dir, name), 'rb') as f:
+                pages.append(f.read())
+    if not pages:
+        print(f"❌ No profile-*.html pages found in {pages_dir}")
+        return 1
+    
+    syncer = ScholarSync()
+    backends = ['bs4', 'stream'] + (['lxml'] if lxml_html is not None else [])
+    reference = [syncer._parse_profile_page(page, 'bs4') for page in pages]
+    total_bytes = sum(len(page) for page in pages)
+    print(f"⏱️  Benchmarking parsers on {len(pages)} pages ({total_bytes / 1024:.0f} KB), {rounds} rounds each")
+    
+    baseline = None
+    mismatched = []
+    for backend in backends:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            results = [syncer._parse_profile_page(page, backend) for page in pages]
+        elapsed = (time.perf_counter() - start) / rounds
+        
+        row_count = sum(len(rows or []) for rows, _ in results)
+        rows_per_second = row_count / elapsed if elapsed else float('inf')
+        baseline = baseline or elapsed
+        identical = 'yes' if results == reference else 'NO'
+        if results != reference:
+            mismatched.append(backend)
+        print(f"  {backend:<7} {row_count:>6} rows  {elapsed * 1000:8.1f} ms/run  "
+              f"{rows_per_second:10.0f} rows/s  {baseline / elapsed:5.1f}x  matches bs4: {identical}")
+    if lxml_html is None:
+        print("  (lxml is not installed: pip install lxml)")
+    if mismatched:
+        print(f"❌ {', '.join(mismatched)} parsed the pages differently from bs4")
+        return 1
+    return 0
+
 
 def main():
     parser = argparse.ArgumentParser(description='Google Scholar Publications Sync')
@@ -496,22 +2254,127 @@ def main():
                        help='Dry run mode (do not modify files)')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Verbose output')
+    parser.add_argument('--base-url', default=SCHOLAR_BASE_URL,
+                       help='Scholar server to fetch from (e.g. a local scholar_standin_server.py)')
+    parser.add_argument('--workers', type=int, default=FETCH_WORKERS,
+                       help='Number of profile pages fetched concurrently')
+    parser.add_argument('--rate', type=float, default=1 / REQUEST_DELAY,
+                       help='Maximum requests per second')
+    parser.add_argument('--max-rate', type=float,
+                       help='Upper limit for the adaptive request rate (default: --rate)')
+    parser.add_argument('--retries', type=int, default=MAX_RETRIES,
+                       help='Attempts per request before falling back to the cache')
+    parser.add_argument('--record-pages', metavar='DIR',
+                       help='Save fetched profile pages to DIR for replay')
+    parser.add_argument('--cache-dir', default=CACHE_DIR,
+                       help='Directory of the HTTP response cache')
+    parser.add_argument('--cache-ttl', type=float, default=CACHE_TTL_HOURS,
+                       help='Hours a cached page is used without revalidation')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Do not read or write the response cache')
+    parser.add_argument('--replay', nargs='?', const=True, default=False, metavar='DIR',
+                       help='Run offline from cached pages, or from pages recorded in DIR')
+    parser.add_argument('--enrich', action='store_true',
+                       help='Fetch each publication detail page for full authors, dates and arXiv IDs')
+    parser.add_argument('--enrich-workers', type=int, default=ENRICH_WORKERS,
+                       help='Number of detail pages fetched concurrently')
+    parser.add_argument('--per-host', type=int, default=HOST_CONCURRENCY,
+                       help='Maximum concurrent requests to one host')
+    parser.add_argument('--parser', choices=PARSER_BACKENDS, default='auto',
+                       help='HTML parser for profile pages (auto: lxml if installed, else stream)')
+    parser.add_argument('--build', action='store_true',
+                       help='Build the website in the same process after a successful sync')
+    parser.add_argument('--full-build', action='store_true',
+                       help='With --build, regenerate every page instead of only the publication pages')
+    parser.add_argument('--batch', metavar='FILE',
+                       help='Sync several profiles: JSON file {"members": [{"user_id": ..., "config": ...}]}')
+    parser.add_argument('--profile-workers', type=int, default=PROFILE_WORKERS,
+                       help='With --batch, number of profiles fetched concurrently')
+    parser.add_argument('--history-dir', default=HISTORY_DIR,
+                       help='Directory of the citation history')
+    parser.add_argument('--no-history', action='store_true',
+                       help='Do not record citation counts in the history')
+    parser.add_argument('--trending', type=int, metavar='DAYS',
+                       help='Print the papers whose citations grew most over the last DAYS days and exit')
+    parser.add_argument('--venues', default=VENUES_FILE,
+                       help='Venue knowledge base (names, aliases, types and years)')
+    parser.add_argument('--benchmark-parsers', nargs='?', const=PARSER_FIXTURES_DIR, metavar='DIR',
+                       help='Benchmark the parser backends on saved profile-*.html pages in DIR '
+                            '(default: tests/fixtures/scholar) and exit')
+    parser.add_argument('--benchmark-rounds', type=int, default=5,
+                       help='Rounds per backend for --benchmark-parsers')
+    parser.add_argument('--near-duplicates', action='store_true',
+                       help='Use MinHash/LSH near-duplicate detection (for large profiles)')
+    parser.add_argument('--minhash-perm', type=int, default=64,
+                       help='Number of MinHash permutations')
+    parser.add_argument('--lsh-bands', type=int, default=16,
+                       help='Number of LSH bands (must divide --minhash-perm)')
+    parser.add_argument('--shingle-size', type=int, default=4,
+                       help='Character shingle size for titles')
+    parser.add_argument('--candidate-threshold', type=float, default=0.5,
+                       help='Minimum estimated similarity for a pair to be checked by the exact rules')
+    parser.add_argument('--match-threshold', type=float, default=0.8,
+                       help='Estimated similarity at which titles count as duplicates on their own')
+    parser.add_argument('--duplicate-report', default='scholar-duplicates.json',
+                       help='Where to write the near-duplicate cluster report')
     
     args = parser.parse_args()
     
-    # 创建同步器
-    syncer = ScholarSync(user_id=args.user_id, config_path=args.config)
+    if args.benchmark_parsers:
+        return benchmark_parsers(args.benchmark_parsers, args.benchmark_rounds)
+    
+    if args.trending:
+        return print_trending(CitationHistory(args.history_dir), args.trending)
+    
+    near_duplicates = None
+    if args.near_duplicates:
+        near_duplicates = {
+            'num_perm': args.minhash_perm,
+            'bands': args.lsh_bands,
+            'shingle_size': args.shingle_size,
+            'candidate_threshold': args.candidate_threshold,
+            'match_threshold': args.match_threshold,
+            'report': args.duplicate_report,
+        }
+    
+    # 响应缓存
+    cache = None if args.no_cache else ResponseCache(args.cache_dir, args.cache_ttl)
     
-    # 执行同步
-    success = syncer.sync(dry_run=args.dry_run)
+    # 引用数历史
+    history = None if args.no_history else CitationHistory(args.history_dir)
+    
+    options = dict(near_duplicates=near_duplicates, base_url=args.base_url, workers=args.workers,
+                   rate=args.rate, max_rate=args.max_rate, max_retries=args.retries,
+                   record_dir=args.record_pages, cache=cache, replay=bool(args.replay),
+                   replay_dir=args.replay if isinstance(args.replay, str) else None,
+                   enrich=args.enrich, enrich_workers=args.enrich_workers,
+                   host_concurrency=args.per_host, parser=args.parser,
+                   venues_path=args.venues, history=history)
+    
+    # 创建同步器并执行同步
+    if args.batch:
+        batch = BatchSync.from_file(args.batch, profile_workers=args.profile_workers, **options)
+        success = batch.sync(dry_run=args.dry_run)
+        synced = list(batch.leads())
+    else:
+        syncer = ScholarSync(user_id=args.user_id, config_path=args.config, **options)
+        success = syncer.sync(dry_run=args.dry_run)
+        synced = [syncer]
+    
+    built = False
+    if success and args.build and not args.dry_run:
+        success = built = all([build_after_sync(syncer, full=args.full_build) for syncer in synced])
     
     if success:
         print("\n✅ Sync completed successfully!")
         if not args.dry_run:
             print("📝 Next steps:")
             print("1. Review the changes in config.json")
-            print("2. Run 'python build_local.py' to update HTML files")
-            print("3. Commit and push changes to GitHub")
+            if built:
+                print("2. Commit and push changes to GitHub")
+            else:
+                print("2. Run 'python build_local.py' to update HTML files")
+                print("3. Commit and push changes to GitHub")
         return 0
     else:
         print("\n❌ Sync failed!")
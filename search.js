@@ -0,0 +1,157 @@
+// Site search
+// Loads search-index.json (written by build_local.py) the first time someone searches
+
+(function() {
+    const STOPWORDS = new Set(['a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into', 'is', 'it',
+        'of', 'on', 'or', 'that', 'the', 'this', 'to', 'via', 'was', 'we', 'with']);
+    const MAX_PREFIX_TERMS = 20;
+
+    let index = null;
+    let loading = null;
+
+    function loadIndex() {
+        if (!loading) {
+            loading = fetch('search-index.json')
+                .then(response => {
+                    if (!response.ok) throw new Error(`search-index.json: HTTP ${response.status}`);
+                    return response.json();
+                })
+                .then(data => {
+                    // A Map, so words like "constructor" never hit Object.prototype
+                    const terms = new Map(Object.entries(data.terms));
+                    index = {
+                        docs: data.docs,
+                        terms: terms,
+                        sortedTerms: [...terms.keys()].sort(),
+                        decoded: new Map()
+                    };
+                    return index;
+                })
+                .catch(error => {
+                    // Let the next search try again instead of keeping the failure
+                    loading = null;
+                    throw error;
+                });
+        }
+        return loading;
+    }
+
+    // Same rules as tokenize_search_text() in build_local.py
+    function tokenize(text) {
+        text = text.toLowerCase();
+        const terms = text.match(/[a-z0-9]+/g) || [];
+        for (const run of text.match(/[\u3400-\u9fff]+/g) || []) {
+            if (run.length === 1) {
+                terms.push(run);
+            } else {
+                for (let i = 0; i < run.length - 1; i++) terms.push(run.slice(i, i + 2));
+            }
+        }
+        return terms.filter(term => /[\u3400-\u9fff]/.test(term) || (term.length > 1 && !STOPWORDS.has(term)));
+    }
+
+    // Postings are (doc id delta << 4 | weight); decode once and keep
+    function postings(term) {
+        if (!index.decoded.has(term)) {
+            const list = [];
+            let docId = 0;
+            for (const value of index.terms.get(term) || []) {
+                docId += value >> 4;
+                list.push([docId, value & 15]);
+            }
+            index.decoded.set(term, list);
+        }
+        return index.decoded.get(term);
+    }
+
+    // Terms starting with a prefix, found by binary search over the sorted term list
+    function expandPrefix(prefix) {
+        const terms = index.sortedTerms;
+        let low = 0;
+        let high = terms.length;
+        while (low < high) {
+            const mid = (low + high) >> 1;
+            if (terms[mid] < prefix) low = mid + 1; else high = mid;
+        }
+        const matches = [];
+        for (let i = low; i < terms.length && terms[i].startsWith(prefix) && matches.length < MAX_PREFIX_TERMS; i++) {
+            matches.push(terms[i]);
+        }
+        return matches;
+    }
+
+    function search(query, limit) {
+        const queryTerms = tokenize(query);
+        const scores = new Map();
+        const docCount = index.docs.length;
+
+        queryTerms.forEach((queryTerm, position) => {
+            // The last word is still being typed, so match it as a prefix
+            const terms = position === queryTerms.length - 1 ? expandPrefix(queryTerm) : [queryTerm];
+            const best = new Map();
+            for (const term of terms) {
+                const list = postings(term);
+                const idf = Math.log(1 + docCount / list.length);
+                for (const [docId, weight] of list) {
+                    best.set(docId, Math.max(best.get(docId) || 0, weight * idf));
+                }
+            }
+            for (const [docId, score] of best) {
+                const entry = scores.get(docId) || { matched: 0, score: 0 };
+                entry.matched += 1;
+                entry.score += score;
+                scores.set(docId, entry);
+            }
+        });
+
+        return [...scores.entries()]
+            .sort((a, b) => b[1].matched - a[1].matched || b[1].score - a[1].score)
+            .slice(0, limit || 10)
+            .map(([docId]) => {
+                const [title, url, kind] = index.docs[docId];
+                return { title, url, kind };
+            });
+    }
+
+    function escapeHtml(text) {
+        return text.replace(/[&<>"]/g, char => ({ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' }[char]));
+    }
+
+    function renderResults(container, results) {
+        if (results.length === 0) {
+            container.innerHTML = '<p class="nav-search-empty">No results</p>';
+        } else {
+            container.innerHTML = results.map(result => `
+                <a class="nav-search-result" href="${escapeHtml(result.url)}">
+                    <span class="nav-search-kind">${result.kind === 'blog' ? 'Blog' : 'Paper'}</span>
+                    ${escapeHtml(result.title)}
+                </a>`).join('');
+        }
+        container.hidden = false;
+    }
+
+    window.siteSearch = function(query, limit) {
+        return loadIndex().then(() => search(query, limit));
+    };
+
+    document.addEventListener('DOMContentLoaded', function() {
+        const input = document.getElementById('site-search');
+        const container = document.getElementById('site-search-results');
+        if (!input || !container) return;
+
+        input.addEventListener('focus', () => loadIndex().catch(() => {}), { once: true });
+        input.addEventListener('input', function() {
+            const query = input.value.trim();
+            if (!query) {
+                container.hidden = true;
+                return;
+            }
+            loadIndex()
+                .then(() => renderResults(container, search(query, 8)))
+                .catch(() => { container.hidden = true; });
+        });
+        document.addEventListener('click', function(e) {
+            if (!e.target.closest('.nav-search')) container.hidden = true;
+        });
+    });
+})();
@@ -0,0 +1,141 @@
+"""CitationHistory against a plain in-memory model of the same records."""
+
+import json
+import os
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import scholar_sync_python as sync
+
+
+def pub(index, citations):
+    return {'title': f'Paper {index}', 'citations': citations,
+            'link': f'/citations?view_op=view_citation&citation_for_view=X:{index}'}
+
+
+def random_syncs(seed, papers=40, syncs=40):
+    rng = random.Random(seed)
+    day = date(2024, 1, 1)
+    counts = {}
+    for _ in range(syncs):
+        day += timedelta(days=rng.choice([0, 1, 3, 10, 30]))
+        pubs = []
+        for index in rng.sample(range(papers), rng.randint(1, papers // 2)):
+            counts[index] = counts.get(index, 0) + rng.randint(0, 5)
+            pubs.append(pub(index, counts[index]))
+        yield day, pubs + pubs[:2]  # a profile can list the same paper twice
+
+
+def model_records(syncs):
+    """(day, key, count) rows: first listing per sync, skipping same-day rows that did not change"""
+    rows = []
+    last = {}
+    for day, pubs in syncs:
+        seen = set()
+        for p in pubs:
+            key = sync.citation_key(p)
+            if key in seen or last.get(key) == (day, p['citations']):
+                continue
+            seen.add(key)
+            rows.append((day, key, p['citations']))
+            last[key] = (day, p['citations'])
+    return rows
+
+
+def model_trending(rows, days, limit):
+    cutoff = max(day for day, _, _ in rows) - timedelta(days=days)
+    baseline, latest = {}, {}
+    for day, key, count in rows:
+        if day <= cutoff:
+            baseline[key] = count
+        latest[key] = count
+    window = [(key, count) for day, key, count in rows if day > cutoff]
+    gains = {}
+    for key, count in window:
+        if key not in gains:
+            gains[key] = latest[key] - baseline.get(key, count)
+    ranked = sorted(((key, f'Paper {key.split(":")[1]}', gain) for key, gain in gains.items() if gain > 0),
+                    key=lambda item: (-item[2], item[1]))
+    return ranked[:limit]
+
+
+def model_series(rows, key):
+    by_day = {}
+    for day, row_key, count in rows:
+        if row_key == key:
+            by_day[day] = count
+    return [(day.isoformat(), count) for day, count in sorted(by_day.items())]
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_history_matches_model(tmp_path, seed):
+    syncs = list(random_syncs(seed))
+    history = sync.CitationHistory(str(tmp_path))
+    for day, pubs in syncs:
+        history.record(pubs, day)
+    rows = model_records(syncs)
+
+    reopened = sync.CitationHistory(str(tmp_path))
+    assert reopened.records == len(rows)
+    for days in (0, 1, 7, 30, 90, 1000):
+        assert reopened.trending(days, limit=100) == model_trending(rows, days, 100)
+    for index in range(40):
+        key = f'X:{index}'
+        assert reopened.series(key) == model_series(rows, key)
+
+
+def test_baseline_is_each_papers_own_last_record(tmp_path):
+    history = sync.CitationHistory(str(tmp_path))
+    history.record([pub('a', 10), pub('b', 1)], date(2024, 1, 1))
+    history.record([pub('b', 2)], date(2024, 1, 30))
+    history.record([pub('a', 50), pub('b', 5)], date(2024, 4, 10))
+    assert history.trending(days=30) == [('X:a', 'Paper a', 40), ('X:b', 'Paper b', 3)]
+
+
+def test_interrupted_append_is_discarded(tmp_path):
+    history = sync.CitationHistory(str(tmp_path))
+    history.record([pub(1, 5), pub(2, 7)], date(2024, 1, 1))
+    # Columns written, papers.json not: the append never happened
+    for name in sync.CitationHistory.COLUMNS:
+        with open(os.path.join(tmp_path, f'{name}.u32'), 'ab') as f:
+            f.write(b'\x01\x00\x00\x00')
+
+    reopened = sync.CitationHistory(str(tmp_path))
+    for name in sync.CitationHistory.COLUMNS:
+        assert os.path.getsize(os.path.join(tmp_path, f'{name}.u32')) == 8
+    assert reopened.series('X:1') == [('2024-01-01', 5)]
+
+
+def test_history_without_prev_column_is_upgraded(tmp_path):
+    syncs = list(random_syncs(3))
+    history = sync.CitationHistory(str(tmp_path))
+    for day, pubs in syncs:
+        history.record(pubs, day)
+    expected = history.trending(30, limit=100)
+    os.remove(os.path.join(tmp_path, 'prev.u32'))
+    with open(os.path.join(tmp_path, 'papers.json'), encoding='utf-8') as f:
+        index = json.load(f)
+    for paper in index['papers']:
+        del paper['last_record']
+    with open(os.path.join(tmp_path, 'papers.json'), 'w', encoding='utf-8') as f:
+        json.dump(index, f)
+
+    upgraded = sync.CitationHistory(str(tmp_path))
+    assert upgraded.trending(30, limit=100) == expected
+    assert upgraded.series('X:5') == model_series(model_records(syncs), 'X:5')
+
+
+def test_failed_save_records_no_history(tmp_path, monkeypatch):
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps({'publications': {}}), encoding='utf-8')
+    history = sync.CitationHistory(str(tmp_path / 'history'))
+    syncer = sync.ScholarSync(config_path=str(config_path), history=history)
+    monkeypatch.setattr(syncer, 'fetch_scholar_publications',
+                        lambda: [dict(pub(1, 3), authors=['Z Zhang'], venue='CVPR 2024', year=2024)])
+    monkeypatch.setattr(syncer, 'save_config', lambda config: False)
+
+    assert not syncer.sync()
+    assert history.records == 0
+    assert not os.path.exists(tmp_path / 'history' / 'papers.json')
@@ -0,0 +1,113 @@
+"""config.json is written atomically under the lock that build_local.py reads it with."""
+
+import json
+import os
+import threading
+
+import pytest
+
+import build_local
+import config_lock
+import scholar_sync_python as sync
+
+
+@pytest.fixture
+def syncer(tmp_path):
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps({'publications': {'2024': []}}), encoding='utf-8')
+    return sync.ScholarSync(config_path=str(config_path))
+
+
+def publication(title):
+    return {'title': title, 'authors': ['Z Zhang'], 'venue': 'CVPR', 'year': 2024}
+
+
+def test_save_replaces_the_file_and_journals_the_change(syncer, tmp_path):
+    config = syncer.load_config()
+    config['publications']['2024'].append(publication('A New Paper'))
+    assert syncer.save_config(config)
+
+    assert json.loads((tmp_path / 'config.json').read_text(encoding='utf-8')) == config
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+    journal = [json.loads(line) for line in (tmp_path / sync.JOURNAL_FILE).read_text(encoding='utf-8').splitlines()]
+    assert [change['op'] for change in journal[-1]['changes']] == ['add']
+
+
+def test_unchanged_config_is_not_rewritten(syncer, tmp_path, capsys):
+    config = syncer.load_config()
+    assert syncer.save_config(config)
+    inode = os.stat(tmp_path / 'config.json').st_ino
+    assert syncer.save_config(config)
+    assert os.stat(tmp_path / 'config.json').st_ino == inode
+    assert 'unchanged, nothing written' in capsys.readouterr().out
+
+
+def test_failed_replace_keeps_the_old_file(syncer, tmp_path, monkeypatch):
+    original = (tmp_path / 'config.json').read_bytes()
+    config = syncer.load_config()
+    config['publications']['2024'].append(publication('Never Written'))
+
+    def fail(src, dst):
+        raise OSError('disk full')
+    monkeypatch.setattr(sync.os, 'replace', fail)
+
+    assert not syncer.save_config(config)
+    assert (tmp_path / 'config.json').read_bytes() == original
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+
+def test_journal_failure_still_reports_success(syncer, tmp_path, monkeypatch, capsys):
+    config = syncer.load_config()
+    config['publications']['2024'].append(publication('Journal Fails'))
+
+    def fail(*args):
+        raise OSError('read-only')
+    monkeypatch.setattr(syncer, '_append_journal', fail)
+
+    assert syncer.save_config(config)
+    assert json.loads((tmp_path / 'config.json').read_text(encoding='utf-8')) == config
+    assert 'Could not update' in capsys.readouterr().out
+
+
+def test_outside_edit_since_load_is_reported(syncer, tmp_path, capsys):
+    config = syncer.load_config()
+    (tmp_path / 'config.json').write_text(json.dumps({'publications': {}, 'edited': True}), encoding='utf-8')
+    config['publications']['2024'].append(publication('Overwrites The Edit'))
+    assert syncer.save_config(config)
+    assert 'was modified since it was loaded' in capsys.readouterr().out
+
+
+@pytest.mark.skipif(config_lock.fcntl is None, reason='advisory locks need fcntl')
+def test_build_waits_for_a_write_in_progress(syncer, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    loaded = []
+    with config_lock.config_lock('config.json', exclusive=True):
+        reader = threading.Thread(target=lambda: loaded.append(build_local.load_config()))
+        reader.start()
+        reader.join(0.2)
+        assert reader.is_alive() and not loaded
+    reader.join(5)
+    assert loaded == [{'publications': {'2024': []}}]
+
+
+def test_readers_never_see_a_partial_file(syncer, tmp_path):
+    stop = threading.Event()
+    errors = []
+
+    def read_repeatedly():
+        reader = sync.ScholarSync(config_path=syncer.config_path)
+        while not stop.is_set():
+            if reader.load_config() is None:
+                errors.append('unreadable config')
+
+    thread = threading.Thread(target=read_repeatedly)
+    thread.start()
+    try:
+        config = syncer.load_config()
+        for i in range(30):
+            config['publications']['2024'].append(publication(f'Paper {i} ' + 'x' * 2000))
+            assert syncer.save_config(config)
+    finally:
+        stop.set()
+        thread.join(5)
+    assert not errors
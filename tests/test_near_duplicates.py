@@ -0,0 +1,89 @@
+"""Recall of the MinHash/LSH near-duplicate mode on arXiv vs camera-ready style title variants."""
+
+import contextlib
+import io
+import random
+
+import pytest
+
+import scholar_sync_python as sync
+
+
+NEAR_DUPLICATES = {'num_perm': 64, 'bands': 16, 'shingle_size': 4,
+                   'candidate_threshold': 0.5, 'match_threshold': 0.8}
+
+WORDS = ('learning vision diffusion transformer graph neural network robust efficient scalable reasoning '
+         'language model image video segmentation detection generation representation contrastive '
+         'attention sparse dense multimodal benchmark adaptive continual federated causal latent').split()
+
+
+def random_title(rng):
+    return ' '.join(rng.choice(WORDS).capitalize() for _ in range(rng.randint(6, 11)))
+
+
+def near_duplicate(rng, title):
+    """Lower case, a typo, a subtitle colon, a hyphenated compound or a plural"""
+    words = title.split()
+    kind = rng.randrange(5)
+    if kind == 0:
+        return title.lower() + '.'
+    if kind == 1:
+        i = rng.randrange(len(words))
+        j = rng.randrange(1, len(words[i]))
+        words[i] = words[i][:j] + words[i][j + 1:]
+        return ' '.join(words)
+    if kind == 2:
+        return words[0] + ': ' + ' '.join(words[1:])
+    if kind == 3:
+        return '-'.join(words[:2]) + ' ' + ' '.join(words[2:])
+    return title + 's'
+
+
+def build_index(rng, count=60):
+    titles = [random_title(rng) for _ in range(count)]
+    # One author per paper, so the author rule never decides a match
+    config = {'publications': {'2024': [{'title': t, 'authors': [f'Author {i}']} for i, t in enumerate(titles)]}}
+    return titles, sync.PublicationIndex(config, NEAR_DUPLICATES)
+
+
+def find_quietly(index, title):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return index.find({'title': title, 'authors': ['Nobody']})
+
+
+def test_recall_on_near_duplicates():
+    found = total = 0
+    for seed in range(20):
+        rng = random.Random(seed)
+        titles, index = build_index(rng)
+        for title in titles[:20]:
+            match = find_quietly(index, near_duplicate(rng, title))
+            total += 1
+            found += match is not None and match['title'] == title
+    assert found / total >= 0.98
+
+
+def test_unrelated_titles_rarely_match():
+    false_positives = total = 0
+    for seed in range(20):
+        rng = random.Random(1000 + seed)
+        _, index = build_index(rng)
+        for _ in range(20):
+            total += 1
+            false_positives += find_quietly(index, random_title(rng)) is not None
+    assert false_positives / total <= 0.01
+
+
+def test_cluster_report_groups_matches():
+    rng = random.Random(7)
+    titles, index = build_index(rng, count=10)
+    find_quietly(index, titles[3].lower() + '.')
+    report = index.cluster_report()
+    assert report['settings']['bands'] == NEAR_DUPLICATES['bands']
+    cluster = next(c for c in report['clusters'] if any(m['title'] == titles[3] for m in c['members']))
+    assert {m['source'] for m in cluster['members']} == {'scholar', 'config'}
+
+
+def test_bands_must_divide_permutations():
+    with pytest.raises(ValueError):
+        sync.MinHashLSH(num_perm=64, bands=10)
@@ -0,0 +1,45 @@
+"""A build after a Scholar sync rewrites the publication pages and leaves the other assets alone."""
+
+import json
+import os
+import shutil
+
+import pytest
+
+import build_local
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """A copy of the site with one full build done"""
+    shutil.copytree(REPO_ROOT, tmp_path / 'site',
+                    ignore=shutil.ignore_patterns('.git', 'tests', '__pycache__', '.pytest_cache'))
+    monkeypatch.chdir(tmp_path / 'site')
+    monkeypatch.setenv('BUILD_OFFLINE', '1')
+    config = build_local.load_config()
+    config['build']['service_worker'] = {'enabled': True}
+    config['build']['search'] = {'enabled': True}
+    build_local.build_site(config)
+    return config
+
+
+def snapshot():
+    return {name: os.stat(name).st_mtime_ns for name in os.listdir('.') if os.path.isfile(name)}
+
+
+def test_partial_build_writes_only_the_publication_pages(site):
+    before = snapshot()
+    first_year = next(iter(site['publications']))
+    papers = site['publications'][first_year]
+    papers.insert(0, dict(papers[0], title='A Freshly Synced Paper'))
+    build_local.build_site(site, only=build_local.PUBLICATION_PAGES)
+
+    changed = {name for name, mtime in snapshot().items() if before.get(name) != mtime}
+    assert 'publications.html' in changed and 'search-index.json' in changed
+    untouched = {name for name in before if name.startswith(('blog', 'sw.js', 'precache-manifest', 'page-weight'))
+                 or name.endswith('.min.css')}
+    assert untouched and not changed & untouched
+    with open('search-index.json', encoding='utf-8') as f:
+        assert any(doc[0] == 'A Freshly Synced Paper' for doc in json.load(f)['docs'])
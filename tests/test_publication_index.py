@@ -0,0 +1,153 @@
+"""PublicationIndex must find the same duplicates, and print the same messages, as the old pairwise scan."""
+
+import contextlib
+import io
+import random
+import re
+
+import pytest
+
+import scholar_sync_python as sync
+
+
+def pairwise_duplicate(new_pub, existing_config):
+    """check_duplicate_across_all_years before PublicationIndex, kept as the reference"""
+    all_existing_pubs = []
+    for year, pubs in existing_config.get('publications', {}).items():
+        if isinstance(pubs, list):
+            all_existing_pubs.extend(pubs)
+
+    for existing in all_existing_pubs:
+        if existing['title'].lower() == new_pub['title'].lower():
+            print(f"🔍 Found exact title match: \"{new_pub['title']}\"")
+            return existing
+
+        clean_new = re.sub(r'[^a-z0-9\s]', '', new_pub['title'].lower()).strip()
+        clean_existing = re.sub(r'[^a-z0-9\s]', '', existing['title'].lower()).strip()
+        if clean_new == clean_existing:
+            print(f"🔍 Found similar title: \"{new_pub['title']}\" vs \"{existing['title']}\"")
+            return existing
+
+        if len(new_pub['title']) > 20 and len(existing['title']) > 20:
+            new_words = [w for w in clean_new.split() if len(w) > 3]
+            existing_words = [w for w in clean_existing.split() if len(w) > 3]
+            common_words = [w for w in new_words if w in existing_words]
+            if len(common_words) / max(len(new_words), len(existing_words)) > 0.85:
+                print(f"🔍 Found word overlap match: \"{new_pub['title']}\" vs \"{existing['title']}\"")
+                return existing
+
+        new_authors = [a.lower().strip() for a in new_pub['authors']]
+        existing_authors = [a.lower().strip() for a in existing.get('authors', [])]
+        common_authors = []
+        for na in new_authors:
+            for ea in existing_authors:
+                if len(na) > 2 and len(ea) > 2 and (na in ea or ea in na):
+                    common_authors.append(na)
+                    break
+
+        if len(common_authors) >= 3:
+            title_overlap = len([w for w in clean_new.split() if len(w) > 4 and w in clean_existing])
+            if 'survey' in clean_new and 'survey' in clean_existing:
+                overlap_ratio = title_overlap / max(len(clean_new.split()), len(clean_existing.split()))
+                if overlap_ratio >= 0.7:
+                    print(f"🔍 Found survey paper match: \"{new_pub['title']}\" vs \"{existing['title']}\" (common authors: {len(common_authors)}, title overlap: {title_overlap}, ratio: {overlap_ratio:.2f})")
+                    return existing
+                print(f"📝 Survey papers with similar authors but different topics: \"{new_pub['title'][:50]}...\" vs \"{existing['title'][:50]}...\" (overlap ratio: {overlap_ratio:.2f})")
+            elif title_overlap >= 5:
+                print(f"🔍 Found author+title match: \"{new_pub['title']}\" vs \"{existing['title']}\" (common authors: {len(common_authors)}, title overlap: {title_overlap})")
+                return existing
+    return None
+
+
+WORDS = ('learning vision diffusion transformer graph neural network robust efficient scalable reasoning '
+         'language model image video segmentation detection generation representation contrastive '
+         'attention sparse dense multimodal benchmark adaptive continual federated causal latent').split()
+SHORT_WORDS = ['a', 'of', 'for', 'on', 'the', 'via', 'with', 'meet']
+AUTHORS = ['Zhen Zhang', 'Z Zhang', 'Xuehai He', 'Weixiang Yan', 'W Yan', 'Ao Shen', 'Chenyang Zhao',
+           'Shuohang Wang', 'Yelong Shen', 'Xin Eric Wang', 'Li', 'Wang', 'Yan Li', 'Eric']
+
+
+def random_title(rng):
+    words = [rng.choice(WORDS) for _ in range(rng.randint(3, 12))]
+    for _ in range(rng.randint(0, 3)):
+        words.insert(rng.randrange(len(words) + 1), rng.choice(SHORT_WORDS))
+    if rng.random() < 0.15:
+        words.insert(rng.randrange(len(words) + 1), 'survey')
+    return ' '.join(word.capitalize() if rng.random() < 0.5 else word for word in words)
+
+
+def variant_title(rng, title):
+    """Variations that hit each rule: case, punctuation, dropped, added or shuffled words"""
+    words = title.split()
+    kind = rng.randrange(6)
+    if kind == 0:
+        return title.upper()
+    if kind == 1:
+        return words[0] + ': ' + ' '.join(words[1:]) + '?'
+    if kind == 2 and len(words) > 1:
+        del words[rng.randrange(len(words))]
+    elif kind == 3:
+        words.insert(rng.randrange(len(words) + 1), rng.choice(WORDS))
+    elif kind == 4:
+        rng.shuffle(words)
+    else:
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return ' '.join(words)
+
+
+def random_corpus(rng):
+    config = {'publications': {}}
+    for year in ('2023', '2024', '2025'):
+        config['publications'][year] = [
+            {'title': random_title(rng), 'authors': rng.sample(AUTHORS, rng.randint(1, 6))}
+            for _ in range(rng.randint(5, 20))
+        ]
+    config['publications']['notes'] = 'not a list'
+    return config
+
+
+def run_quietly(function, *args):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = function(*args)
+    return result, output.getvalue()
+
+
+def valid_for_reference(title):
+    # The pairwise scan divides by zero on long titles without any word of over 3 letters
+    return len(title) <= 20 or any(len(w) > 3 for w in sync.PublicationIndex.clean_title(title).split())
+
+
+@pytest.mark.parametrize('seed', range(40))
+def test_index_matches_pairwise_scan(seed):
+    rng = random.Random(seed)
+    config = random_corpus(rng)
+    existing = [pub for pubs in config['publications'].values() if isinstance(pubs, list) for pub in pubs]
+    if not all(valid_for_reference(pub['title']) for pub in existing):
+        pytest.skip('corpus hits the pairwise scan division by zero')
+    index = sync.PublicationIndex(config)
+
+    for _ in range(100):
+        if rng.random() < 0.6:
+            source = rng.choice(existing)
+            new_pub = {'title': variant_title(rng, source['title']),
+                       'authors': [variant_title(rng, a) if rng.random() < 0.2 else a
+                                   for a in rng.sample(AUTHORS, rng.randint(1, 6))]}
+        else:
+            new_pub = {'title': random_title(rng), 'authors': rng.sample(AUTHORS, rng.randint(0, 6))}
+        if not valid_for_reference(new_pub['title']):
+            continue
+
+        expected, expected_output = run_quietly(pairwise_duplicate, new_pub, config)
+        found, output = run_quietly(index.find, new_pub)
+        assert found is expected, new_pub
+        assert output == expected_output, new_pub
+
+
+def test_check_duplicate_builds_an_index_when_none_is_given():
+    config = {'publications': {'2024': [{'title': 'Soft Thinking: Unlocking Reasoning', 'authors': ['Z Zhang']}]}}
+    syncer = sync.ScholarSync()
+    found, output = run_quietly(syncer.check_duplicate_across_all_years,
+                                {'title': 'soft thinking unlocking reasoning', 'authors': []}, config)
+    assert found is config['publications']['2024'][0]
+    assert output.startswith('🔍 Found similar title')
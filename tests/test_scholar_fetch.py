@@ -0,0 +1,93 @@
+"""Fetching a paginated profile from scholar_standin_server.py with the concurrent page pool."""
+
+import json
+import socketserver
+import threading
+
+import pytest
+
+import scholar_standin_server as standin
+import scholar_sync_python as sync
+
+
+@pytest.fixture
+def serve():
+    """Start a stand-in server with the given handler settings and return its base URL"""
+    servers = []
+
+    def start(**settings):
+        settings.setdefault('log_message', lambda self, format, *args: None)
+        handler = type('Handler', (standin.StandinRequestHandler,), dict(settings, request_count=0))
+        server = socketserver.ThreadingTCPServer(('localhost', 0), handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://localhost:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def make_syncer(base_url, **options):
+    options.setdefault('max_retries', 2)
+    syncer = sync.ScholarSync(user_id='STANDIN', base_url=base_url, rate=200, **options)
+    syncer.rate_limiter.backoff_base = 0.01
+    return syncer
+
+
+def synthetic_titles(count):
+    return [standin.synthetic_paper(index)['title'] for index in range(count)]
+
+
+def test_every_page_is_fetched_in_order(serve):
+    syncer = make_syncer(serve(synthetic=250))
+    publications = syncer.fetch_scholar_publications()
+    assert [pub['title'] for pub in publications] == synthetic_titles(250)
+
+
+def test_failed_page_fails_the_fetch(serve):
+    syncer = make_syncer(serve(synthetic=350, fail_cstarts={200}))
+    assert syncer.fetch_scholar_publications() is None
+
+
+def test_failure_after_the_last_page_is_ignored(serve):
+    # Pages 2 and 3 are requested together; page 2 is the last one, so page 3 failing does not matter
+    syncer = make_syncer(serve(synthetic=150, fail_cstarts={200}), workers=3)
+    publications = syncer.fetch_scholar_publications()
+    assert [pub['title'] for pub in publications] == synthetic_titles(150)
+
+
+def test_throttled_requests_are_retried(serve):
+    syncer = make_syncer(serve(synthetic=450, throttle_every=3, retry_after=0), workers=3, max_retries=5)
+    publications = syncer.fetch_scholar_publications()
+    assert [pub['title'] for pub in publications] == synthetic_titles(450)
+    assert syncer.rate_limiter.metrics()['throttled'] > 0
+
+
+def throttle_second_page(self):
+    """Answer the second profile page with 429 every time"""
+    if 'cstart=100&' in self.path:
+        self.send_response(429)
+        self.send_header('Retry-After', '0')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+        return
+    standin.StandinRequestHandler.do_GET(self)
+
+
+def test_page_throttled_on_every_attempt_fails_the_fetch(serve):
+    syncer = make_syncer(serve(synthetic=350, do_GET=throttle_second_page), max_retries=3)
+    assert syncer.fetch_scholar_publications() is None
+    assert syncer.rate_limiter.metrics()['throttled'] == 3
+
+
+def test_sync_does_not_save_a_partial_list(serve, tmp_path):
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps({'publications': {}}), encoding='utf-8')
+    syncer = make_syncer(serve(synthetic=250, fail_cstarts={100}), config_path=str(config_path))
+
+    assert not syncer.sync()
+    assert json.loads(config_path.read_text(encoding='utf-8')) == {'publications': {}}
+
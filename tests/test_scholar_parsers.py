@@ -0,0 +1,54 @@
+"""The fast profile-page parsers must return exactly what the BeautifulSoup parser returns."""
+
+import os
+
+import pytest
+
+import scholar_sync_python as sync
+
+
+FIXTURE_PAGES = sorted(name for name in os.listdir(sync.PARSER_FIXTURES_DIR)
+                       if name.startswith('profile-') and name.endswith('.html'))
+
+
+def fast_backends():
+    return ['stream'] + (['lxml'] if sync.lxml_html is not None else [])
+
+
+@pytest.fixture(scope='module')
+def syncer():
+    return sync.ScholarSync()
+
+
+def read_fixture(name):
+    with open(os.path.join(sync.PARSER_FIXTURES_DIR, name), 'rb') as f:
+        return f.read()
+
+
+def test_fixture_pages_are_committed():
+    assert len(FIXTURE_PAGES) >= 2
+
+
+@pytest.mark.parametrize('name', FIXTURE_PAGES)
+@pytest.mark.parametrize('backend', fast_backends())
+def test_backend_matches_bs4(syncer, name, backend):
+    content = read_fixture(name)
+    rows, has_more = syncer._parse_profile_page(content, 'bs4')
+    assert rows
+    assert syncer._parse_profile_page(content, backend) == (rows, has_more)
+
+
+def test_edge_cases_page(syncer):
+    rows, has_more = syncer._parse_profile_page(read_fixture('profile-edge-cases.html'), 'stream')
+    assert not has_more
+    titles = [row['title'] for row in rows]
+    assert 'Entities & Quotes: "Don\'t" Panic – A Study of Bold Titles' in titles
+    assert '基于扩散模型的图像生成方法研究' in titles
+    assert 'A row without a title link is skipped' not in titles
+    undated = next(row for row in rows if row['title'] == 'A Paper Without a Year or Venue')
+    assert (undated['year'], undated['venue'], undated['citations']) == (2024, '', 0)
+
+
+def test_benchmark_runs_on_fixtures(capsys):
+    assert sync.benchmark_parsers(rounds=1) == 0
+    assert 'matches bs4: NO' not in capsys.readouterr().out
@@ -0,0 +1,33 @@
+"""Venue classification from venues.json."""
+
+import pytest
+
+import scholar_sync_python as sync
+
+
+@pytest.fixture(scope='module')
+def venues():
+    return sync.VenueKnowledgeBase.load()
+
+
+@pytest.mark.parametrize('venue, expected', [
+    ('IEEE Transactions on Image Processing 32, 1-12', 'TIP'),
+    ('TIP 2023', 'TIP'),
+    ('ACM Transactions on Graphics (TOG) 42', 'TOG'),
+    ('Proceedings of the IEEE/CVF Conference on Computer Vision and Pattern Recognition, 2023', 'CVPR'),
+    ('CVPR2024', 'CVPR'),
+    ('ICCVW 2021', 'ICCV Workshops'),
+    ('ICLR 2024 arXiv:2012.01234', 'ICLR'),
+    ('arXiv preprint arXiv:2012.01234', 'arXiv'),
+])
+def test_known_venues(venues, venue, expected):
+    assert venues.classify(venue)['fullName'] == expected
+
+
+@pytest.mark.parametrize('venue', ['Tip of the iceberg workshop', 'The tog of war', 'acl injury study'])
+def test_acronyms_do_not_match_ordinary_words(venues, venue):
+    assert venues.classify(venue) == {'type': 'conference', 'fullName': venue}
+
+
+def test_year_outside_venue_range(venues):
+    assert venues.classify('ICLR 2012')['fullName'] == 'ICLR 2012'